@@ -261,6 +261,13 @@ Return JSON:
             logger.warning(f"Failed to parse coordination plan, using fallback: {e}")
             return self._create_fallback_plan(available_tools)
     
+    @staticmethod
+    def _log_coordination_plan(task: "asyncio.Task") -> None:
+        """Done-callback for the background coordination plan task."""
+        if task.cancelled() or task.exception() is not None:
+            return
+        logger.info(f"Coordination plan created: {task.result().to_dict()}")
+    
     def _create_fallback_plan(self, available_tools: List[ToolDefinition]) -> FlowPlan:
         """Create a simple fallback coordination plan."""
         plan = FlowPlan()
@@ -557,101 +564,105 @@ Return JSON:
                 content="I don't have any flow analysis tools available. Please connect the Flow Structure Analyzer, Drag-Drop Predictor, and Flow Optimizer tools to enable my coordination capabilities."
             )
         
-        # Create coordination plan
-        coordination_plan = await self._analyze_and_plan_coordination(current_user_message.content, available_tools)
-        logger.info(f"Coordination plan created: {coordination_plan.to_dict()}")
+        # The coordination plan is informational only (it is logged, not consumed),
+        # so its LLM call runs alongside the coordination loop rather than before it
+        plan_task = asyncio.create_task(
+            self._analyze_and_plan_coordination(current_user_message.content, available_tools)
+        )
+        plan_task.add_done_callback(self._log_coordination_plan)
         
-        all_analysis_results: List[FlowResult] = []
-        iteration = 0
+        try:
+            all_analysis_results: List[FlowResult] = []
+            iteration = 0
         
-        while iteration < self.max_execution_depth:
-            history = await self.memory.get_history(limit=10)  # Shorter history for flow context
-            messages_for_llm: List[Message] = []
+            while iteration < self.max_execution_depth:
+                history = await self.memory.get_history(limit=10)  # Shorter history for flow context
+                messages_for_llm: List[Message] = []
             
-            # Add system message with coordination context
-            system_message = self._render_system_prompt(**template_vars)
-            if system_message:
-                messages_for_llm.append(system_message)
+                # Add system message with coordination context
+                system_message = self._render_system_prompt(**template_vars)
+                if system_message:
+                    messages_for_llm.append(system_message)
             
-            # Add analysis progress context
-            if all_analysis_results:
-                context_msg = Message(
-                    role="system",
-                    content=f"""Analysis: {len(all_analysis_results)} results, iteration {iteration + 1}/{self.max_execution_depth}
+                # Add analysis progress context
+                if all_analysis_results:
+                    context_msg = Message(
+                        role="system",
+                        content=f"""Analysis: {len(all_analysis_results)} results, iteration {iteration + 1}/{self.max_execution_depth}
 Tools used: {list(self.used_analysis_tools)}
 Status: {'Ready for FLOW_INSTRUCTION' if self._should_generate_flow_instruction(all_analysis_results) else 'Need more analysis'}"""
-                )
-                messages_for_llm.append(context_msg)
+                    )
+                    messages_for_llm.append(context_msg)
             
-            messages_for_llm.extend(history)
+                messages_for_llm.extend(history)
             
-            # Determine tool choice strategy
-            if iteration >= self.max_execution_depth - 1:
-                tool_choice = "none"  # Force final response
-            elif not self._should_continue_analysis(all_analysis_results, iteration):
-                tool_choice = "none"  # Sufficient analysis gathered
-            else:
-                tool_choice = "auto"
+                # Determine tool choice strategy
+                if iteration >= self.max_execution_depth - 1:
+                    tool_choice = "none"  # Force final response
+                elif not self._should_continue_analysis(all_analysis_results, iteration):
+                    tool_choice = "none"  # Sufficient analysis gathered
+                else:
+                    tool_choice = "auto"
             
-            llm_params = {
-                "tools": [td.model_dump(exclude_none=True) for td in available_tools],
-                "tool_choice": tool_choice,
-                "temperature": 0.6  # Slightly lower for more consistent coordination
-            }
+                llm_params = {
+                    "tools": [td.model_dump(exclude_none=True) for td in available_tools],
+                    "tool_choice": tool_choice,
+                    "temperature": 0.6  # Slightly lower for more consistent coordination
+                }
             
-            assistant_response = await self.llm.chat_completion(messages_for_llm, **llm_params)
-            await self.memory.add_message(assistant_response)
+                assistant_response = await self.llm.chat_completion(messages_for_llm, **llm_params)
+                await self.memory.add_message(assistant_response)
             
-            if not assistant_response.tool_calls:
-                logger.info(f"Flow coordination complete after {iteration + 1} iterations with {len(all_analysis_results)} analysis results")
+                if not assistant_response.tool_calls:
+                    logger.info(f"Flow coordination complete after {iteration + 1} iterations with {len(all_analysis_results)} analysis results")
                 
-                # If this is a flow building request but we couldn't generate a good instruction
-                if self._is_flow_building_request(current_user_message.content):
-                    if not self._has_useful_flow_instruction(assistant_response.content):
-                        logger.info("No useful FLOW_INSTRUCTION generated, asking for clarification")
-                        # Replace or append with clarification request
-                        if self._contains_flow_instruction(assistant_response.content):
-                            # Remove any generic instruction
-                            parts = assistant_response.content.split("FLOW_INSTRUCTION:")
-                            assistant_response.content = parts[0].strip()
+                    # If this is a flow building request but we couldn't generate a good instruction
+                    if self._is_flow_building_request(current_user_message.content):
+                        if not self._has_useful_flow_instruction(assistant_response.content):
+                            logger.info("No useful FLOW_INSTRUCTION generated, asking for clarification")
+                            # Replace or append with clarification request
+                            if self._contains_flow_instruction(assistant_response.content):
+                                # Remove any generic instruction
+                                parts = assistant_response.content.split("FLOW_INSTRUCTION:")
+                                assistant_response.content = parts[0].strip()
                         
-                        # Ask for clarification instead of guessing
-                        assistant_response.content += "\n\nI understand you want to build a flow, but I need more specific information to help you effectively. Could you please clarify:\n\n"
-                        assistant_response.content += "- What is the main purpose of your workflow?\n"
-                        assistant_response.content += "- What kind of data or information will it process?\n"
-                        assistant_response.content += "- What specific tasks should it perform?\n"
-                        assistant_response.content += "- What output or result are you expecting?\n\n"
-                        assistant_response.content += "Once you provide more details, I can suggest the exact components and structure for your flow."
+                            # Ask for clarification instead of guessing
+                            assistant_response.content += "\n\nI understand you want to build a flow, but I need more specific information to help you effectively. Could you please clarify:\n\n"
+                            assistant_response.content += "- What is the main purpose of your workflow?\n"
+                            assistant_response.content += "- What kind of data or information will it process?\n"
+                            assistant_response.content += "- What specific tasks should it perform?\n"
+                            assistant_response.content += "- What output or result are you expecting?\n\n"
+                            assistant_response.content += "Once you provide more details, I can suggest the exact components and structure for your flow."
                 
-                return self._post_process_llm_response(assistant_response)
+                    return self._post_process_llm_response(assistant_response)
             
-            # Execute analysis tool calls (parallel when possible)
-            logger.info(f"Iteration {iteration + 1}: Executing {len(assistant_response.tool_calls)} analysis tool calls")
+                # Execute analysis tool calls (parallel when possible)
+                logger.info(f"Iteration {iteration + 1}: Executing {len(assistant_response.tool_calls)} analysis tool calls")
             
-            analysis_results = await self._execute_analysis_parallel(assistant_response.tool_calls)
-            all_analysis_results.extend(analysis_results)
+                analysis_results = await self._execute_analysis_parallel(assistant_response.tool_calls)
+                all_analysis_results.extend(analysis_results)
             
-            # Add tool responses to memory
-            for i, (tool_call, result) in enumerate(zip(assistant_response.tool_calls, analysis_results)):
-                tool_response = Message(
-                    role="tool",
-                    tool_call_id=tool_call.id,
-                    name=result.tool_name,
-                    content=json.dumps({
-                        "result": result.result,
-                        "confidence": result.confidence,
-                        "analysis_type": result.analysis_type,
-                        "timestamp": result.timestamp.isoformat()
-                    })
-                )
-                await self.memory.add_message(tool_response)
+                # Add tool responses to memory
+                for i, (tool_call, result) in enumerate(zip(assistant_response.tool_calls, analysis_results)):
+                    tool_response = Message(
+                        role="tool",
+                        tool_call_id=tool_call.id,
+                        name=result.tool_name,
+                        content=json.dumps({
+                            "result": result.result,
+                            "confidence": result.confidence,
+                            "analysis_type": result.analysis_type,
+                            "timestamp": result.timestamp.isoformat()
+                        })
+                    )
+                    await self.memory.add_message(tool_response)
             
-            iteration += 1
+                iteration += 1
         
-        # Final coordination synthesis with all analysis results
-        synthesis_prompt = Message(
-            role="system",
-            content=f"""Final analysis complete. User request: "{current_user_message.content}"
+            # Final coordination synthesis with all analysis results
+            synthesis_prompt = Message(
+                role="system",
+                content=f"""Final analysis complete. User request: "{current_user_message.content}"
 
 Analysis: {len(all_analysis_results)} results, {len([r for r in all_analysis_results if r.confidence >= 0.7])} high confidence
 
@@ -659,39 +670,42 @@ Requirements:
 1. If intent is CLEAR: End with FLOW_INSTRUCTION: [precise instruction]
 2. If intent is UNCLEAR: Ask specific questions
 3. Be helpful and conversational"""
-        )
+            )
         
-        final_history = await self.memory.get_history(limit=15)
-        final_messages = [synthesis_prompt] + final_history
+            final_history = await self.memory.get_history(limit=15)
+            final_messages = [synthesis_prompt] + final_history
         
-        final_response = await self.llm.chat_completion(final_messages, temperature=0.6)
+            final_response = await self.llm.chat_completion(final_messages, temperature=0.6)
         
-        # If this is a flow building request but we still don't have a good instruction
-        if self._is_flow_building_request(current_user_message.content):
-            if not self._has_useful_flow_instruction(final_response.content):
-                logger.warning("Final response lacks useful FLOW_INSTRUCTION, asking for clarification")
+            # If this is a flow building request but we still don't have a good instruction
+            if self._is_flow_building_request(current_user_message.content):
+                if not self._has_useful_flow_instruction(final_response.content):
+                    logger.warning("Final response lacks useful FLOW_INSTRUCTION, asking for clarification")
                 
-                # Remove any existing generic instruction
-                if self._contains_flow_instruction(final_response.content):
-                    parts = final_response.content.split("FLOW_INSTRUCTION:")
-                    final_response.content = parts[0].strip()
+                    # Remove any existing generic instruction
+                    if self._contains_flow_instruction(final_response.content):
+                        parts = final_response.content.split("FLOW_INSTRUCTION:")
+                        final_response.content = parts[0].strip()
                 
-                # Provide helpful clarification request based on what we learned
-                final_response.content += "\n\nBased on my analysis, I can see you want to create a workflow, but I need more specific details to generate the exact flow structure. \n\n"
+                    # Provide helpful clarification request based on what we learned
+                    final_response.content += "\n\nBased on my analysis, I can see you want to create a workflow, but I need more specific details to generate the exact flow structure. \n\n"
                 
-                # If we detected some intent, acknowledge it
-                request_lower = current_user_message.content.lower()
-                if any(keyword in request_lower for keyword in ["file", "data", "web", "search", "news", "text", "math"]):
-                    final_response.content += f"I noticed your request mentions '{current_user_message.content}', which suggests you might want to work with specific types of data or operations.\n\n"
+                    # If we detected some intent, acknowledge it
+                    request_lower = current_user_message.content.lower()
+                    if any(keyword in request_lower for keyword in ["file", "data", "web", "search", "news", "text", "math"]):
+                        final_response.content += f"I noticed your request mentions '{current_user_message.content}', which suggests you might want to work with specific types of data or operations.\n\n"
                 
-                final_response.content += "To create the most effective flow for you, please provide:\n\n"
-                final_response.content += "1. **Specific Goal**: What should the workflow accomplish?\n"
-                final_response.content += "2. **Input/Source**: What data or information will it start with?\n"
-                final_response.content += "3. **Processing Steps**: What operations or transformations are needed?\n"
-                final_response.content += "4. **Expected Output**: What should be the final result?\n\n"
-                final_response.content += "With these details, I can recommend the exact agents, tools, and patterns that will best meet your needs."
-        
-        return self._post_process_llm_response(final_response)
+                    final_response.content += "To create the most effective flow for you, please provide:\n\n"
+                    final_response.content += "1. **Specific Goal**: What should the workflow accomplish?\n"
+                    final_response.content += "2. **Input/Source**: What data or information will it start with?\n"
+                    final_response.content += "3. **Processing Steps**: What operations or transformations are needed?\n"
+                    final_response.content += "4. **Expected Output**: What should be the final result?\n\n"
+                    final_response.content += "With these details, I can recommend the exact agents, tools, and patterns that will best meet your needs."
+        
+            return self._post_process_llm_response(final_response)
+        finally:
+            if not plan_task.done():
+                plan_task.cancel()
 
 
 def register_orchestrator_agent(app: TFrameXApp):
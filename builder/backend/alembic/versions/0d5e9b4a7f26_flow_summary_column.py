@@ -0,0 +1,52 @@
+"""Add precomputed flows.summary
+
+Revision ID: 0d5e9b4a7f26
+Revises: f7b0c3d9a164
+Create Date: 2026-10-17 12:20:16.548930
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import hashlib
+import json
+
+
+# revision identifiers, used by Alembic.
+revision = '0d5e9b4a7f26'
+down_revision = 'f7b0c3d9a164'
+branch_labels = None
+depends_on = None
+
+
+def _summary(nodes, edges):
+    # Mirrors database.compute_flow_summary at the time of this revision
+    nodes, edges = nodes or [], edges or []
+    canonical = json.dumps([nodes, edges], sort_keys=True, separators=(",", ":"), default=str)
+    return {
+        "node_count": len(nodes),
+        "edge_count": len(edges),
+        "agent_types": sorted({node.get("type") for node in nodes if node.get("type")}),
+        "hash": hashlib.blake2b(canonical.encode(), digest_size=8).hexdigest(),
+    }
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('flows') as batch_op:
+        batch_op.add_column(sa.Column('summary', sa.JSON(), server_default='{}', nullable=False))
+
+    flows = sa.table('flows',
+        sa.column('id', sa.String()),
+        sa.column('nodes', sa.JSON()),
+        sa.column('edges', sa.JSON()),
+        sa.column('summary', sa.JSON()),
+    )
+    bind = op.get_bind()
+    for flow_id, nodes, edges in bind.execute(sa.select(flows.c.id, flows.c.nodes, flows.c.edges)):
+        bind.execute(
+            flows.update().where(flows.c.id == flow_id).values(summary=_summary(nodes, edges))
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('flows') as batch_op:
+        batch_op.drop_column('summary')
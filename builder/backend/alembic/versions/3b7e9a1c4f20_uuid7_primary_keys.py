@@ -0,0 +1,89 @@
+"""UUIDv7 primary keys for audit_logs, flow_executions and user_project_roles
+
+Revision ID: 3b7e9a1c4f20
+Revises: d621931d225c
+Create Date: 2026-10-17 09:12:04.118532
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b7e9a1c4f20'
+down_revision = 'd621931d225c'
+branch_labels = None
+depends_on = None
+
+# Existing integer ids are widened into the UUID space (zero-padded hex) so
+# rows keep a stable, unique key; new rows get application-side UUIDv7 ids.
+_INT_TO_UUID = "lpad(to_hex({col}), 32, '0')::uuid"
+_UUID_TO_INT = "('x' || right(replace({col}::text, '-', ''), 8))::bit(32)::int"
+
+_TABLES = ('audit_logs', 'flow_executions', 'user_project_roles')
+
+
+def upgrade() -> None:
+    is_postgres = op.get_bind().dialect.name == 'postgresql'
+
+    with op.batch_alter_table('trigger_executions') as batch_op:
+        batch_op.drop_constraint('trigger_executions_flow_execution_id_fkey', type_='foreignkey')
+
+    for table in _TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(
+                'id',
+                existing_type=sa.Integer(),
+                type_=sa.Uuid(native_uuid=True),
+                server_default=None,
+                autoincrement=False,
+                postgresql_using=_INT_TO_UUID.format(col='id'),
+            )
+        if is_postgres:
+            op.execute(f'DROP SEQUENCE IF EXISTS {table}_id_seq')
+
+    with op.batch_alter_table('trigger_executions') as batch_op:
+        batch_op.alter_column(
+            'flow_execution_id',
+            existing_type=sa.Integer(),
+            type_=sa.Uuid(native_uuid=True),
+            existing_nullable=True,
+            postgresql_using=_INT_TO_UUID.format(col='flow_execution_id'),
+        )
+        batch_op.create_foreign_key(
+            'trigger_executions_flow_execution_id_fkey',
+            'flow_executions', ['flow_execution_id'], ['id'],
+        )
+
+
+def downgrade() -> None:
+    is_postgres = op.get_bind().dialect.name == 'postgresql'
+
+    with op.batch_alter_table('trigger_executions') as batch_op:
+        batch_op.drop_constraint('trigger_executions_flow_execution_id_fkey', type_='foreignkey')
+        batch_op.alter_column(
+            'flow_execution_id',
+            existing_type=sa.Uuid(native_uuid=True),
+            type_=sa.Integer(),
+            existing_nullable=True,
+            postgresql_using=_UUID_TO_INT.format(col='flow_execution_id'),
+        )
+
+    for table in _TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(
+                'id',
+                existing_type=sa.Uuid(native_uuid=True),
+                type_=sa.Integer(),
+                postgresql_using=_UUID_TO_INT.format(col='id'),
+            )
+        if is_postgres:
+            op.execute(f'CREATE SEQUENCE IF NOT EXISTS {table}_id_seq OWNED BY {table}.id')
+            op.execute(f"SELECT setval('{table}_id_seq', COALESCE((SELECT max(id) FROM {table}), 0) + 1, false)")
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT nextval('{table}_id_seq')")
+
+    with op.batch_alter_table('trigger_executions') as batch_op:
+        batch_op.create_foreign_key(
+            'trigger_executions_flow_execution_id_fkey',
+            'flow_executions', ['flow_execution_id'], ['id'],
+        )
@@ -0,0 +1,55 @@
+"""Server-side created_at/updated_at defaults
+
+Revision ID: 5f2a8d0e7c13
+Revises: 8c41d2e6b5a7
+Create Date: 2026-10-17 10:05:47.903214
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5f2a8d0e7c13'
+down_revision = '8c41d2e6b5a7'
+branch_labels = None
+depends_on = None
+
+_TABLES = ('organizations', 'users', 'projects', 'flows', 'triggers')
+
+
+def _now():
+    # now() is CURRENT_TIMESTAMP on SQLite, which only has 1-second resolution
+    if op.get_bind().dialect.name == 'sqlite':
+        return sa.text("(strftime('%Y-%m-%d %H:%M:%f', 'now'))")
+    return sa.func.now()
+
+
+def upgrade() -> None:
+    now = _now()
+    for table in _TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column('created_at', existing_type=sa.DateTime(timezone=True),
+                                  server_default=now, existing_nullable=False)
+            batch_op.alter_column('updated_at', existing_type=sa.DateTime(timezone=True),
+                                  server_default=now, existing_nullable=False)
+
+    with op.batch_alter_table('roles') as batch_op:
+        batch_op.alter_column('created_at', existing_type=sa.DateTime(timezone=True),
+                              server_default=now, existing_nullable=False)
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(timezone=True),
+                                      server_default=now, nullable=False))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('roles') as batch_op:
+        batch_op.drop_column('updated_at')
+        batch_op.alter_column('created_at', existing_type=sa.DateTime(timezone=True),
+                              server_default=None, existing_nullable=False)
+
+    for table in _TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column('updated_at', existing_type=sa.DateTime(timezone=True),
+                                  server_default=None, existing_nullable=False)
+            batch_op.alter_column('created_at', existing_type=sa.DateTime(timezone=True),
+                                  server_default=None, existing_nullable=False)
@@ -0,0 +1,40 @@
+"""Consolidate trigger and user_project_roles indexes
+
+Revision ID: 8c41d2e6b5a7
+Revises: 3b7e9a1c4f20
+Create Date: 2026-10-17 09:40:31.552106
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c41d2e6b5a7'
+down_revision = '3b7e9a1c4f20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index('idx_triggers_enabled', table_name='triggers')
+    op.drop_index('idx_triggers_next_run', table_name='triggers')
+    op.create_index(
+        'idx_triggers_due', 'triggers', ['next_run_at'], unique=False,
+        postgresql_where=sa.text('enabled = true'),
+        sqlite_where=sa.text('enabled = 1'),
+    )
+
+    op.drop_index('idx_user_project_roles_user_id', table_name='user_project_roles')
+    op.drop_index('idx_user_project_roles_project_id', table_name='user_project_roles')
+    op.create_index('idx_upr_project', 'user_project_roles', ['project_id', 'user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_upr_project', table_name='user_project_roles')
+    op.create_index('idx_user_project_roles_project_id', 'user_project_roles', ['project_id'], unique=False)
+    op.create_index('idx_user_project_roles_user_id', 'user_project_roles', ['user_id'], unique=False)
+
+    op.drop_index('idx_triggers_due', table_name='triggers')
+    op.create_index('idx_triggers_next_run', 'triggers', ['next_run_at'], unique=False)
+    op.create_index('idx_triggers_enabled', 'triggers', ['enabled'], unique=False)
@@ -0,0 +1,114 @@
+"""One trigger_metrics row per (trigger, minute); last error in trigger_last_errors
+
+Revision ID: a4f1c8e2d7b3
+Revises: d3a7f5c1e962
+Create Date: 2026-10-17 15:26:44.918237
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import uuid
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4f1c8e2d7b3'
+down_revision = 'd3a7f5c1e962'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    last_errors = op.create_table('trigger_last_errors',
+    sa.Column('trigger_id', sa.String(length=64), nullable=False),
+    sa.Column('error', sa.Text(), nullable=False),
+    sa.Column('recorded_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['trigger_id'], ['triggers.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('trigger_id')
+    )
+
+    bind = op.get_bind()
+    old_metrics = sa.table('trigger_metrics',
+        sa.column('trigger_id', sa.String()),
+        sa.column('bucket_ts', sa.DateTime(timezone=True)),
+        sa.column('recorded_at', sa.DateTime(timezone=True)),
+        sa.column('count', sa.Integer()),
+        sa.column('error_count', sa.Integer()),
+        sa.column('error', sa.Text()),
+    )
+
+    # The latest row per trigger carries its current error (None after a success)
+    latest = {}
+    for trigger_id, error, recorded_at in bind.execute(
+        sa.select(old_metrics.c.trigger_id, old_metrics.c.error, old_metrics.c.recorded_at)
+        .order_by(old_metrics.c.trigger_id, old_metrics.c.recorded_at)
+    ):
+        latest[trigger_id] = (error, recorded_at)
+    seed_errors = [
+        {'trigger_id': trigger_id, 'error': error, 'recorded_at': recorded_at}
+        for trigger_id, (error, recorded_at) in latest.items() if error is not None
+    ]
+    if seed_errors:
+        op.bulk_insert(last_errors, seed_errors)
+
+    # Collapse the append-only rows into one per (trigger, minute)
+    buckets = bind.execute(
+        sa.select(
+            old_metrics.c.trigger_id,
+            old_metrics.c.bucket_ts,
+            sa.func.sum(old_metrics.c.count),
+            sa.func.sum(old_metrics.c.error_count),
+            sa.func.max(sa.case((old_metrics.c.count > 0, old_metrics.c.recorded_at))),
+        ).group_by(old_metrics.c.trigger_id, old_metrics.c.bucket_ts)
+    ).fetchall()
+    op.execute(old_metrics.delete())
+
+    op.drop_index('idx_trigger_metrics_trigger_bucket', table_name='trigger_metrics')
+    with op.batch_alter_table('trigger_metrics') as batch_op:
+        batch_op.drop_column('error')
+        batch_op.drop_column('recorded_at')
+        batch_op.add_column(sa.Column('last_triggered_at', sa.DateTime(timezone=True), nullable=True))
+        batch_op.create_unique_constraint('uq_trigger_metrics_trigger_bucket', ['trigger_id', 'bucket_ts'])
+
+    if buckets:
+        metrics = sa.table('trigger_metrics',
+            sa.column('id', sa.Uuid(native_uuid=True)),
+            sa.column('trigger_id', sa.String()),
+            sa.column('bucket_ts', sa.DateTime(timezone=True)),
+            sa.column('count', sa.Integer()),
+            sa.column('error_count', sa.Integer()),
+            sa.column('last_triggered_at', sa.DateTime(timezone=True)),
+        )
+        op.bulk_insert(metrics, [
+            {
+                'id': uuid.uuid4(),
+                'trigger_id': trigger_id,
+                'bucket_ts': bucket_ts,
+                'count': count or 0,
+                'error_count': error_count or 0,
+                'last_triggered_at': last_triggered_at,
+            }
+            for trigger_id, bucket_ts, count, error_count, last_triggered_at in buckets
+        ])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('trigger_metrics') as batch_op:
+        batch_op.drop_constraint('uq_trigger_metrics_trigger_bucket', type_='unique')
+        batch_op.add_column(sa.Column('recorded_at', sa.DateTime(timezone=True), nullable=True))
+        batch_op.add_column(sa.Column('error', sa.Text(), nullable=True))
+
+    op.execute('UPDATE trigger_metrics SET recorded_at = COALESCE(last_triggered_at, bucket_ts)')
+    # Each current error becomes the newest row for its trigger again
+    op.execute(
+        'UPDATE trigger_metrics SET error = ('
+        'SELECT e.error FROM trigger_last_errors e WHERE e.trigger_id = trigger_metrics.trigger_id) '
+        'WHERE recorded_at = (SELECT max(m.recorded_at) FROM trigger_metrics m '
+        'WHERE m.trigger_id = trigger_metrics.trigger_id)'
+    )
+
+    with op.batch_alter_table('trigger_metrics') as batch_op:
+        batch_op.alter_column('recorded_at', existing_type=sa.DateTime(timezone=True), nullable=False)
+        batch_op.drop_column('last_triggered_at')
+    op.create_index('idx_trigger_metrics_trigger_bucket', 'trigger_metrics', ['trigger_id', 'bucket_ts'], unique=False)
+
+    op.drop_table('trigger_last_errors')
@@ -0,0 +1,62 @@
+"""Bound identifier columns to VARCHAR(64)
+
+Revision ID: a9d3c7f1e248
+Revises: 5f2a8d0e7c13
+Create Date: 2026-10-17 10:31:12.640877
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9d3c7f1e248'
+down_revision = '5f2a8d0e7c13'
+branch_labels = None
+depends_on = None
+
+ID_LENGTH = 64
+
+# Referenced primary keys first, then the columns pointing at them
+_COLUMNS = (
+    ('organizations', 'id', False),
+    ('users', 'id', False),
+    ('users', 'keycloak_id', False),
+    ('users', 'organization_id', False),
+    ('roles', 'id', False),
+    ('roles', 'organization_id', False),
+    ('user_sessions', 'id', False),
+    ('user_sessions', 'user_id', False),
+    ('user_sessions', 'refresh_token_jti', True),
+    ('user_project_roles', 'user_id', False),
+    ('user_project_roles', 'project_id', False),
+    ('user_project_roles', 'role_id', False),
+    ('user_project_roles', 'assigned_by', True),
+    ('audit_logs', 'user_id', True),
+    ('audit_logs', 'organization_id', True),
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    for table, column, _ in _COLUMNS:
+        too_long = bind.execute(
+            sa.text(f'SELECT count(*) FROM {table} WHERE length({column}) > :limit'),
+            {'limit': ID_LENGTH},
+        ).scalar()
+        if too_long:
+            raise RuntimeError(
+                f'{table}.{column} has {too_long} value(s) longer than {ID_LENGTH} characters'
+            )
+
+    for table, column, nullable in _COLUMNS:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(column, existing_type=sa.String(),
+                                  type_=sa.String(length=ID_LENGTH), existing_nullable=nullable)
+
+
+def downgrade() -> None:
+    for table, column, nullable in reversed(_COLUMNS):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(column, existing_type=sa.String(length=ID_LENGTH),
+                                  type_=sa.String(), existing_nullable=nullable)
@@ -0,0 +1,37 @@
+"""Covering indexes for flow execution and organization user listings
+
+Revision ID: c4e8b2a6d917
+Revises: a9d3c7f1e248
+Create Date: 2026-10-17 10:52:38.215590
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e8b2a6d917'
+down_revision = 'a9d3c7f1e248'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # ix_flow_executions_flow_id duplicated idx_flow_executions_flow_id
+    op.drop_index(op.f('ix_flow_executions_flow_id'), table_name='flow_executions')
+    op.drop_index('idx_flow_executions_flow_id', table_name='flow_executions')
+    op.create_index('idx_flow_executions_flow_id', 'flow_executions', ['flow_id'], unique=False,
+                    postgresql_include=['status', 'started_at'])
+
+    op.drop_index('idx_users_organization_id', table_name='users')
+    op.create_index('idx_users_active', 'users', ['organization_id'], unique=False,
+                    postgresql_include=['email', 'username', 'is_active'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_users_active', table_name='users')
+    op.create_index('idx_users_organization_id', 'users', ['organization_id'], unique=False)
+
+    op.drop_index('idx_flow_executions_flow_id', table_name='flow_executions')
+    op.create_index('idx_flow_executions_flow_id', 'flow_executions', ['flow_id'], unique=False)
+    op.create_index(op.f('ix_flow_executions_flow_id'), 'flow_executions', ['flow_id'], unique=False)
@@ -0,0 +1,35 @@
+"""Composite indexes for per-trigger execution history
+
+Revision ID: d3a7f5c1e962
+Revises: b2c6e9f4a831
+Create Date: 2026-10-17 14:12:07.583420
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd3a7f5c1e962'
+down_revision = 'b2c6e9f4a831'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # (trigger_id, triggered_at DESC) serves trigger_id-only lookups as well
+    op.drop_index('idx_executions_trigger_id', table_name='trigger_executions')
+    op.create_index('idx_executions_trigger_time', 'trigger_executions',
+                    ['trigger_id', sa.text('triggered_at DESC')], unique=False)
+    op.create_index('idx_executions_trigger_status_time', 'trigger_executions',
+                    ['trigger_id', 'status', sa.text('triggered_at DESC')], unique=False)
+
+    # Refresh planner statistics so the new indexes are picked up right away
+    if op.get_bind().dialect.name in ('postgresql', 'sqlite'):
+        op.execute('ANALYZE trigger_executions')
+
+
+def downgrade() -> None:
+    op.drop_index('idx_executions_trigger_status_time', table_name='trigger_executions')
+    op.drop_index('idx_executions_trigger_time', table_name='trigger_executions')
+    op.create_index('idx_executions_trigger_id', 'trigger_executions', ['trigger_id'], unique=False)
@@ -0,0 +1,55 @@
+"""BRIN index on user_sessions.expires_at and database-side session GC
+
+Revision ID: e1f6a4c8b352
+Revises: c4e8b2a6d917
+Create Date: 2026-10-17 11:14:09.377461
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e1f6a4c8b352'
+down_revision = 'c4e8b2a6d917'
+branch_labels = None
+depends_on = None
+
+SESSION_GC_JOB = 'session-gc'
+SESSION_GC_SCHEDULE = '*/5 * * * *'
+
+
+def _has_pg_cron(bind) -> bool:
+    if bind.dialect.name != 'postgresql':
+        return False
+    return bool(bind.execute(
+        sa.text("SELECT 1 FROM pg_extension WHERE extname = 'pg_cron'")
+    ).scalar())
+
+
+def upgrade() -> None:
+    op.drop_index('idx_user_sessions_expires_at', table_name='user_sessions')
+    op.create_index('idx_user_sessions_expires_brin', 'user_sessions', ['expires_at'], unique=False,
+                    postgresql_using='brin', postgresql_with={'pages_per_range': 32})
+
+    # Expired sessions are purged by pg_cron where the extension is installed;
+    # otherwise database.cleanup_expired_sessions() remains the fallback.
+    bind = op.get_bind()
+    if _has_pg_cron(bind):
+        bind.execute(
+            sa.text("SELECT cron.schedule(:job, :schedule, "
+                    "'DELETE FROM user_sessions WHERE expires_at < now()')"),
+            {'job': SESSION_GC_JOB, 'schedule': SESSION_GC_SCHEDULE},
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if _has_pg_cron(bind):
+        bind.execute(
+            sa.text("SELECT cron.unschedule(jobid) FROM cron.job WHERE jobname = :job"),
+            {'job': SESSION_GC_JOB},
+        )
+
+    op.drop_index('idx_user_sessions_expires_brin', table_name='user_sessions')
+    op.create_index('idx_user_sessions_expires_at', 'user_sessions', ['expires_at'], unique=False)
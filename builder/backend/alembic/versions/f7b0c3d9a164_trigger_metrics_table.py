@@ -0,0 +1,87 @@
+"""Move trigger counters into an append-only trigger_metrics table
+
+Revision ID: f7b0c3d9a164
+Revises: e1f6a4c8b352
+Create Date: 2026-10-17 11:48:53.092615
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import uuid
+
+
+# revision identifiers, used by Alembic.
+revision = 'f7b0c3d9a164'
+down_revision = 'e1f6a4c8b352'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    metrics = op.create_table('trigger_metrics',
+    sa.Column('id', sa.Uuid(native_uuid=True), nullable=False),
+    sa.Column('trigger_id', sa.String(length=64), nullable=False),
+    sa.Column('bucket_ts', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('recorded_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('error_count', sa.Integer(), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['trigger_id'], ['triggers.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_trigger_metrics_trigger_bucket', 'trigger_metrics', ['trigger_id', 'bucket_ts'], unique=False)
+
+    # Carry existing totals over as one seed row per trigger
+    bind = op.get_bind()
+    triggers = sa.table('triggers',
+        sa.column('id', sa.String()),
+        sa.column('trigger_count', sa.Integer()),
+        sa.column('error_count', sa.Integer()),
+        sa.column('last_triggered_at', sa.DateTime(timezone=True)),
+        sa.column('last_error', sa.Text()),
+        sa.column('updated_at', sa.DateTime(timezone=True)),
+    )
+    rows = bind.execute(
+        sa.select(triggers.c.id, triggers.c.trigger_count, triggers.c.error_count,
+                  triggers.c.last_triggered_at, triggers.c.last_error, triggers.c.updated_at)
+        .where(sa.or_(triggers.c.trigger_count > 0, triggers.c.error_count > 0,
+                      triggers.c.last_error.isnot(None)))
+    ).fetchall()
+    if rows:
+        op.bulk_insert(metrics, [
+            {
+                'id': uuid.uuid4(),
+                'trigger_id': trigger_id,
+                'bucket_ts': (last_triggered_at or updated_at).replace(second=0, microsecond=0),
+                'recorded_at': last_triggered_at or updated_at,
+                'count': trigger_count or 0,
+                'error_count': error_count or 0,
+                'error': last_error,
+            }
+            for trigger_id, trigger_count, error_count, last_triggered_at, last_error, updated_at in rows
+        ])
+
+    with op.batch_alter_table('triggers') as batch_op:
+        batch_op.drop_column('last_error')
+        batch_op.drop_column('error_count')
+        batch_op.drop_column('trigger_count')
+        batch_op.drop_column('last_triggered_at')
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('triggers') as batch_op:
+        batch_op.add_column(sa.Column('last_triggered_at', sa.DateTime(timezone=True), nullable=True))
+        batch_op.add_column(sa.Column('trigger_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('error_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('last_error', sa.Text(), nullable=True))
+
+    op.execute(
+        'UPDATE triggers SET '
+        'trigger_count = COALESCE((SELECT sum(m.count) FROM trigger_metrics m WHERE m.trigger_id = triggers.id), 0), '
+        'error_count = COALESCE((SELECT sum(m.error_count) FROM trigger_metrics m WHERE m.trigger_id = triggers.id), 0), '
+        'last_triggered_at = (SELECT max(m.recorded_at) FROM trigger_metrics m '
+        'WHERE m.trigger_id = triggers.id AND m.count > 0)'
+    )
+
+    op.drop_index('idx_trigger_metrics_trigger_bucket', table_name='trigger_metrics')
+    op.drop_table('trigger_metrics')
@@ -1,12 +1,21 @@
 
 # backend/app.py
 import os
+import atexit
 import logging
 import time
+from apscheduler.schedulers.background import BackgroundScheduler
 from flask import Flask, jsonify, send_from_directory
 from flask_cors import CORS
 from dotenv import load_dotenv
 
+# Optional import - responses go out uncompressed if flask-compress is missing
+try:
+    from flask_compress import Compress
+    HAS_FLASK_COMPRESS = True
+except ImportError:
+    HAS_FLASK_COMPRESS = False
+
 # Import all blueprints
 from routes.models import models_bp, init_default_model
 from routes.mcp_servers import mcp_servers_bp  
@@ -20,6 +29,9 @@ from routes.export_import import export_import_bp
 
 # Import authentication middleware
 from middleware.auth import JWTMiddleware
+from json_provider import HAS_ORJSON, OrjsonProvider
+from database import cleanup_expired_sessions
+from services.trigger_service import rollup_trigger_metrics
 
 # Initialize TFrameX App on startup (this also sets up logging)
 from tframex_config import get_tframex_app_instance
@@ -29,9 +41,53 @@ load_dotenv()
 # Don't call setup_logging here - it's already done in tframex_config.py
 logger = logging.getLogger("FlaskTFrameXStudio")
 
+SESSION_CLEANUP_INTERVAL_MINUTES = int(os.getenv('SESSION_CLEANUP_INTERVAL_MINUTES', '5'))
+TRIGGER_METRICS_ROLLUP_INTERVAL_MINUTES = int(os.getenv('TRIGGER_METRICS_ROLLUP_INTERVAL_MINUTES', '60'))
+MAX_REQUEST_BODY_MB = int(os.getenv('MAX_REQUEST_BODY_MB', '16'))
+
+def start_session_cleanup(app):
+    """Purge expired user sessions (and roll up old trigger metrics) on a background interval instead of per request"""
+    scheduler = BackgroundScheduler(daemon=True)
+    scheduler.add_job(
+        cleanup_expired_sessions,
+        'interval',
+        minutes=SESSION_CLEANUP_INTERVAL_MINUTES,
+        id='cleanup_expired_sessions',
+        coalesce=True,
+        max_instances=1
+    )
+    scheduler.add_job(
+        rollup_trigger_metrics,
+        'interval',
+        minutes=TRIGGER_METRICS_ROLLUP_INTERVAL_MINUTES,
+        id='rollup_trigger_metrics',
+        coalesce=True,
+        max_instances=1
+    )
+    scheduler.start()
+    atexit.register(lambda: scheduler.shutdown(wait=False))
+    app.extensions['session_cleanup_scheduler'] = scheduler
+
 def create_app():
     """Application factory pattern"""
     app = Flask(__name__, static_folder='../frontend/dist', static_url_path='')
+    # Oversized bodies are rejected with 413 before anything reads them
+    app.config['MAX_CONTENT_LENGTH'] = MAX_REQUEST_BODY_MB * 1024 * 1024
+    if HAS_ORJSON:
+        app.json = OrjsonProvider(app)
+    if HAS_FLASK_COMPRESS:
+        # Brotli preferred, gzip fallback; sets Vary: Accept-Encoding. Streamed responses
+        # (SSE chat, export downloads) are left alone so they keep flushing incrementally.
+        app.config.setdefault('COMPRESS_ALGORITHM', ['br', 'gzip'])
+        app.config.setdefault('COMPRESS_MIN_SIZE', 1024)
+        app.config.setdefault('COMPRESS_LEVEL', 4)
+        app.config.setdefault('COMPRESS_BR_LEVEL', 4)
+        app.config.setdefault('COMPRESS_STREAMS', False)
+        app.config.setdefault('COMPRESS_MIMETYPES', [
+            'application/json', 'application/x-yaml', 'text/plain',
+            'text/html', 'text/css', 'application/javascript'
+        ])
+        Compress(app)
     
     # Configure CORS for development and production
     CORS(app, resources={
@@ -60,8 +116,8 @@ def create_app():
     get_tframex_app_instance()
     
     # Initialize MCP in async context if it was deferred
-    import asyncio
     from tframex_config import init_deferred_mcp
+    from services.async_bridge import run_sync
     
     async def setup_mcp():
         """Initialize MCP in async context."""
@@ -74,15 +130,8 @@ def create_app():
         except Exception as e:
             logger.error(f"Error during MCP setup: {e}")
     
-    # Run MCP setup in new event loop if needed
-    try:
-        # Try to get existing loop
-        asyncio.get_running_loop()
-        # If we have a loop, schedule MCP init
-        asyncio.ensure_future(setup_mcp())
-    except RuntimeError:
-        # No loop running, create one for MCP init
-        asyncio.run(setup_mcp())
+    # Run MCP setup on the shared loop, so the server sessions outlive this call
+    run_sync(setup_mcp())
     
     # Initialize trigger service
     async def setup_triggers():
@@ -117,12 +166,11 @@ def create_app():
         except Exception as e:
             logger.error(f"Error initializing trigger service: {e}")
     
-    # Run trigger setup
-    try:
-        asyncio.get_running_loop()
-        asyncio.ensure_future(setup_triggers())
-    except RuntimeError:
-        asyncio.run(setup_triggers())
+    # Run trigger setup on the shared loop; processor tasks keep running there
+    run_sync(setup_triggers())
+
+    # Expired auth sessions are cleaned up in the background, not by /api/auth/health
+    start_session_cleanup(app)
 
     # Register blueprints
     app.register_blueprint(auth_bp)
@@ -202,5 +250,6 @@ if __name__ == '__main__':
         host=host,
         port=port,
         debug=debug_mode,
+        threaded=True,  # Requests waiting on agents only block their own thread
         use_reloader=False  # Disable reloader in async context
     )
\ No newline at end of file
@@ -0,0 +1,104 @@
+# builder/backend/audit_queue.py
+"""
+Background audit-log writer.
+Request handlers enqueue entries; a daemon thread drains them into bulk inserts
+so audit logging never adds a database round-trip to user-facing latency.
+"""
+import atexit
+import logging
+import queue
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from database import bulk_create_audit_logs, create_audit_log
+
+logger = logging.getLogger("AuditQueue")
+
+AUDIT_QUEUE_MAXSIZE = 10000
+AUDIT_BATCH_SIZE = 100
+AUDIT_FLUSH_INTERVAL = 2.0  # seconds
+
+_audit_queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=AUDIT_QUEUE_MAXSIZE)
+_worker: Optional[threading.Thread] = None
+_worker_lock = threading.Lock()
+
+
+def enqueue_audit_log(
+    user_id: Optional[str],
+    organization_id: Optional[str],
+    action: str,
+    resource_type: str,
+    resource_id: Optional[str] = None,
+    details: Optional[Dict] = None,
+    ip_address: Optional[str] = None,
+    user_agent: Optional[str] = None
+):
+    """Queue an audit log entry (same arguments as database.create_audit_log)"""
+    entry = {
+        "user_id": user_id,
+        "organization_id": organization_id,
+        "action": action,
+        "resource_type": resource_type,
+        "resource_id": resource_id,
+        "details": details,
+        "ip_address": ip_address,
+        "user_agent": user_agent,
+        "timestamp": datetime.now(timezone.utc)
+    }
+    _ensure_worker()
+    try:
+        _audit_queue.put_nowait(entry)
+    except queue.Full:
+        # Writer is behind; fall back to a synchronous insert rather than drop the entry
+        logger.warning("Audit queue full, writing audit log synchronously")
+        entry.pop("timestamp")
+        create_audit_log(**entry)
+
+
+def flush_audit_logs():
+    """Write out everything currently queued"""
+    while True:
+        batch = _drain(block=False)
+        if not batch:
+            return
+        _write(batch)
+
+
+def _ensure_worker():
+    global _worker
+    if _worker is not None:
+        return
+    with _worker_lock:
+        if _worker is None:
+            _worker = threading.Thread(target=_run, name="audit-writer", daemon=True)
+            _worker.start()
+
+
+def _drain(block: bool) -> List[Dict[str, Any]]:
+    batch = []
+    try:
+        if block:
+            batch.append(_audit_queue.get(timeout=AUDIT_FLUSH_INTERVAL))
+        while len(batch) < AUDIT_BATCH_SIZE:
+            batch.append(_audit_queue.get_nowait())
+    except queue.Empty:
+        pass
+    return batch
+
+
+def _write(batch: List[Dict[str, Any]]):
+    try:
+        bulk_create_audit_logs(batch)
+    except Exception as e:
+        logger.error(f"Failed to write {len(batch)} audit log entries: {e}")
+
+
+def _run():
+    while True:
+        batch = _drain(block=True)
+        if batch:
+            _write(batch)
+
+
+atexit.register(flush_audit_logs)
@@ -3,8 +3,8 @@ Role-Based Access Control (RBAC) utilities for Agent-Builder
 Provides advanced permission checking and role management
 """
 import logging
-from typing import List, Dict, Any, Set
-from functools import wraps
+from typing import List, Dict, Any, Set, FrozenSet, Iterable
+from functools import lru_cache, wraps
 from flask import request, jsonify, g
 
 from database import (
@@ -49,7 +49,7 @@ class RBACManager:
     }
     
     @classmethod
-    def expand_permissions(cls, permissions: List[str]) -> Set[str]:
+    def expand_permissions(cls, permissions: Iterable[str]) -> Set[str]:
         """Expand wildcard and hierarchical permissions"""
         expanded = set()
         
@@ -70,8 +70,21 @@ class RBACManager:
         return expanded
     
     @classmethod
-    def check_permission(cls, user_permissions: List[str], required_permission: str) -> bool:
+    def check_permission(cls, user_permissions: Iterable[str], required_permission: str) -> bool:
         """Check if user has the required permission"""
+        if not isinstance(user_permissions, frozenset):
+            user_permissions = frozenset(user_permissions)
+        
+        # Exact match needs no expansion
+        if required_permission in user_permissions:
+            return True
+        
+        return cls._check_expanded(user_permissions, required_permission)
+    
+    @classmethod
+    @lru_cache(maxsize=1024)
+    def _check_expanded(cls, user_permissions: FrozenSet[str], required_permission: str) -> bool:
+        """Hierarchy/wildcard check; permission sets repeat across requests, so decisions are cached"""
         expanded_permissions = cls.expand_permissions(user_permissions)
         
         # Check for exact match
@@ -175,7 +188,8 @@ def require_permission(permission: str, resource_id_param: str = None, audit: bo
                 user_permissions = getattr(g, 'permissions', [])
             
             # Check permission
-            has_permission = RBACManager.check_permission(user_permissions, permission)
+            permission_set = user_permissions if project_id else getattr(g, 'permissions_set', user_permissions)
+            has_permission = RBACManager.check_permission(permission_set, permission)
             
             # Audit the permission check
             if audit:
@@ -3,12 +3,16 @@ Simple authentication security utilities
 Handles failed login tracking and basic rate limiting
 """
 import os
+import time
 import redis
 import logging
+import secrets
 from typing import Dict, Any
 from functools import wraps
 from flask import request, jsonify
 
+from ttl_cache import TTLCache
+
 logger = logging.getLogger(__name__)
 
 # Redis client for tracking auth attempts
@@ -25,6 +29,31 @@ LOCKOUT_DURATION = int(os.getenv('LOGIN_LOCKOUT_MINUTES', 15))
 RATE_LIMIT_WINDOW = 60  # 1 minute
 RATE_LIMIT_MAX_ATTEMPTS = 10  # max attempts per minute
 
+# Recent denials are remembered in-process so a burst from one IP or against a
+# locked account is answered without another Redis round trip
+_RATE_LIMIT_DENY_CACHE = TTLCache(maxsize=1024, ttl=0.1)
+_LOCKED_ACCOUNT_CACHE = TTLCache(maxsize=1024, ttl=1)
+
+# Rolling-window limiter: prune, count and record in one atomic round trip.
+# KEYS[1] = limiter key; ARGV = now_ms, window_ms, max_requests, member
+_ROLLING_WINDOW_LUA = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, tonumber(ARGV[1]) - tonumber(ARGV[2]))
+if redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[3]) then
+    redis.call('ZADD', KEYS[1], ARGV[1], ARGV[4])
+    redis.call('PEXPIRE', KEYS[1], ARGV[2])
+    return 1
+end
+return 0
+"""
+_rolling_window = redis_client.register_script(_ROLLING_WINDOW_LUA)
+
+
+def _allow_request(key: str, max_requests: int, window_seconds: int) -> bool:
+    """Record a request against a rolling window; False once the window is full"""
+    now_ms = int(time.time() * 1000)
+    member = f"{now_ms}-{secrets.token_hex(4)}"
+    return bool(_rolling_window(keys=[key], args=[now_ms, window_seconds * 1000, max_requests, member]))
+
 
 def log_auth_attempt(email: str, success: bool, ip_address: str, user_agent: str = None) -> None:
     """Log authentication attempt with details"""
@@ -62,12 +91,18 @@ def lock_account(email: str) -> None:
     """Lock account after too many failed attempts"""
     lockout_key = f"account_locked:{email}"
     redis_client.setex(lockout_key, LOCKOUT_DURATION * 60, "locked")
+    _LOCKED_ACCOUNT_CACHE.set(email, True)
     logger.warning(f"Account locked due to failed attempts: {email}")
 
 
 def is_account_locked(email: str) -> bool:
     """Check if account is locked"""
-    return redis_client.exists(f"account_locked:{email}") > 0
+    if _LOCKED_ACCOUNT_CACHE.get(email):
+        return True
+    locked = redis_client.exists(f"account_locked:{email}") > 0
+    if locked:
+        _LOCKED_ACCOUNT_CACHE.set(email, True)
+    return locked
 
 
 def get_failed_attempts(email: str) -> int:
@@ -80,22 +115,18 @@ def reset_failed_attempts(email: str) -> None:
     """Reset failed login attempts (e.g., after password reset)"""
     redis_client.delete(f"failed_login:{email}")
     redis_client.delete(f"account_locked:{email}")
+    _LOCKED_ACCOUNT_CACHE.pop(email)
 
 
 def check_rate_limit(ip_address: str) -> bool:
     """Simple IP-based rate limiting"""
-    key = f"rate_limit:{ip_address}"
+    if _RATE_LIMIT_DENY_CACHE.get(ip_address):
+        return False
+    key = f"rl:auth:{ip_address}"
     
     try:
-        # Increment counter
-        count = redis_client.incr(key)
-        
-        # Set expiration on first request
-        if count == 1:
-            redis_client.expire(key, RATE_LIMIT_WINDOW)
-        
-        # Check if over limit
-        if count > RATE_LIMIT_MAX_ATTEMPTS:
+        if not _allow_request(key, RATE_LIMIT_MAX_ATTEMPTS, RATE_LIMIT_WINDOW):
+            _RATE_LIMIT_DENY_CACHE.set(ip_address, True)
             logger.warning(f"Rate limit exceeded for IP: {ip_address}")
             return False
             
@@ -127,18 +158,10 @@ def rate_limit(max_requests: int = 10, window_seconds: int = 60):
                 return f(*args, **kwargs)
                 
             ip_address = request.remote_addr
-            key = f"rate_limit:{f.__name__}:{ip_address}"
+            key = f"rl:{f.__name__}:{ip_address}"
             
             try:
-                # Increment counter
-                count = redis_client.incr(key)
-                
-                # Set expiration on first request
-                if count == 1:
-                    redis_client.expire(key, window_seconds)
-                
-                # Check if over limit
-                if count > max_requests:
+                if not _allow_request(key, max_requests, window_seconds):
                     logger.warning(f"Rate limit exceeded for {f.__name__} from IP: {ip_address}")
                     return jsonify({
                         'error': 'Rate limit exceeded',
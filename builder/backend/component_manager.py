@@ -1,5 +1,6 @@
 # backend/component_manager.py
 # builder/backend/component_manager.py
+import functools
 import inspect
 import logging
 import json # For robust parameter serialization
@@ -9,6 +10,92 @@ from tframex import ToolParameters, ToolParameterProperty
 
 logger = logging.getLogger("ComponentManager")
 
+
+class _VersionedRegistry(dict):
+    """dict that bumps its owner's _components_version on every mutation.
+
+    Installed over TFrameXApp._agents/_tools so registrations made anywhere
+    (decorators, MCP, user code) push an invalidation instead of callers
+    re-walking the registries to detect changes.
+    """
+
+    def __init__(self, owner, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._owner = owner
+
+    def _changed(self):
+        bump_components_version(self._owner)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._changed()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._changed()
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self._changed()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self._changed()
+        return item
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            return self[key]
+        self[key] = default
+        return default
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._changed()
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
+
+def bump_components_version(app_instance):
+    """Invalidate cached component listings for app_instance"""
+    app_instance._components_version = getattr(app_instance, '_components_version', 0) + 1
+
+
+def track_component_changes(app_instance):
+    """Make agent/tool registration on app_instance invalidate the components snapshot"""
+    for attr in ("_agents", "_tools"):
+        registry = getattr(app_instance, attr)
+        if not isinstance(registry, _VersionedRegistry):
+            setattr(app_instance, attr, _VersionedRegistry(app_instance, registry))
+    bump_components_version(app_instance)
+
+
+# id(app) -> (key, components); replaced per entry, never mutated in place
+_components_snapshots = {}
+
+def _snapshot_key(app_instance):
+    mcp_manager = getattr(app_instance, '_mcp_manager', None)
+    servers = getattr(mcp_manager, '_connected_servers', None) or {}
+    # Lengths cover apps whose registries are not tracked; server aliases cover MCP connects
+    return (getattr(app_instance, '_components_version', 0),
+            len(app_instance._agents), len(app_instance._tools), tuple(servers))
+
+def get_components_snapshot(app_instance):
+    """
+    Return discover_tframex_components(app_instance), rebuilt only after the app's
+    registries changed. The result is shared between callers and must not be mutated.
+    """
+    key = _snapshot_key(app_instance)
+    cached = _components_snapshots.get(id(app_instance))
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    components = discover_tframex_components(app_instance)
+    _components_snapshots[id(app_instance)] = (key, components)
+    return components
+
 def get_pattern_constructor_params_schema(pattern_class):
     """Inspects a Pattern class's __init__ method for configurable parameters."""
     params_schema = {}
@@ -45,6 +132,21 @@ def get_pattern_constructor_params_schema(pattern_class):
         logger.error(f"Error inspecting pattern {pattern_class.__name__}: {e}", exc_info=True)
     return params_schema
 
+@functools.lru_cache(maxsize=None)
+def _discover_builtin_patterns():
+    """Built-in patterns come from the installed tframex package, so reflect over them once"""
+    patterns = []
+    for name, member in inspect.getmembers(tframex_patterns_module):
+        if inspect.isclass(member) and issubclass(member, BasePattern) and member != BasePattern:
+            patterns.append({
+                "id": name, 
+                "name": name,
+                "description": inspect.getdoc(member) or f"TFrameX Pattern: {name}",
+                "component_category": "pattern",
+                "constructor_params_schema": get_pattern_constructor_params_schema(member)
+            })
+    return tuple(patterns)
+
 def discover_tframex_components(app_instance): # app_instance is now a required argument
     """
     Discovers available TFrameX agents, tools, and patterns from the given app_instance.
@@ -120,15 +222,7 @@ def discover_tframex_components(app_instance): # app_instance is now a required
         components["tools"].append(tool_info)
     
     # Discover Built-in Patterns from the tframex.patterns module
-    for name, member in inspect.getmembers(tframex_patterns_module):
-        if inspect.isclass(member) and issubclass(member, BasePattern) and member != BasePattern:
-            components["patterns"].append({
-                "id": name, 
-                "name": name,
-                "description": inspect.getdoc(member) or f"TFrameX Pattern: {name}",
-                "component_category": "pattern",
-                "constructor_params_schema": get_pattern_constructor_params_schema(member)
-            })
+    components["patterns"].extend(_discover_builtin_patterns())
     
     # Discover MCP Servers if available (v1.1.0)
     if hasattr(app_instance, '_mcp_manager') and app_instance._mcp_manager:
@@ -248,4 +342,7 @@ def register_code_dynamically(python_code: str, app_instance_to_modify): # app_i
         return {"success": True, "message": "Code executed and components potentially registered on the target app instance."}
     except Exception as e:
         logger.error(f"Error executing user-provided code: {e}", exc_info=True)
-        return {"success": False, "message": f"Error executing code: {str(e)}"}
\ No newline at end of file
+        return {"success": False, "message": f"Error executing code: {str(e)}"}
+    finally:
+        # Even a failed exec may have registered something; invalidate cached listings
+        bump_components_version(app_instance_to_modify)
\ No newline at end of file
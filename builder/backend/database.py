@@ -4,12 +4,17 @@ Provides SQLite storage for flows and projects
 """
 import os
 import json
+import uuid
+import hashlib
 import logging
 from datetime import datetime, timezone
-from typing import List, Dict, Any, Optional
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from models import Base, Projects, Flow, FlowExecution, Organizations, Users, Roles, UserProjectRoles, AuditLog, UserSession, Triggers, TriggerExecutions
+from typing import List, Dict, Any, Optional, Union
+from sqlalchemy import create_engine, insert, update
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import configure_mappers, sessionmaker
+from models import Base, Projects, Flow, FlowExecution, Organizations, Users, Roles, UserProjectRoles, AuditLog, UserSession, Triggers, TriggerExecutions, ModelConfig
+from models.base import utcnow, uuid7
+from ttl_cache import TTLCache
 
 logger = logging.getLogger("Database")
 
@@ -17,10 +22,93 @@ logger = logging.getLogger("Database")
 DB_PATH = os.path.join(os.path.dirname(__file__), "data", "agent_builder.db")
 os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
 
-engine = create_engine(f"sqlite:///{DB_PATH}")
+DATABASE_URL = os.getenv("DATABASE_URL") or f"sqlite:///{DB_PATH}"
+
+def _engine_options(database_url: str) -> Dict[str, Any]:
+    """Driver-specific engine options for statement caching"""
+    url = make_url(database_url)
+    options: Dict[str, Any] = {
+        # SQLAlchemy compiled-statement cache (per engine, shared by all connections)
+        "query_cache_size": int(os.getenv("DB_QUERY_CACHE_SIZE", "1200")),
+    }
+    if url.get_backend_name() == "postgresql":
+        options["pool_pre_ping"] = True
+        if url.get_driver_name() == "psycopg":
+            # psycopg 3 prepares a statement server-side after it has run this many times.
+            # Set DB_PREPARE_THRESHOLD=none when running behind PgBouncer in transaction mode.
+            threshold = os.getenv("DB_PREPARE_THRESHOLD", "2")
+            options["connect_args"] = {
+                "prepare_threshold": None if threshold.lower() == "none" else int(threshold)
+            }
+    return options
+
+engine = create_engine(DATABASE_URL, **_engine_options(DATABASE_URL))
 Base.metadata.create_all(engine)
+# Resolve relationships now rather than on the first query of the first request
+configure_mappers()
 LocalSession = sessionmaker(bind=engine)
 
+# Roles and organizations are read on every permission check but rarely change.
+# Entries expire after a minute so other worker processes converge on writes.
+_role_cache = TTLCache(maxsize=1024, ttl=60)
+_organization_cache = TTLCache(maxsize=256, ttl=60)
+# The model configuration list is small and read on every GET /models and flow
+# run; writes invalidate it locally, other workers see them within a few seconds.
+_model_config_cache = TTLCache(maxsize=1, ttl=5)
+
+# Default roles seeded into every new organization
+DEFAULT_ROLES = [
+    {
+        "name": "Super Admin",
+        "permissions": ["*"],  # All permissions
+        "description": "Full system access"
+    },
+    {
+        "name": "Organization Admin", 
+        "permissions": [
+            "users.create", "users.read", "users.update", "users.delete",
+            "projects.create", "projects.read", "projects.update", "projects.delete",
+            "flows.create", "flows.read", "flows.update", "flows.delete", "flows.execute",
+            "roles.create", "roles.read", "roles.update", "roles.delete",
+            "audit.read"
+        ],
+        "description": "Organization management access"
+    },
+    {
+        "name": "Project Admin",
+        "permissions": [
+            "projects.read", "projects.update",
+            "flows.create", "flows.read", "flows.update", "flows.delete", "flows.execute",
+            "users.read"
+        ],
+        "description": "Project management access"
+    },
+    {
+        "name": "Developer",
+        "permissions": [
+            "flows.create", "flows.read", "flows.update", "flows.execute",
+            "projects.read"
+        ],
+        "description": "Flow development access"
+    },
+    {
+        "name": "User",
+        "permissions": [
+            "flows.read", "flows.execute",
+            "projects.read"
+        ],
+        "description": "Basic user access"
+    },
+    {
+        "name": "Viewer",
+        "permissions": [
+            "flows.read",
+            "projects.read"
+        ],
+        "description": "Read-only access"
+    }
+]
+
 # Project management
 def create_project(
     project_id: str,
@@ -68,7 +156,7 @@ def get_project(project_id: str) -> Optional[Dict[str, Any]]:
 def list_projects() -> List[Dict[str, Any]]:
     """List all projects"""
     with LocalSession() as session:
-        projects = session.query(Projects).order_by(Projects.updated_at.desc()).all()
+        projects = session.query(Projects).order_by(Projects.updated_at.desc(), Projects.id).all()
         return [{
             "id": project.id,
             "name": project.name,
@@ -78,6 +166,16 @@ def list_projects() -> List[Dict[str, Any]]:
         } for project in projects]
 
 # Flow management
+def compute_flow_summary(nodes: List[Dict], edges: List[Dict]) -> Dict[str, Any]:
+    """Small precomputed digest of a flow graph, stored alongside it"""
+    canonical = json.dumps([nodes, edges], sort_keys=True, separators=(",", ":"), default=str)
+    return {
+        "node_count": len(nodes),
+        "edge_count": len(edges),
+        "agent_types": sorted({node.get("type") for node in nodes if node.get("type")}),
+        "hash": hashlib.blake2b(canonical.encode(), digest_size=8).hexdigest()
+    }
+
 def save_flow(
     flow_id: str,
     project_id: str,
@@ -88,6 +186,7 @@ def save_flow(
     flow_metadata: Optional[Dict] = None
 ) -> Dict[str, Any]:
     """Save or update a flow"""
+    summary = compute_flow_summary(nodes, edges)
     with LocalSession() as session:
         # Check if flow exists
         flow = session.query(Flow).filter(Flow.id == flow_id).first()
@@ -98,7 +197,8 @@ def save_flow(
             flow.nodes = nodes
             flow.edges = edges
             flow.flow_metadata = flow_metadata or {}
-            flow.updated_at = datetime.now(timezone.utc)
+            flow.summary = summary
+            flow.updated_at = utcnow()
         else:
             flow = Flow(
                 id=flow_id,
@@ -108,8 +208,7 @@ def save_flow(
                 nodes=nodes,
                 edges=edges,
                 flow_metadata=flow_metadata or {},
-                created_at=datetime.now(timezone.utc),
-                updated_at=datetime.now(timezone.utc)
+                summary=summary
             )
             session.add(flow)
 
@@ -124,6 +223,7 @@ def save_flow(
             "nodes": flow.nodes,
             "edges": flow.edges,
             "flow_metadata": flow.flow_metadata,
+            "summary": flow.summary,
             "created_at": flow.created_at.isoformat() if flow.created_at else None,
             "updated_at": flow.updated_at.isoformat() if flow.updated_at else None
         }
@@ -141,26 +241,29 @@ def get_flow(flow_id: str) -> Optional[Dict[str, Any]]:
                 "nodes": flow.nodes,
                 "edges": flow.edges,
                 "flow_metadata": flow.flow_metadata,
+                "summary": flow.summary,
                 "created_at": flow.created_at.isoformat(),
                 "updated_at": flow.updated_at.isoformat()
             }
         return None
 
 def list_flows(project_id: Optional[str] = None) -> List[Dict[str, Any]]:
-    """List flows, optionally filtered by project"""
+    """List flows, optionally filtered by project (summaries only; use get_flow for the graph)"""
     with LocalSession() as session:
-        query = session.query(Flow)
+        query = session.query(
+            Flow.id, Flow.project_id, Flow.name, Flow.description,
+            Flow.flow_metadata, Flow.summary, Flow.created_at, Flow.updated_at
+        )
         if project_id:
             query = query.filter(Flow.project_id == project_id)
-        flows = query.order_by(Flow.updated_at.desc()).all()
+        flows = query.order_by(Flow.updated_at.desc(), Flow.id).all()
         return [{
             "id": flow.id,
             "project_id": flow.project_id,
             "name": flow.name,
             "description": flow.description,
-            "nodes": flow.nodes,
-            "edges": flow.edges,
             "flow_metadata": flow.flow_metadata,
+            "summary": flow.summary or {},
             "created_at": flow.created_at.isoformat(),
             "updated_at": flow.updated_at.isoformat()
         } for flow in flows]
@@ -179,7 +282,7 @@ def delete_flow(flow_id: str) -> bool:
 def create_flow_execution(
     flow_id: str,
     input_data: Optional[Dict] = None
-) -> int:
+) -> uuid.UUID:
     """Create a new flow execution record"""
     with LocalSession() as session:
         execution = FlowExecution(
@@ -192,12 +295,14 @@ def create_flow_execution(
         return execution.id
 
 def update_flow_execution(
-    execution_id: int,
+    execution_id: Union[uuid.UUID, str],
     status: str,
     output_data: Optional[Dict] = None,
     error_message: Optional[str] = None
 ):
     """Update flow execution status"""
+    if isinstance(execution_id, str):
+        execution_id = uuid.UUID(execution_id)
     with LocalSession() as session:
         execution = session.get(FlowExecution, execution_id)
         if execution:
@@ -245,14 +350,12 @@ def create_organization(
             id=org_id,
             name=name,
             description=description,
-            settings=settings or {},
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc)
+            settings=settings or {}
         )
         session.add(org)
         session.commit()
         session.refresh(org)
-        return {
+        result = {
             "id": org.id,
             "name": org.name,
             "description": org.description,
@@ -260,13 +363,18 @@ def create_organization(
             "created_at": org.created_at.isoformat(),
             "updated_at": org.updated_at.isoformat()
         }
+        _organization_cache.set(org.id, result)
+        return dict(result)
 
 def get_organization(org_id: str) -> Optional[Dict[str, Any]]:
-    """Get organization by ID"""
+    """Get organization by ID (cached)"""
+    cached = _organization_cache.get(org_id)
+    if cached is not None:
+        return dict(cached)
     with LocalSession() as session:
         org = session.query(Organizations).filter(Organizations.id == org_id).first()
         if org:
-            return {
+            result = {
                 "id": org.id,
                 "name": org.name,
                 "description": org.description,
@@ -274,6 +382,8 @@ def get_organization(org_id: str) -> Optional[Dict[str, Any]]:
                 "created_at": org.created_at.isoformat(),
                 "updated_at": org.updated_at.isoformat()
             }
+            _organization_cache.set(org_id, result)
+            return dict(result)
     return None
 
 def list_organizations() -> List[Dict[str, Any]]:
@@ -325,37 +435,38 @@ def create_user(
             "created_at": user.created_at.isoformat()
         }
 
+def _serialize_user(user: Users) -> Dict[str, Any]:
+    return {
+        "id": user.id,
+        "keycloak_id": user.keycloak_id,
+        "email": user.email,
+        "username": user.username,
+        "organization_id": user.organization_id,
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+        "is_active": user.is_active,
+        "created_at": user.created_at.isoformat(),
+        "updated_at": user.updated_at.isoformat() if user.updated_at else None,
+        "last_login": user.last_login.isoformat() if user.last_login else None
+    }
+
 def get_user(user_id: str) -> Optional[Dict[str, Any]]:
     """Get user by ID"""
     with LocalSession() as session:
         user = session.get(Users, user_id)
-        if user:
-            return {
-                "id": user.id,
-                "keycloak_id": user.keycloak_id,
-                "email": user.email,
-                "username": user.username,
-                "organization_id": user.organization_id,
-                "first_name": user.first_name,
-                "last_name": user.last_name,
-                "is_active": user.is_active,
-                "created_at": user.created_at.isoformat(),
-                "updated_at": user.updated_at.isoformat() if user.updated_at else None,
-                "last_login": user.last_login.isoformat() if user.last_login else None
-            }
-        return None
+        return _serialize_user(user) if user else None
 
 def get_user_by_keycloak_id(keycloak_id: str) -> Optional[Dict[str, Any]]:
     """Get user by Keycloak ID"""
     with LocalSession() as session:
         user = session.query(Users).filter(Users.keycloak_id == keycloak_id).first()
-        return get_user(user.id) if user else None
+        return _serialize_user(user) if user else None
 
 def get_user_by_email(email: str) -> Optional[Dict[str, Any]]:
     """Get user by email"""
     with LocalSession() as session:
         user = session.query(Users).filter(Users.email == email).first()
-        return get_user(user.id) if user else None
+        return _serialize_user(user) if user else None
 
 def update_user_last_login(user_id: str):
     """Update user's last login timestamp"""
@@ -365,11 +476,57 @@ def update_user_last_login(user_id: str):
             user.last_login = datetime.now()
             session.commit()
 
+def login_user_by_keycloak_id(keycloak_id: str) -> Optional[Dict[str, Any]]:
+    """Stamp last_login for a returning user and return it (single UPDATE ... RETURNING)"""
+    with LocalSession() as session:
+        user = session.execute(
+            update(Users)
+            .where(Users.keycloak_id == keycloak_id)
+            .values(last_login=utcnow())
+            .returning(Users)
+        ).scalar_one_or_none()
+        # Serialize before commit expires the instance
+        result = _serialize_user(user) if user else None
+        session.commit()
+        return result
+
+def create_organization_with_defaults(
+    org_row: Dict[str, Any],
+    user_row: Dict[str, Any],
+    role_rows: Optional[List[Dict[str, Any]]] = None
+) -> Dict[str, Any]:
+    """Create an organization, its roles and its first user as Organization Admin
+    in one transaction. role_rows default to DEFAULT_ROLES; returns the user."""
+    org_id = org_row["id"]
+    if role_rows is None:
+        role_rows = [
+            {**role_data, "id": str(uuid7()), "organization_id": org_id}
+            for role_data in DEFAULT_ROLES
+        ]
+    admin_role_id = next(row["id"] for row in role_rows if row["name"] == "Organization Admin")
+
+    with LocalSession.begin() as session:
+        session.execute(insert(Organizations).values({"settings": {}, **org_row}))
+        # executemany: one round-trip for all role rows
+        session.execute(insert(Roles), role_rows)
+        user = session.execute(
+            insert(Users)
+            .values({"organization_id": org_id, "last_login": utcnow(), **user_row})
+            .returning(Users)
+        ).scalar_one()
+        # Organization-level roles use the special project_id "org:<org_id>"
+        session.execute(insert(UserProjectRoles).values(
+            user_id=user.id,
+            project_id=f"org:{org_id}",
+            role_id=admin_role_id
+        ))
+        return _serialize_user(user)
+
 def list_users_in_organization(org_id: str) -> List[Dict[str, Any]]:
     """List all users in an organization"""
     with LocalSession() as session:
         users = session.query(Users).filter(Users.organization_id == org_id).all()
-        return [get_user(user.id) for user in users]
+        return [_serialize_user(user) for user in users]
 
 # Role management
 def create_role(role_id: str, name: str, permissions: List[str], organization_id: str, description: str = "") -> Dict[str, Any]:
@@ -385,7 +542,7 @@ def create_role(role_id: str, name: str, permissions: List[str], organization_id
         session.add(role)
         session.commit()
         session.refresh(role)
-        return {
+        result = {
             "id": role.id,
             "name": role.name,
             "description": role.description,
@@ -393,13 +550,18 @@ def create_role(role_id: str, name: str, permissions: List[str], organization_id
             "organization_id": role.organization_id,
             "created_at": role.created_at.isoformat()
         }
+        _role_cache.set(role.id, result)
+        return dict(result)
 
 def get_role(role_id: str) -> Optional[Dict[str, Any]]:
-    """Get role by ID"""
+    """Get role by ID (cached)"""
+    cached = _role_cache.get(role_id)
+    if cached is not None:
+        return dict(cached)
     with LocalSession() as session:
         role = session.get(Roles, role_id)
         if role:
-            return {
+            result = {
                 "id": role.id,
                 "name": role.name,
                 "description": role.description,
@@ -407,6 +569,8 @@ def get_role(role_id: str) -> Optional[Dict[str, Any]]:
                 "organization_id": role.organization_id,
                 "created_at": role.created_at.isoformat()
             }
+            _role_cache.set(role_id, result)
+            return dict(result)
         return None
 
 def list_roles_in_organization(org_id: str) -> List[Dict[str, Any]]:
@@ -454,20 +618,18 @@ def get_user_project_roles(user_id: str, project_id: str) -> List[Dict[str, Any]
             UserProjectRoles.user_id == user_id,
             UserProjectRoles.project_id == project_id
         ).all()
-        roles = []
-        for user_project_role in user_project_roles:
-            role = {
-                "id": user_project_role.role.id,
-                "name": user_project_role.role.name,
-                "description": user_project_role.role.description,
-                "permissions": user_project_role.role.permissions or [],
-                "organization_id": user_project_role.role.organization_id,
-                "created_at": user_project_role.role.created_at.isoformat(),
-                "assigned_at": user_project_role.assigned_at,
-                "assigned_by": user_project_role.assigned_by
-            }
-            roles.append(role)
-        return roles
+        assignments = [(upr.role_id, upr.assigned_at, upr.assigned_by) for upr in user_project_roles]
+
+    roles = []
+    for role_id, assigned_at, assigned_by in assignments:
+        role = get_role(role_id)
+        if not role:
+            continue
+        role["permissions"] = role["permissions"] or []
+        role["assigned_at"] = assigned_at
+        role["assigned_by"] = assigned_by
+        roles.append(role)
+    return roles
 
 def get_user_permissions_in_project(user_id: str, project_id: str) -> List[str]:
     """Get all permissions for a user in a specific project"""
@@ -477,6 +639,92 @@ def get_user_permissions_in_project(user_id: str, project_id: str) -> List[str]:
         permissions.update(role['permissions'])
     return list(permissions)
 
+# LLM model configurations
+def _serialize_model_config(config: ModelConfig) -> Dict[str, Any]:
+    result = {
+        "id": config.id,
+        "name": config.name,
+        "provider": config.provider,
+        "model_name": config.model_name,
+        "api_key": config.api_key,
+        "base_url": config.base_url,
+        "is_default": config.is_default
+    }
+    if config.temperature is not None:
+        result["temperature"] = config.temperature
+    if config.max_tokens is not None:
+        result["max_tokens"] = config.max_tokens
+    return result
+
+def list_model_configs() -> List[Dict[str, Any]]:
+    """List all model configurations (cached; treat the result as read-only)"""
+    cached = _model_config_cache.get("all")
+    if cached is not None:
+        return cached
+    with LocalSession() as session:
+        configs = session.query(ModelConfig).order_by(ModelConfig.created_at).all()
+        result = [_serialize_model_config(config) for config in configs]
+    _model_config_cache.set("all", result)
+    return result
+
+def create_model_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Store a new model configuration"""
+    with LocalSession() as session:
+        model_config = ModelConfig(**config)
+        session.add(model_config)
+        session.commit()
+        result = _serialize_model_config(model_config)
+    _model_config_cache.clear()
+    return result
+
+def upsert_model_config(config: Dict[str, Any], make_default_if_none: bool = False) -> Dict[str, Any]:
+    """Create or refresh a model configuration (e.g. the env-derived default).
+
+    The row keeps its is_default flag on update; with make_default_if_none it
+    becomes the default when no configuration currently is.
+    """
+    fields = {key: value for key, value in config.items() if key not in ("id", "is_default")}
+    with LocalSession() as session:
+        model_config = session.get(ModelConfig, config["id"])
+        if model_config:
+            for key, value in fields.items():
+                setattr(model_config, key, value)
+        else:
+            model_config = ModelConfig(id=config["id"], is_default=False, **fields)
+            session.add(model_config)
+        if make_default_if_none and not model_config.is_default:
+            has_default = session.query(ModelConfig.id).filter(ModelConfig.is_default.is_(True)).first()
+            model_config.is_default = has_default is None
+        session.commit()
+        result = _serialize_model_config(model_config)
+    _model_config_cache.clear()
+    return result
+
+def delete_model_config(model_id: str) -> bool:
+    """Delete a model configuration"""
+    with LocalSession() as session:
+        deleted = session.query(ModelConfig).filter(ModelConfig.id == model_id).delete()
+        session.commit()
+    _model_config_cache.clear()
+    return deleted > 0
+
+def set_default_model_config(model_id: str) -> Optional[Dict[str, Any]]:
+    """Make one model configuration the default, clearing the flag on the others"""
+    with LocalSession() as session:
+        model_config = session.get(ModelConfig, model_id)
+        if not model_config:
+            return None
+        session.execute(
+            update(ModelConfig)
+            .where(ModelConfig.is_default.is_(True), ModelConfig.id != model_id)
+            .values(is_default=False)
+        )
+        model_config.is_default = True
+        session.commit()
+        result = _serialize_model_config(model_config)
+    _model_config_cache.clear()
+    return result
+
 # Audit logging
 def create_audit_log(
     user_id: Optional[str],
@@ -504,6 +752,28 @@ def create_audit_log(
         session.add(log)
         session.commit()
 
+def bulk_create_audit_logs(rows: List[Dict[str, Any]]):
+    """Insert many audit log entries in one statement (rows use create_audit_log's keyword names)"""
+    if not rows:
+        return
+    with LocalSession() as session:
+        session.execute(insert(AuditLog), [
+            {
+                "id": uuid7(),
+                "user_id": row.get("user_id"),
+                "organization_id": row.get("organization_id"),
+                "action": row["action"],
+                "resource_type": row["resource_type"],
+                "resource_id": row.get("resource_id"),
+                "details": row.get("details") or {},
+                "ip_address": row.get("ip_address"),
+                "user_agent": row.get("user_agent"),
+                "timestamp": row.get("timestamp") or datetime.now(timezone.utc)
+            }
+            for row in rows
+        ])
+        session.commit()
+
 def get_audit_logs(
     organization_id: Optional[str] = None,
     user_id: Optional[str] = None,
@@ -547,11 +817,12 @@ def create_user_session(
     session_id: str,
     user_id: str,
     refresh_token_jti: str,
-    expires_at: datetime,
+    expires_at_epoch: int,
     ip_address: Optional[str] = None,
     user_agent: Optional[str] = None
 ):
-    """Create a user session record"""
+    """Create a user session record; expires_at_epoch is a Unix timestamp"""
+    now = datetime.now(timezone.utc)
     with LocalSession() as session:
         user_session = UserSession(
             id=session_id,
@@ -559,9 +830,9 @@ def create_user_session(
             refresh_token_jti=refresh_token_jti,
             ip_address=ip_address,
             user_agent=user_agent,
-            created_at=datetime.now(timezone.utc),
-            expires_at=expires_at,
-            last_activity=datetime.now(timezone.utc)
+            created_at=now,
+            expires_at=datetime.fromtimestamp(expires_at_epoch, timezone.utc),
+            last_activity=now
         )
         session.add(user_session)
         session.commit()
@@ -610,68 +881,17 @@ def get_user_sessions(user_id: str) -> List[Dict[str, Any]]:
         } for s in sessions]
 
 # Initialize default roles
-def create_default_roles(organization_id: str):
-    """Create default roles for a new organization"""
-    import uuid
-    
-    default_roles = [
-        {
-            "name": "Super Admin",
-            "permissions": ["*"],  # All permissions
-            "description": "Full system access"
-        },
-        {
-            "name": "Organization Admin", 
-            "permissions": [
-                "users.create", "users.read", "users.update", "users.delete",
-                "projects.create", "projects.read", "projects.update", "projects.delete",
-                "flows.create", "flows.read", "flows.update", "flows.delete", "flows.execute",
-                "roles.create", "roles.read", "roles.update", "roles.delete",
-                "audit.read"
-            ],
-            "description": "Organization management access"
-        },
-        {
-            "name": "Project Admin",
-            "permissions": [
-                "projects.read", "projects.update",
-                "flows.create", "flows.read", "flows.update", "flows.delete", "flows.execute",
-                "users.read"
-            ],
-            "description": "Project management access"
-        },
-        {
-            "name": "Developer",
-            "permissions": [
-                "flows.create", "flows.read", "flows.update", "flows.execute",
-                "projects.read"
-            ],
-            "description": "Flow development access"
-        },
-        {
-            "name": "User",
-            "permissions": [
-                "flows.read", "flows.execute",
-                "projects.read"
-            ],
-            "description": "Basic user access"
-        },
-        {
-            "name": "Viewer",
-            "permissions": [
-                "flows.read",
-                "projects.read"
-            ],
-            "description": "Read-only access"
-        }
-    ]
-    
-    for role_data in default_roles:
-        role_id = str(uuid.uuid4())
+def create_default_roles(organization_id: str) -> Dict[str, str]:
+    """Create default roles for a new organization; returns role name -> role id"""
+    role_ids = {}
+    for role_data in DEFAULT_ROLES:
+        role_id = str(uuid7())
         create_role(
             role_id=role_id,
             name=role_data["name"],
             permissions=role_data["permissions"],
             organization_id=organization_id,
             description=role_data["description"]
-        )
\ No newline at end of file
+        )
+        role_ids[role_data["name"]] = role_id
+    return role_ids
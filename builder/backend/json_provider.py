@@ -0,0 +1,106 @@
+# builder/backend/json_provider.py
+"""
+orjson-backed JSON provider for Flask, plus module-level helpers.
+The provider is installed by the app factory when orjson is available;
+the helpers fall back to the stdlib json module when it is not.
+"""
+import json
+from datetime import date, datetime, timezone
+from typing import Any, Union
+
+from flask import request
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.exceptions import BadRequest
+
+# Optional import - the default provider is used if orjson is missing
+try:
+    import orjson
+    HAS_ORJSON = True
+    # datetimes without tzinfo are treated as UTC; dataclasses serialize natively
+    ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+except ImportError:
+    HAS_ORJSON = False
+    ORJSON_OPTIONS = 0
+
+
+def _default(obj: Any) -> Any:
+    """Fallback for types orjson does not handle itself"""
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, datetime):
+        # Only reached on the stdlib path; naive values are UTC, as with OPT_NAIVE_UTC
+        if obj.tzinfo is None:
+            obj = obj.replace(tzinfo=timezone.utc)
+        return obj.isoformat()
+    if isinstance(obj, date):
+        return obj.isoformat()
+    if hasattr(obj, "__html__"):
+        return str(obj.__html__())
+    return str(obj)
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Serialize to UTF-8 JSON bytes with the same options as the provider"""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, default=_default, option=ORJSON_OPTIONS)
+    return json.dumps(obj, default=_default).encode()
+
+
+def dumps_indent(obj: Any) -> str:
+    """Serialize to a two-space indented JSON string"""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, default=_default, option=ORJSON_OPTIONS | orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, default=_default, indent=2)
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Parse JSON; raises json.JSONDecodeError (orjson's error subclasses it)"""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def raw_json(raw: Union[str, bytes], parsed: Any) -> Any:
+    """Embed already-valid JSON text in a response without re-encoding it.
+
+    Returns an orjson Fragment when orjson is available; otherwise the parsed
+    value, which the stdlib provider serializes as usual.
+    """
+    if HAS_ORJSON and hasattr(orjson, "Fragment"):
+        return orjson.Fragment(raw)
+    return parsed
+
+
+def request_json() -> Any:
+    """Parse the current request body as JSON, without caching the raw bytes.
+
+    Unlike request.get_json() this ignores the Content-Type header. Bodies over
+    MAX_CONTENT_LENGTH are rejected with 413 before they are read; malformed
+    JSON raises 400 like get_json().
+    """
+    try:
+        return loads(request.get_data(cache=False))
+    except ValueError as e:
+        raise BadRequest(f"Failed to decode JSON object: {e}")
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that serializes with orjson.
+
+    Calls that pass stdlib json keyword arguments (indent, cls, ...) are
+    delegated to the default provider.
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return dumps_bytes(obj).decode()
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps_bytes(obj), mimetype=self.mimetype)
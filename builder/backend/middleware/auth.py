@@ -70,6 +70,7 @@ class JWTMiddleware:
                 g.user_id = payload.get('sub')
                 g.organization_id = payload.get('organization_id')
                 g.permissions = payload.get('permissions', [])
+                g.permissions_set = frozenset(g.permissions)
                 logger.debug(f"User context set: user_id={g.user_id}, permissions={g.permissions}")
             except AuthError:
                 # Let individual routes handle authentication as needed
@@ -154,6 +155,7 @@ def require_auth(f):
                 g.user_id = payload.get('sub')
                 g.organization_id = payload.get('organization_id')
                 g.permissions = payload.get('permissions', [])
+                g.permissions_set = frozenset(g.permissions)
                 logger.debug(f"Require auth: user_id={g.user_id}, permissions={g.permissions}")
                 
             except AuthError as e:
@@ -172,13 +174,14 @@ def require_permission(permission: str):
         @require_auth
         def decorated_function(*args, **kwargs):
             user_permissions = getattr(g, 'permissions', [])
+            permission_set = getattr(g, 'permissions_set', None) or frozenset(user_permissions)
             
             # Check for admin permission (grants all access)
-            if '*' in user_permissions or 'admin' in user_permissions:
+            if '*' in permission_set or 'admin' in permission_set:
                 return f(*args, **kwargs)
             
             # Check for specific permission
-            if permission not in user_permissions:
+            if permission not in permission_set:
                 return jsonify({
                     'error': 'Insufficient permissions',
                     'message': f'Permission "{permission}" required',
@@ -8,7 +8,8 @@ from .organizations import Organizations
 from .users import Users
 from .roles import Roles
 from .user_project_roles import UserProjectRoles
-from .triggers import Triggers, TriggerExecutions
+from .triggers import Triggers, TriggerExecutions, TriggerMetric, TriggerLastError
+from .model_config import ModelConfig
 
 __all__ = [
     "Base",
@@ -22,5 +23,8 @@ __all__ = [
     "Roles",
     "UserProjectRoles",
     "Triggers",
-    "TriggerExecutions"
+    "TriggerExecutions",
+    "TriggerMetric",
+    "TriggerLastError",
+    "ModelConfig"
 ]
\ No newline at end of file
@@ -1,8 +1,9 @@
-from sqlalchemy import Integer, String, ForeignKey, Index, JSON
+from sqlalchemy import String, ForeignKey, Index, JSON, Uuid
 from sqlalchemy.orm import Mapped, mapped_column
 from datetime import datetime, timezone
+import uuid
 from typing import Optional, Dict
-from .base import Base
+from .base import Base, uuid7
 
 class AuditLog(Base):
     __tablename__ = "audit_logs"
@@ -12,9 +13,9 @@ class AuditLog(Base):
         Index("idx_audit_logs_timestamp", "timestamp"),
     )
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    user_id: Mapped[Optional[str]] = mapped_column(String, ForeignKey("users.id"))
-    organization_id: Mapped[Optional[str]] = mapped_column(String, ForeignKey("organizations.id"))
+    id: Mapped[uuid.UUID] = mapped_column(Uuid(native_uuid=True), primary_key=True, default=uuid7)
+    user_id: Mapped[Optional[str]] = mapped_column(String(64), ForeignKey("users.id"))
+    organization_id: Mapped[Optional[str]] = mapped_column(String(64), ForeignKey("organizations.id"))
     action: Mapped[str] = mapped_column(String, nullable=False)
     resource_type: Mapped[str] = mapped_column(String, nullable=False)
     resource_id: Mapped[Optional[str]] = mapped_column(String, nullable=True)
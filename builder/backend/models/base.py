@@ -1,6 +1,11 @@
-from sqlalchemy import DateTime, Integer, String, Float, MetaData, JSON
-from sqlalchemy.orm import DeclarativeBase, registry
+from sqlalchemy import Boolean, DateTime, Integer, String, Float, MetaData, JSON, func
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, registry
+from sqlalchemy.sql.expression import FunctionElement
 from datetime import datetime
+import os
+import time
+import uuid
 
 metadata = MetaData()
 
@@ -8,7 +13,7 @@ type_annotation_map = {
     str: String().with_variant(String(255), "mysql", "mariadb"),
     int: Integer,
     float: Float,
-    bool: Integer,
+    bool: Boolean(),
     dict: JSON,
     list: JSON,
     datetime: DateTime(timezone=True),
@@ -16,6 +21,43 @@ type_annotation_map = {
 mapper_registry = registry(type_annotation_map = type_annotation_map)
 
 class Base(DeclarativeBase):
-    metadata = metadata 
+    metadata = metadata
     type_annotation_map = type_annotation_map
-    mapper_registry = mapper_registry
\ No newline at end of file
+    mapper_registry = mapper_registry
+
+
+class utcnow(FunctionElement):
+    """The database's current timestamp, with sub-second precision on SQLite"""
+    type = DateTime(timezone=True)
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _utcnow_default(element, compiler, **kw):
+    return compiler.process(func.now(), **kw)
+
+
+@compiles(utcnow, "sqlite")
+def _utcnow_sqlite(element, compiler, **kw):
+    # now() is CURRENT_TIMESTAMP on SQLite, which only has 1-second resolution
+    return "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+
+
+class TimestampMixin:
+    """created_at / updated_at columns filled in by the database clock"""
+    created_at: Mapped[datetime] = mapped_column(server_default=utcnow(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        server_default=utcnow(), onupdate=utcnow(), nullable=False
+    )
+
+
+def uuid7() -> uuid.UUID:
+    """Generate a time-ordered UUIDv7 (48-bit ms timestamp + 74 random bits).
+
+    Ids sort by creation time, so B-tree inserts land on the right edge like an
+    autoincrement key without funnelling every writer through one sequence.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # version 7
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # RFC 4122 variant
+    return uuid.UUID(int=value)
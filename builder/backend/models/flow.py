@@ -1,10 +1,9 @@
 from sqlalchemy import String, ForeignKey, Index, JSON
 from sqlalchemy.orm import relationship, Mapped, mapped_column
-from datetime import datetime, timezone
 from typing import List, Dict, Optional
-from .base import Base
+from .base import Base, TimestampMixin
 
-class Flow(Base):
+class Flow(Base, TimestampMixin):
     __tablename__ = "flows"
     __table_args__ = (
         Index("idx_flows_project_id", "project_id"),
@@ -19,12 +18,8 @@ class Flow(Base):
     nodes: Mapped[List[Dict]] = mapped_column(JSON, nullable=False)
     edges: Mapped[List[Dict]] = mapped_column(JSON, nullable=False)
     flow_metadata: Mapped[Optional[Dict]] = mapped_column(JSON, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(
-        default=lambda: datetime.now(timezone.utc), nullable=False
-    )
-    updated_at: Mapped[datetime] = mapped_column(
-        default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False
-    )
+    # {"node_count", "edge_count", "agent_types", "hash"} computed on save so listings skip nodes/edges
+    summary: Mapped[Dict] = mapped_column(JSON, nullable=False, default=dict)
 
     project = relationship("Projects", back_populates="flows")
     executions = relationship("FlowExecution", back_populates="flow", cascade="all, delete-orphan")
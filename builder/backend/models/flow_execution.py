@@ -1,19 +1,20 @@
-from sqlalchemy import Integer, String, ForeignKey, Index, JSON
+from sqlalchemy import String, ForeignKey, Index, JSON, Uuid
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from datetime import datetime, timezone
+import uuid
 from typing import Dict, Optional
-from .base import Base
+from .base import Base, uuid7
 
 class FlowExecution(Base):
     __tablename__ = "flow_executions"
     __table_args__ = (
-        Index("idx_flow_executions_flow_id", "flow_id"),
+        Index("idx_flow_executions_flow_id", "flow_id", postgresql_include=("status", "started_at")),
         Index("idx_flow_executions_status", "status"),
     )
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    id: Mapped[uuid.UUID] = mapped_column(Uuid(native_uuid=True), primary_key=True, default=uuid7)
     flow_id: Mapped[str] = mapped_column(
-        String(64), ForeignKey("flows.id", ondelete="CASCADE"), nullable=False, index=True
+        String(64), ForeignKey("flows.id", ondelete="CASCADE"), nullable=False
     )
     status: Mapped[str] = mapped_column(String(32), nullable=False)
     input_data: Mapped[Optional[Dict]] = mapped_column(JSON, nullable=True)
@@ -0,0 +1,17 @@
+from sqlalchemy import String, Text, Float, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+from typing import Optional
+from .base import Base, TimestampMixin
+
+class ModelConfig(Base, TimestampMixin):
+    __tablename__ = "model_configs"
+
+    id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    name: Mapped[str] = mapped_column(String, nullable=False)
+    provider: Mapped[str] = mapped_column(String(64), nullable=False)
+    model_name: Mapped[str] = mapped_column(String, nullable=False)
+    api_key: Mapped[str] = mapped_column(Text, nullable=False)
+    base_url: Mapped[str] = mapped_column(Text, nullable=False)
+    is_default: Mapped[bool] = mapped_column(default=False, nullable=False)
+    temperature: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    max_tokens: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
@@ -1,11 +1,11 @@
-from sqlalchemy import Column, String, Boolean, DateTime, Integer, Text, ForeignKey, Index, JSON
+from sqlalchemy import Column, String, Boolean, DateTime, Integer, Text, ForeignKey, Index, JSON, Uuid, UniqueConstraint, text
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from datetime import datetime, timezone
 from typing import Optional, Dict, Any
-from .base import Base
+from .base import Base, TimestampMixin, uuid7
 import uuid
 
-class Triggers(Base):
+class Triggers(Base, TimestampMixin):
     __tablename__ = 'triggers'
     
     id: Mapped[str] = mapped_column(String(64), primary_key=True, default=lambda: str(uuid.uuid4()), nullable=False)
@@ -15,31 +15,31 @@ class Triggers(Base):
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     config: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=False)  # JSONB config for trigger
     enabled: Mapped[bool] = mapped_column(Boolean, default=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
-    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
     created_by: Mapped[Optional[str]] = mapped_column(String(64), ForeignKey('users.id'), nullable=True)
     organization_id: Mapped[Optional[str]] = mapped_column(String(64), ForeignKey('organizations.id'), nullable=True)
     
     # Trigger-specific metadata
     webhook_url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)  # for webhook triggers
     next_run_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)  # for scheduled triggers
-    last_triggered_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
-    trigger_count: Mapped[int] = mapped_column(Integer, default=0)
-    error_count: Mapped[int] = mapped_column(Integer, default=0)
-    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # Firing counts and last run live in TriggerMetric rows, the last error in TriggerLastError
     
     # Relationships - simplified for initial testing
     # flow = relationship("Flow", back_populates="triggers")
     # creator = relationship("Users", foreign_keys=[created_by])
     # organization = relationship("Organizations", foreign_keys=[organization_id])
     executions = relationship("TriggerExecutions", back_populates="trigger", cascade="all, delete-orphan")
+    metrics = relationship("TriggerMetric", back_populates="trigger", cascade="all, delete-orphan", passive_deletes=True)
+    last_error_entry = relationship("TriggerLastError", back_populates="trigger", uselist=False,
+                                    cascade="all, delete-orphan", passive_deletes=True)
     
     # Indexes
     __table_args__ = (
         Index('idx_triggers_flow_id', 'flow_id'),
         Index('idx_triggers_type', 'type'),
-        Index('idx_triggers_enabled', 'enabled'),
-        Index('idx_triggers_next_run', 'next_run_at'),
+        # Partial index for the scheduler's "enabled and due" scan
+        Index('idx_triggers_due', 'next_run_at',
+              postgresql_where=text('enabled = true'),
+              sqlite_where=text('enabled = 1')),
         # Note: Unique constraint on webhook_url removed for SQLite compatibility
     )
 
@@ -49,7 +49,7 @@ class TriggerExecutions(Base):
     
     id: Mapped[str] = mapped_column(String(64), primary_key=True, default=lambda: str(uuid.uuid4()), nullable=False)
     trigger_id: Mapped[str] = mapped_column(String(64), ForeignKey('triggers.id', ondelete='CASCADE'), nullable=False)
-    flow_execution_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey('flow_executions.id'), nullable=True)
+    flow_execution_id: Mapped[Optional[uuid.UUID]] = mapped_column(Uuid(native_uuid=True), ForeignKey('flow_executions.id'), nullable=True)
     triggered_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
     completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     status: Mapped[str] = mapped_column(String(50), nullable=False)  # 'success', 'failure', 'timeout', 'running'
@@ -63,7 +63,46 @@ class TriggerExecutions(Base):
     
     # Indexes
     __table_args__ = (
-        Index('idx_executions_trigger_id', 'trigger_id'),
+        # Per-trigger history, newest first (covers the trigger_id-only lookups too)
+        Index('idx_executions_trigger_time', 'trigger_id', triggered_at.desc()),
+        Index('idx_executions_trigger_status_time', 'trigger_id', 'status', triggered_at.desc()),
         Index('idx_executions_triggered_at', 'triggered_at'),
         Index('idx_executions_status', 'status'),
-    )
\ No newline at end of file
+    )
+
+
+# bucket_ts of the per-trigger row that older minute buckets are rolled up into
+METRICS_ROLLUP_BUCKET = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class TriggerMetric(Base):
+    """Firing counters, one row per (trigger, minute) bumped with an upsert.
+
+    Minute rows past the rollup window are folded into the trigger's
+    METRICS_ROLLUP_BUCKET row, so totals are summed over a bounded set of rows.
+    """
+    __tablename__ = 'trigger_metrics'
+
+    id: Mapped[uuid.UUID] = mapped_column(Uuid(native_uuid=True), primary_key=True, default=uuid7)
+    trigger_id: Mapped[str] = mapped_column(String(64), ForeignKey('triggers.id', ondelete='CASCADE'), nullable=False)
+    bucket_ts: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)  # minute bucket
+    count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    error_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    last_triggered_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)  # last success in the bucket
+
+    trigger = relationship("Triggers", back_populates="metrics")
+
+    __table_args__ = (
+        UniqueConstraint('trigger_id', 'bucket_ts', name='uq_trigger_metrics_trigger_bucket'),
+    )
+
+
+class TriggerLastError(Base):
+    """Error of a trigger's latest firing; the row exists only while that firing failed"""
+    __tablename__ = 'trigger_last_errors'
+
+    trigger_id: Mapped[str] = mapped_column(String(64), ForeignKey('triggers.id', ondelete='CASCADE'), primary_key=True)
+    error: Mapped[str] = mapped_column(Text, nullable=False)
+    recorded_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    trigger = relationship("Triggers", back_populates="last_error_entry")
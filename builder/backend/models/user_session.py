@@ -8,12 +8,13 @@ class UserSession(Base):
     __tablename__ = "user_sessions"
     __table_args__ = (
         Index("idx_user_sessions_user_id", "user_id"),
-        Index("idx_user_sessions_expires_at", "expires_at"),
+        Index("idx_user_sessions_expires_brin", "expires_at",
+              postgresql_using="brin", postgresql_with={"pages_per_range": 32}),
     )
 
-    id: Mapped[str] = mapped_column(String, primary_key=True)
-    user_id: Mapped[str] = mapped_column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    refresh_token_jti: Mapped[Optional[str]] = mapped_column(String, unique=True)
+    id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    user_id: Mapped[str] = mapped_column(String(64), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    refresh_token_jti: Mapped[Optional[str]] = mapped_column(String(64), unique=True)
     ip_address: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     user_agent: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
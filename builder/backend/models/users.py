@@ -1,31 +1,25 @@
 from sqlalchemy import String, Boolean, ForeignKey, Index, TIMESTAMP
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import Optional
-from .base import Base
+from .base import Base, TimestampMixin
 
-class Users(Base):
+class Users(Base, TimestampMixin):
     __tablename__ = "users"
     __table_args__ = (
         Index("idx_users_keycloak_id", "keycloak_id"),
         Index("idx_users_email", "email"),
-        Index("idx_users_organization_id", "organization_id"),
+        Index("idx_users_active", "organization_id", postgresql_include=("email", "username", "is_active")),
     )
 
-    id: Mapped[str] = mapped_column(String, primary_key=True)
-    keycloak_id: Mapped[str] = mapped_column(String, unique=True, nullable=False)
+    id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    keycloak_id: Mapped[str] = mapped_column(String(64), unique=True, nullable=False)
     email: Mapped[str] = mapped_column(String, unique=True, nullable=False)
     username: Mapped[str] = mapped_column(String, unique=True, nullable=False)
     first_name: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     last_name: Mapped[Optional[str]] = mapped_column(String, nullable=True)
-    organization_id: Mapped[str] = mapped_column(String, ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False)
+    organization_id: Mapped[str] = mapped_column(String(64), ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     last_login: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(
-        default=lambda: datetime.now(timezone.utc), nullable=False
-    )
-    updated_at: Mapped[datetime] = mapped_column(
-        default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False
-    )
 
     organization = relationship("Organizations", back_populates="users")
\ No newline at end of file
@@ -3,11 +3,17 @@ Authentication routes for Agent-Builder
 Handles OAuth flow, user registration, and session management
 """
 import os
+import json
+import atexit
+import base64
 import logging
 import secrets
-import uuid
-from datetime import datetime, timedelta
-from flask import Blueprint, request, jsonify, redirect, make_response, g
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+import jwt
+from datetime import datetime
+from flask import Blueprint, Response, current_app, request, jsonify, make_response, g
 
 from auth.keycloak_client import keycloak_client, KeycloakError
 from auth.rbac import get_user_effective_permissions
@@ -20,14 +26,113 @@ from middleware.auth import (
     require_auth, get_current_user_id
 )
 from database import (
-    get_user_by_keycloak_id, create_user, get_organization,
-    create_organization, create_default_roles, update_user_last_login,
-    create_user_session, delete_user_session, cleanup_expired_sessions,
-    create_audit_log
+    login_user_by_keycloak_id, create_organization_with_defaults, get_organization,
+    create_user_session, delete_user_session, get_user
 )
+from audit_queue import enqueue_audit_log
+from models.base import uuid7
+from ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Environment is read once at import; these never change for the life of the process
+_FRONTEND_URL = os.getenv('FRONTEND_URL', 'http://localhost:5173')
+_ENVIRONMENT = os.getenv('ENVIRONMENT', 'development')
+_COOKIE_SECURE = _ENVIRONMENT == 'production'
+
+# Every redirect target the OAuth callback can return, built once
+_LOCATIONS = {
+    'dashboard': f"{_FRONTEND_URL}/dashboard",
+    **{
+        error: f"{_FRONTEND_URL}/login?error={error}"
+        for error in (
+            'rate_limit_exceeded', 'oauth_error', 'missing_code',
+            'account_locked', 'keycloak_error', 'internal_error'
+        )
+    }
+}
+
+ACCESS_TOKEN_MAX_AGE = 3600  # 1 hour
+REFRESH_TOKEN_MAX_AGE = 30 * 24 * 3600  # 30 days
+
+# Set-Cookie headers for logout, built once
+_CLEARED_COOKIES = [
+    ('Set-Cookie', f"{name}=; Expires=Thu, 01 Jan 1970 00:00:00 GMT; Max-Age=0; HttpOnly; Path=/")
+    for name in ('access_token', 'refresh_token', 'session_id')
+]
+
+# Shared decode options for reading claims from our own tokens without verification
+_JWT_NO_VERIFY = {"verify_signature": False, "verify_exp": False, "verify_aud": False}
+
+# Placeholder grants until role aggregation is implemented; immutable so they can be shared
+_DEFAULT_PERMS = ("flows.read", "flows.execute", "projects.read")
+_EMPTY_ROLES = ()
+
+# Best-effort Keycloak calls (session logout) run here so they never hold up a response
+_BACKGROUND = ThreadPoolExecutor(max_workers=8, thread_name_prefix='auth-bg')
+atexit.register(_BACKGROUND.shutdown, wait=True)  # pending logouts are bounded by the HTTP timeout
+
+# token -> jti; unverified claim decodes are reused across callback/logout/revoke
+_JTI_CACHE = TTLCache(maxsize=10000, ttl=300)
+
+# Development login payloads are constant; serialize them once at import
+_DEV_USER_ID = 'dev-user-123'
+_DEV_ORGANIZATION = {'id': 'dev-org-123', 'name': 'Development Org'}
+_DEV_PERMISSIONS = {
+    'organization_permissions': ['*'],
+    'project_permissions': ['*'],
+    'effective_permissions': ['*'],
+    'expanded_permissions': ['*'],
+    'is_admin': True,
+    'is_super_admin': True
+}
+_DEV_STARTED_AT = datetime.now().isoformat()
+_DEV_USER_DATA = {
+    'id': _DEV_USER_ID,
+    'email': 'dev@agent-builder.local',
+    'username': 'devuser',
+    'first_name': 'Dev',
+    'last_name': 'User',
+    'organization_id': _DEV_ORGANIZATION['id'],
+    'last_login': _DEV_STARTED_AT,
+    'created_at': _DEV_STARTED_AT
+}
+_DEV_JWT_USER_DATA = {
+    'user_id': _DEV_USER_ID,
+    'email': _DEV_USER_DATA['email'],
+    'organization_id': _DEV_ORGANIZATION['id'],
+    'permissions': ['*'],  # Simple list for dev user with all permissions
+    'roles': ['admin']
+}
+_DEV_LOGIN_BYTES = json.dumps({
+    'user': _DEV_USER_DATA,
+    'organization': _DEV_ORGANIZATION,
+    'permissions': _DEV_PERMISSIONS
+}).encode()
+_DEV_CURRENT_USER_BYTES = json.dumps({
+    'id': _DEV_USER_ID,
+    'email': _DEV_USER_DATA['email'],
+    'username': _DEV_USER_DATA['username'],
+    'first_name': _DEV_USER_DATA['first_name'],
+    'last_name': _DEV_USER_DATA['last_name'],
+    'organization': _DEV_ORGANIZATION,
+    'permissions': _DEV_PERMISSIONS,
+    'last_login': _DEV_STARTED_AT,
+    'created_at': _DEV_STARTED_AT
+}).encode()
+
+# Keycloak reachability is memoized briefly so probe storms don't fan out to it
+_KEYCLOAK_HEALTH_CACHE = TTLCache(maxsize=1, ttl=5)
+
+# Second-precision ISO timestamp, formatted at most once per second
+_iso_now_second = 0
+_iso_now_value = ''
+
+# Signed dev access token, reissued when it is within this many seconds of expiry
+_DEV_TOKEN_REFRESH_MARGIN = 300
+_dev_token = None
+_dev_token_expires_at = 0.0
+
 auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
 
 @auth_bp.route('/login', methods=['GET'])
@@ -68,17 +173,18 @@ def login():
 @auth_bp.route('/callback', methods=['GET'])
 def auth_callback():
     """Handle OAuth callback from Keycloak"""
+    client_ip = request.remote_addr
+    user_agent = request.headers.get('User-Agent')
     try:
-        logger.info(f"🔄 [AUTH] OAuth callback received from {request.remote_addr}")
+        logger.info(f"🔄 [AUTH] OAuth callback received from {client_ip}")
         logger.info(f"🔄 [AUTH] Full callback URL: {request.url}")
         logger.debug(f"🔄 [AUTH] Request headers: {dict(request.headers)}")
         logger.debug(f"🔄 [AUTH] Query parameters: {dict(request.args)}")
         
         # Rate limiting check
-        client_ip = request.remote_addr
         if not check_rate_limit(client_ip):
             logger.warning(f"🔄 [AUTH] Rate limit exceeded for {client_ip}")
-            return redirect(f"{os.getenv('FRONTEND_URL', 'http://localhost:5173')}/login?error=rate_limit_exceeded")
+            return _redirect('rate_limit_exceeded')
         
         # Get authorization code and state from callback
         code = request.args.get('code')
@@ -95,11 +201,11 @@ def auth_callback():
         
         if error:
             logger.error(f"🔄 [AUTH] ❌ OAuth error received: {error}")
-            return redirect(f"{os.getenv('FRONTEND_URL', 'http://localhost:5173')}/login?error=oauth_error")
+            return _redirect('oauth_error')
         
         if not code:
             logger.error(f"🔄 [AUTH] ❌ Missing authorization code in callback")
-            return redirect(f"{os.getenv('FRONTEND_URL', 'http://localhost:5173')}/login?error=missing_code")
+            return _redirect('missing_code')
         
         logger.info(f"🔄 [AUTH] Starting token exchange process...")
         
@@ -117,8 +223,6 @@ def auth_callback():
         id_token = token_data.get('id_token')
         if id_token:
             try:
-                import base64
-                import json
                 # Decode the ID token payload (without signature verification for now)
                 parts = id_token.split('.')
                 if len(parts) >= 2:
@@ -147,19 +251,16 @@ def auth_callback():
         # Check if account is locked
         user_email = user_info.get('email', '')
         if is_account_locked(user_email):
-            log_auth_attempt(user_email, False, client_ip, request.headers.get('User-Agent'))
-            return redirect(f"{os.getenv('FRONTEND_URL', 'http://localhost:5173')}/login?error=account_locked")
+            log_auth_attempt(user_email, False, client_ip, user_agent)
+            return _redirect('account_locked')
         
-        # Find or create user in our database
-        user = get_user_by_keycloak_id(user_info['sub'])
+        # Find the user and stamp last login in one statement
+        user = login_user_by_keycloak_id(user_info['sub'])
         
         if not user:
             # New user - create organization and user
             user = _create_new_user_and_organization(user_info)
         
-        # Update last login
-        update_user_last_login(user['id'])
-        
         # Get user's permissions and roles
         permissions = _get_user_permissions(user)
         
@@ -176,61 +277,41 @@ def auth_callback():
         jwt_refresh_token = create_refresh_token(user['id'])
         
         # Create session record
-        session_id = str(uuid.uuid4())
+        session_id = str(uuid7())
         create_user_session(
             session_id=session_id,
             user_id=user['id'],
             refresh_token_jti=_extract_jti_from_token(jwt_refresh_token),
-            expires_at=datetime.now() + timedelta(days=30),
-            ip_address=request.remote_addr,
-            user_agent=request.headers.get('User-Agent')
+            expires_at_epoch=int(time.time()) + REFRESH_TOKEN_MAX_AGE,
+            ip_address=client_ip,
+            user_agent=user_agent
         )
         
         # Log successful authentication
-        log_auth_attempt(user_email, True, client_ip, request.headers.get('User-Agent'))
+        log_auth_attempt(user_email, True, client_ip, user_agent)
         reset_failed_attempts(user_email)  # Clear any previous failed attempts
         
         # Create audit log
-        create_audit_log(
+        enqueue_audit_log(
             user_id=user['id'],
             organization_id=user['organization_id'],
             action='login',
             resource_type='user',
             resource_id=user['id'],
             details={'method': 'oauth', 'provider': 'keycloak'},
-            ip_address=request.remote_addr,
-            user_agent=request.headers.get('User-Agent')
+            ip_address=client_ip,
+            user_agent=user_agent
         )
         
         # Set httpOnly cookies and redirect to frontend
-        response = make_response(redirect(f"{os.getenv('FRONTEND_URL', 'http://localhost:5173')}/dashboard"))
+        response = _redirect('dashboard')
         
         # Set secure cookies
-        cookie_secure = os.getenv('ENVIRONMENT', 'development') == 'production'
-        response.set_cookie(
-            'access_token',
-            jwt_access_token,
-            httponly=True,
-            secure=cookie_secure,
-            samesite='Lax',
-            max_age=3600  # 1 hour
-        )
-        response.set_cookie(
-            'refresh_token',
-            jwt_refresh_token,
-            httponly=True,
-            secure=cookie_secure,
-            samesite='Lax',
-            max_age=30*24*3600  # 30 days
-        )
-        response.set_cookie(
-            'session_id',
-            session_id,
-            httponly=True,
-            secure=cookie_secure,
-            samesite='Lax',
-            max_age=30*24*3600  # 30 days
-        )
+        response.headers.extend([
+            ('Set-Cookie', _build_cookie('access_token', jwt_access_token, ACCESS_TOKEN_MAX_AGE)),
+            ('Set-Cookie', _build_cookie('refresh_token', jwt_refresh_token, REFRESH_TOKEN_MAX_AGE)),
+            ('Set-Cookie', _build_cookie('session_id', session_id, REFRESH_TOKEN_MAX_AGE)),
+        ])
         
         return response
         
@@ -240,23 +321,24 @@ def auth_callback():
         logger.error(f"🔄 [AUTH] Exception details: {str(e)}")
         # Log failed attempt if we have user email
         if 'user_email' in locals():
-            log_auth_attempt(user_email, False, client_ip, request.headers.get('User-Agent'))
-        return redirect(f"{os.getenv('FRONTEND_URL', 'http://localhost:5173')}/login?error=keycloak_error")
+            log_auth_attempt(user_email, False, client_ip, user_agent)
+        return _redirect('keycloak_error')
     except Exception as e:
         logger.error(f"🔄 [AUTH] ❌ Unexpected error during auth callback: {e}")
         logger.error(f"🔄 [AUTH] Exception type: {type(e).__name__}")
         logger.error(f"🔄 [AUTH] Exception details: {str(e)}")
-        import traceback
         logger.error(f"🔄 [AUTH] Full traceback: {traceback.format_exc()}")
         # Log failed attempt if we have user email
         if 'user_email' in locals():
-            log_auth_attempt(user_email, False, client_ip, request.headers.get('User-Agent'))
-        return redirect(f"{os.getenv('FRONTEND_URL', 'http://localhost:5173')}/login?error=internal_error")
+            log_auth_attempt(user_email, False, client_ip, user_agent)
+        return _redirect('internal_error')
 
 @auth_bp.route('/logout', methods=['POST'])
 @require_auth
 def logout():
     """Logout user and revoke tokens"""
+    client_ip = request.remote_addr
+    user_agent = request.headers.get('User-Agent')
     try:
         user_id = get_current_user_id()
         organization_id = getattr(g, 'organization_id', None)
@@ -265,12 +347,9 @@ def logout():
         refresh_token = request.cookies.get('refresh_token')
         session_id = request.cookies.get('session_id')
         
-        # Revoke tokens in Keycloak if refresh token exists
+        # Revoke tokens in Keycloak if refresh token exists (fire-and-forget)
         if refresh_token:
-            try:
-                keycloak_client.logout_user(refresh_token)
-            except Exception as e:
-                logger.warning(f"Keycloak logout failed: {e}")
+            _BACKGROUND.submit(_logout_keycloak_session, refresh_token)
         
         # Revoke our JWT tokens
         if refresh_token:
@@ -283,21 +362,19 @@ def logout():
             delete_user_session(session_id)
         
         # Create audit log
-        create_audit_log(
+        enqueue_audit_log(
             user_id=user_id,
             organization_id=organization_id,
             action='logout',
             resource_type='user',
             resource_id=user_id,
-            ip_address=request.remote_addr,
-            user_agent=request.headers.get('User-Agent')
+            ip_address=client_ip,
+            user_agent=user_agent
         )
         
         # Clear cookies
         response = make_response(jsonify({'message': 'Logged out successfully'}))
-        response.set_cookie('access_token', '', expires=0, httponly=True)
-        response.set_cookie('refresh_token', '', expires=0, httponly=True)
-        response.set_cookie('session_id', '', expires=0, httponly=True)
+        response.headers.extend(_CLEARED_COOKIES)
         
         return response
         
@@ -338,29 +415,10 @@ def get_current_user():
         organization_id = getattr(g, 'organization_id', None)
         
         # Handle dev user without database lookup
-        if user_id == 'dev-user-123':
-            user_data = {
-                'id': 'dev-user-123',
-                'email': 'dev@agent-builder.local',
-                'username': 'devuser',
-                'first_name': 'Dev', 
-                'last_name': 'User',
-                'organization': {'id': 'dev-org-123', 'name': 'Development Org'},
-                'permissions': {
-                    'organization_permissions': ['*'],
-                    'project_permissions': ['*'],
-                    'effective_permissions': ['*'],
-                    'expanded_permissions': ['*'],
-                    'is_admin': True,
-                    'is_super_admin': True
-                },
-                'last_login': datetime.now().isoformat(),
-                'created_at': datetime.now().isoformat()
-            }
-            return jsonify(user_data)
+        if user_id == _DEV_USER_ID:
+            return Response(_DEV_CURRENT_USER_BYTES, mimetype='application/json')
         
         # Get user from database for real users
-        from database import get_user
         user = get_user(user_id)
         
         if not user:
@@ -395,56 +453,16 @@ def get_current_user():
 @rate_limit(max_requests=3, window_seconds=60)  # 3 attempts per minute
 def dev_login():
     """Development-only login bypass"""
-    if os.getenv('ENVIRONMENT', 'development') != 'development':
+    if _ENVIRONMENT != 'development':
         return jsonify({'error': 'Development login not available in production'}), 403
     
     try:
-        # Create a fake user session for development
-        user_data = {
-            'id': 'dev-user-123',
-            'email': 'dev@agent-builder.local',
-            'username': 'devuser',
-            'first_name': 'Dev',
-            'last_name': 'User',
-            'organization_id': 'dev-org-123',
-            'last_login': datetime.now().isoformat(),
-            'created_at': datetime.now().isoformat()
-        }
-        
-        permissions_info = {
-            'organization_permissions': ['*'],
-            'project_permissions': ['*'],
-            'effective_permissions': ['*'],
-            'expanded_permissions': ['*'],
-            'is_admin': True,
-            'is_super_admin': True
-        }
-        
-        # Create JWT tokens without database operations
-        jwt_user_data = {
-            'user_id': user_data['id'],
-            'email': user_data['email'],
-            'organization_id': user_data['organization_id'],
-            'permissions': ['*'],  # Simple list for dev user with all permissions
-            'roles': ['admin']
-        }
-        
-        jwt_access_token = create_access_token(jwt_user_data)
-        
-        # Set cookie and return user data
-        response = make_response(jsonify({
-            'user': user_data,
-            'organization': {'id': 'dev-org-123', 'name': 'Development Org'},
-            'permissions': permissions_info
-        }))
-        
-        response.set_cookie(
-            'access_token',
-            jwt_access_token,
-            httponly=True,
-            secure=False,  # Development only
-            samesite='Lax',
-            max_age=3600
+        # Static user payload and a reused signed token; no database operations
+        dev_token, max_age = _get_dev_access_token()
+        response = Response(_DEV_LOGIN_BYTES, mimetype='application/json')
+        response.headers.add(
+            'Set-Cookie',
+            _build_cookie('access_token', dev_token, max_age, secure=False)  # Development only
         )
         
         return response
@@ -458,15 +476,15 @@ def auth_health():
     """Check authentication service health"""
     try:
         # Check Keycloak connectivity
-        keycloak_healthy = keycloak_client.health_check()
-        
-        # Clean up expired sessions
-        cleanup_expired_sessions()
+        keycloak_healthy = _KEYCLOAK_HEALTH_CACHE.get('keycloak')
+        if keycloak_healthy is None:
+            keycloak_healthy = keycloak_client.health_check()
+            _KEYCLOAK_HEALTH_CACHE.set('keycloak', keycloak_healthy)
         
         return jsonify({
             'status': 'healthy',
             'keycloak_available': keycloak_healthy,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': _iso_now()
         })
         
     except Exception as e:
@@ -474,49 +492,63 @@ def auth_health():
         return jsonify({
             'status': 'unhealthy',
             'error': str(e),
-            'timestamp': datetime.now().isoformat()
+            'timestamp': _iso_now()
         }), 500
 
 # Helper functions
+def _redirect(name: str) -> Response:
+    """Bare 302 to one of the precomputed _LOCATIONS (no HTML body)"""
+    return Response(status=302, headers={'Location': _LOCATIONS[name]})
+
+def _build_cookie(name: str, value: str, max_age: int, secure: bool = _COOKIE_SECURE) -> str:
+    """Format an HttpOnly, SameSite=Lax Set-Cookie value (token/session values are cookie-safe)"""
+    return f"{name}={value}; Max-Age={max_age}; HttpOnly; SameSite=Lax; Path=/{'; Secure' if secure else ''}"
+
+def _iso_now() -> str:
+    """Current local time as an ISO string, cached for the current second"""
+    global _iso_now_second, _iso_now_value
+    second = int(time.time())
+    if second != _iso_now_second:
+        _iso_now_value = datetime.fromtimestamp(second).isoformat()
+        _iso_now_second = second
+    return _iso_now_value
+
+def _get_dev_access_token() -> tuple:
+    """Return the cached dev access token and its remaining lifetime, signing a new one near expiry"""
+    global _dev_token, _dev_token_expires_at
+    now = time.time()
+    if _dev_token is None or _dev_token_expires_at - now < _DEV_TOKEN_REFRESH_MARGIN:
+        _dev_token = create_access_token(_DEV_JWT_USER_DATA)
+        _dev_token_expires_at = now + current_app.config['JWT_ACCESS_TOKEN_EXPIRES'].total_seconds()
+    return _dev_token, int(_dev_token_expires_at - now)
+
 def _create_new_user_and_organization(user_info: dict) -> dict:
     """Create new user and organization for first-time login"""
     try:
         # Create organization (use email domain as default org name)
         email_domain = user_info['email'].split('@')[1]
         org_name = f"{email_domain.title()} Organization"
-        org_id = str(uuid.uuid4())
-        
-        create_organization(
-            org_id=org_id,
-            name=org_name,
-            description=f"Auto-created organization for {email_domain}",
-            settings={'auto_created': True}
-        )
-        
-        # Create default roles for organization
-        create_default_roles(org_id)
-        
-        # Create user
-        user_id = str(uuid.uuid4())
-        user = create_user(
-            user_id=user_id,
-            keycloak_id=user_info['sub'],
-            email=user_info['email'],
-            username=user_info.get('preferred_username', user_info['email']),
-            organization_id=org_id,
-            first_name=user_info.get('given_name', ''),
-            last_name=user_info.get('family_name', '')
+        org_id = str(uuid7())
+        user_id = str(uuid7())
+        
+        # Organization, default roles, user and admin assignment in one transaction
+        user = create_organization_with_defaults(
+            org_row={
+                'id': org_id,
+                'name': org_name,
+                'description': f"Auto-created organization for {email_domain}",
+                'settings': {'auto_created': True}
+            },
+            user_row={
+                'id': user_id,
+                'keycloak_id': user_info['sub'],
+                'email': user_info['email'],
+                'username': user_info.get('preferred_username', user_info['email']),
+                'first_name': user_info.get('given_name', ''),
+                'last_name': user_info.get('family_name', '')
+            }
         )
         
-        # Assign user as organization admin (first user in org)
-        from database import list_roles_in_organization, assign_user_project_role
-        roles = list_roles_in_organization(org_id)
-        admin_role = next((r for r in roles if r['name'] == 'Organization Admin'), None)
-        
-        if admin_role:
-            # For organization-level roles, we'll use a special project_id
-            assign_user_project_role(user_id, f"org:{org_id}", admin_role['id'])
-        
         logger.info(f"Created new user {user_id} and organization {org_id}")
         return user
         
@@ -524,24 +556,36 @@ def _create_new_user_and_organization(user_info: dict) -> dict:
         logger.error(f"Failed to create new user and organization: {e}")
         raise
 
-def _get_user_permissions(user: dict) -> list:
+def _get_user_permissions(user: dict) -> tuple:
     """Get user's base permissions"""
     # This would typically query the user's roles and aggregate permissions
     # For now, return basic permissions - this should be expanded
-    return ["flows.read", "flows.execute", "projects.read"]
+    return _DEFAULT_PERMS
 
-def _get_user_roles(user: dict) -> list:
+def _get_user_roles(user: dict) -> tuple:
     """Get user's roles"""
     # This would query user's roles across projects
     # For now, return empty list - this should be expanded
-    return []
+    return _EMPTY_ROLES
+
+def _logout_keycloak_session(refresh_token: str):
+    """End the Keycloak session; failures are logged, never raised"""
+    try:
+        keycloak_client.logout_user(refresh_token)
+    except Exception as e:
+        logger.warning(f"Keycloak logout failed: {e}")
 
 def _extract_jti_from_token(token: str) -> str:
     """Extract JWT ID from token without full validation"""
+    jti = _JTI_CACHE.get(token)
+    if jti is not None:
+        return jti
     try:
-        import jwt
         # Decode without verification to get JTI
-        unverified = jwt.decode(token, options={"verify_signature": False})
-        return unverified.get('jti')
+        unverified = jwt.decode(token, options=_JWT_NO_VERIFY)
+        jti = unverified.get('jti')
     except Exception:
-        return None
\ No newline at end of file
+        return None
+    if jti:
+        _JTI_CACHE.set(token, jti)
+    return jti
\ No newline at end of file
@@ -1,23 +1,100 @@
 # routes/chatbot.py
+import os
+import re
+import time
+import queue
 import asyncio
 import json
 import logging
-from flask import Blueprint, request, jsonify
+import functools
+import hashlib
+from flask import Blueprint, Response, request, jsonify
 from tframex import Message
 
-from component_manager import discover_tframex_components
+from component_manager import get_components_snapshot
+from tframex_config import get_tframex_app_instance
+from services.async_bridge import run_sync, submit
+from services.runtime_pool import pooled_runtime
+from json_provider import dumps_bytes, loads as json_loads, raw_json
+from ttl_cache import TTLCache
 
 logger = logging.getLogger("ChatbotAPI")
 
 chatbot_bp = Blueprint('chatbot', __name__, url_prefix='/api/tframex')
 
-def get_global_tframex_app():
-    """Get the global TFrameX app instance"""
-    from tframex_config import get_tframex_app_instance
-    return get_tframex_app_instance()
+# Upper bound on how long a request thread waits for the agents on the shared loop
+CHATBOT_AGENT_TIMEOUT = float(os.getenv('CHATBOT_AGENT_TIMEOUT', '180'))
+
+# Greetings and thanks are answered locally instead of through the two-agent pipeline.
+# Anything longer, or mentioning a flow edit, still goes to the orchestrator.
+_SMALL_TALK_MAX_LENGTH = 40
+_GREETING_RE = re.compile(r"^\s*(hi|hello|hey|yo|hiya|good (morning|afternoon|evening))\b[\s!.,?]*(there)?[\s!.,?]*$", re.IGNORECASE)
+_THANKS_RE = re.compile(r"^\s*(thanks|thank you|thx|ty|cheers|great|cool|ok|okay|nice)\b[\s!.,?]*(a lot|so much)?[\s!.,?]*$", re.IGNORECASE)
+_FLOW_EDIT_RE = re.compile(r"\b(add|create|remove|connect|delete|change|rename|build|make|insert|replace|update|modify)\b", re.IGNORECASE)
+
+_GREETING_REPLY = "Hi! Tell me what you'd like your flow to do and I'll help you build it on the canvas."
+_THANKS_REPLY = "You're welcome! Let me know if you'd like to change anything else in the flow."
+
+# Markdown code fence around FlowBuilderAgent output, with or without a json tag
+_FENCE_RE = re.compile(r"^\s*```(?:json)?[ \t]*\n?(.*?)\n?```\s*$", re.DOTALL)
+
+# ReactFlow node/edge keys that only describe canvas interaction state
+_UI_ONLY_FIELDS = frozenset({"selected", "dragging", "width", "height", "positionAbsolute", "measured", "resizing"})
+
+# /orchestrator/inspect task -> (response key, fallback text)
+_INSPECT_TASKS = {
+    "analyze": ("analysis", "Analysis failed"),
+    "predict": ("predictions", "Prediction failed"),
+    "optimize": ("optimizations", "Optimization failed"),
+}
+
+# Category -> parameter names shown in the prompt (None: no Params section)
+_COMPONENT_PARAM_NAMES = {
+    "agents": lambda comp: None,
+    "patterns": lambda comp: tuple(comp.get('constructor_params_schema', {})),
+    "tools": lambda comp: tuple(comp.get('parameters_schema', {}).get('properties', {})),
+}
+
+# blake2b(nodes, edges) -> formatted flow state context
+_flow_context_cache = TTLCache(maxsize=32, ttl=600)
+
+# Formatted component catalogue for agent prompts. Replaced as a whole (never
+# mutated) so concurrent requests always see a consistent snapshot/context pair.
+_components_cache = {"data": None, "context": None}
+
+def _small_talk_reply(user_message):
+    """Return a canned reply for trivial conversational messages, else None"""
+    if len(user_message) > _SMALL_TALK_MAX_LENGTH or _FLOW_EDIT_RE.search(user_message):
+        return None
+    if _GREETING_RE.match(user_message):
+        return _GREETING_REPLY
+    if _THANKS_RE.match(user_message):
+        return _THANKS_REPLY
+    return None
+
+def _strip_markdown_fence(content):
+    """Remove a ```json or generic ``` code block wrapper, if present"""
+    fence_match = _FENCE_RE.match(content)
+    return fence_match.group(1).strip() if fence_match else content
+
+def _is_reactflow_json(value):
+    """Check for the {nodes: [...], edges: [...]} shape FlowBuilderAgent must return"""
+    return (isinstance(value, dict) and
+            isinstance(value.get("nodes"), list) and
+            isinstance(value.get("edges"), list))
+
+async def execute_chatbot_logic(rt, user_message, template_vars, on_reply=None):
+    """Execute the orchestrator-based chatbot logic.
+
+    on_reply, if given, is called with the user-facing reply as soon as the
+    orchestrator has produced it, before FlowBuilderAgent runs.
+    """
+    # Step 0: Answer small talk without an LLM round-trip
+    small_talk = _small_talk_reply(user_message)
+    if small_talk is not None:
+        logger.info("Answered conversational message locally without calling the orchestrator")
+        return {"reply": small_talk, "flow_update": None}, 200
 
-async def execute_chatbot_logic(rt, user_message, template_vars):
-    """Execute the orchestrator-based chatbot logic"""
     # Step 1: OrchestratorAgent handles user message (with tool calling capabilities)
     orchestrator_input = Message(role="user", content=user_message)
     orchestrator_response = await rt.call_agent(
@@ -38,14 +115,15 @@ async def execute_chatbot_logic(rt, user_message, template_vars):
     logger.info(f"OrchestratorAgent response: {orchestrator_reply[:200]}...")
 
     # Step 2: Check if orchestrator wants to modify the flow
-    if "FLOW_INSTRUCTION:" in orchestrator_reply:
-        # Extract the flow instruction
-        instruction_part = orchestrator_reply.split("FLOW_INSTRUCTION:")[-1].strip()
-        
-        # Remove the flow instruction from the user-facing reply
-        user_reply = orchestrator_reply.split("FLOW_INSTRUCTION:")[0].strip()
+    # Split the user-facing reply from the flow instruction in a single scan
+    user_reply, separator, instruction_part = orchestrator_reply.partition("FLOW_INSTRUCTION:")
+    if separator:
+        user_reply = user_reply.strip()
+        instruction_part = instruction_part.strip()
         
         logger.info(f"Flow instruction detected: {instruction_part[:100]}...")
+        if on_reply is not None and user_reply:
+            on_reply(user_reply)
         
         # Step 3: FlowBuilderAgent generates the flow JSON
         flow_template_vars = {
@@ -70,42 +148,25 @@ async def execute_chatbot_logic(rt, user_message, template_vars):
         # Step 4: Parse and validate the JSON
         flow_update_json = None
         try:
-            # Handle markdown-wrapped JSON
-            if flow_json_content.startswith("```json"):
-                # Extract JSON from markdown code block
-                start_idx = flow_json_content.find("```json") + 7
-                end_idx = flow_json_content.find("```", start_idx)
-                if end_idx != -1:
-                    flow_json_content = flow_json_content[start_idx:end_idx].strip()
-            elif flow_json_content.startswith("```"):
-                # Extract JSON from generic code block
-                start_idx = flow_json_content.find("```") + 3
-                end_idx = flow_json_content.find("```", start_idx)
-                if end_idx != -1:
-                    flow_json_content = flow_json_content[start_idx:end_idx].strip()
-            
-            flow_update_json = json.loads(flow_json_content)
+            flow_json_content = _strip_markdown_fence(flow_json_content)
+            flow_update_json = json_loads(flow_json_content)
             
-            if (isinstance(flow_update_json, dict) and
-                "nodes" in flow_update_json and isinstance(flow_update_json.get("nodes"), list) and
-                "edges" in flow_update_json and isinstance(flow_update_json.get("edges"), list)):
+            if _is_reactflow_json(flow_update_json):
                 
                 logger.info("Successfully generated valid ReactFlow JSON structure.")
                 logger.info(f"Nodes count: {len(flow_update_json.get('nodes', []))}")
                 logger.info(f"Edges count: {len(flow_update_json.get('edges', []))}")
                 
-                # Log each node for debugging
-                for i, node in enumerate(flow_update_json.get('nodes', [])):
-                    logger.info(f"Node {i+1}: id={node.get('id')}, type={node.get('type')}, pos={node.get('position')}")
-                
-                # Log each edge for debugging  
-                for i, edge in enumerate(flow_update_json.get('edges', [])):
-                    logger.info(f"Edge {i+1}: {edge.get('source')} -> {edge.get('target')} (id={edge.get('id')})")
+                # Log the generated structure for debugging, as one record and only when enabled
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("FlowBuilderAgent structure:\n%s",
+                                 _format_flow_structure_context(flow_update_json['nodes'], flow_update_json['edges']))
                 
                 
+                # The text was just validated; pass it through rather than re-encoding the dict
                 return {
                     "reply": user_reply or "I've updated the flow based on your request. Please review the canvas.",
-                    "flow_update": flow_update_json
+                    "flow_update": raw_json(flow_json_content, flow_update_json)
                 }, 200
             else:
                 logger.warning(f"Flow builder returned JSON with invalid structure: {flow_json_content[:500]}...")
@@ -127,63 +188,52 @@ async def execute_chatbot_logic(rt, user_message, template_vars):
             "flow_update": None
         }, 200
 
-# Chatbot for building flows (using two-agent architecture)
-@chatbot_bp.route('/chatbot_flow_builder', methods=['POST'])
-def handle_tframex_chatbot_flow_builder():
-    global_tframex_app = get_global_tframex_app()
+
+def _prepare_chatbot_request():
+    """Validate a chatbot request and build the agents' context.
+
+    Returns (app, user_message, template_vars, None), or an error response tuple
+    in the last slot when the request cannot be served.
+    """
+    global_tframex_app = get_tframex_app_instance()
     data = request.get_json()
     user_message = data.get('message')
     current_nodes_json = data.get('nodes', [])
     current_edges_json = data.get('edges', [])
 
     if not user_message:
-        return jsonify({"reply": "Error: No message provided to chatbot.", "flow_update": None}), 400
+        return None, None, None, (jsonify({"reply": "Error: No message provided to chatbot.", "flow_update": None}), 400)
 
     logger.info(f"Chatbot flow builder request: '{user_message[:100]}...'")
 
-    # 1. Prepare context for both agents
-    available_components_data = discover_tframex_components(app_instance=global_tframex_app)
-
-    ac_context_parts = ["Available TFrameX Components:"]
-    for cat in ["agents", "patterns", "tools"]:
-        ac_context_parts.append(f"\n{cat.upper()}:")
-        for comp in available_components_data.get(cat, []):
-            desc = comp.get('description', 'No description.')[:100]
-            param_info = ""
-            if cat == "patterns":
-                param_info = f"(Params: {list(comp.get('constructor_params_schema', {}).keys())})"
-            elif cat == "tools":
-                param_info = f"(Params: {list(comp.get('parameters_schema', {}).get('properties', {}).keys())})"
-            ac_context_parts.append(f"  - ID: {comp['id']}, Name: {comp['name']} {param_info}. Desc: {desc}...")
-    available_components_context_str = "\n".join(ac_context_parts)
-
-    current_flow_state_context_str = (
-        f"Current Visual Flow State (Nodes: {len(current_nodes_json)}, Edges: {len(current_edges_json)}):\n"
-        f"Nodes: {json.dumps(current_nodes_json, indent=2)}\n"
-        f"Edges: {json.dumps(current_edges_json, indent=2)}"
-    )
-
     # Check if both agents are registered
     if "OrchestratorAgent" not in global_tframex_app._agents:
         logger.error("Critical: OrchestratorAgent is not registered on global app.")
-        return jsonify({"reply": "Error: Orchestrator agent is not configured.", "flow_update": None}), 500
+        return None, None, None, (jsonify({"reply": "Error: Orchestrator agent is not configured.", "flow_update": None}), 500)
     
     if "FlowBuilderAgent" not in global_tframex_app._agents:
         logger.error("Critical: FlowBuilderAgent is not registered on global app.")
-        return jsonify({"reply": "Error: Flow builder agent is not configured.", "flow_update": None}), 500
+        return None, None, None, (jsonify({"reply": "Error: Flow builder agent is not configured.", "flow_update": None}), 500)
 
-    template_vars = {
-        "available_components_context": available_components_context_str,
-        "current_flow_state_context": current_flow_state_context_str
-    }
+    # Prepare context for both agents
+    template_vars = _orchestrator_template_vars(global_tframex_app, current_nodes_json, current_edges_json)
+    return global_tframex_app, user_message, template_vars, None
+
+
+# Chatbot for building flows (using two-agent architecture)
+@chatbot_bp.route('/chatbot_flow_builder', methods=['POST'])
+def handle_tframex_chatbot_flow_builder():
+    global_tframex_app, user_message, template_vars, error_response = _prepare_chatbot_request()
+    if error_response is not None:
+        return error_response
 
     try:
         # Two-agent architecture: Orchestrator -> FlowBuilder
         async def run_chatbot():
-            async with global_tframex_app.run_context() as rt:
+            async with pooled_runtime(global_tframex_app) as rt:
                 return await execute_chatbot_logic(rt, user_message, template_vars)
         
-        result_data, status_code = asyncio.run(run_chatbot())
+        result_data, status_code = run_sync(run_chatbot(), timeout=CHATBOT_AGENT_TIMEOUT)
         return jsonify(result_data), status_code
         
     except Exception as e:
@@ -195,11 +245,80 @@ def handle_tframex_chatbot_flow_builder():
         }), 200  # Use 200 to avoid triggering error handlers on frontend
 
 
+def _sse_event(payload):
+    return b"data: " + dumps_bytes(payload) + b"\n\n"
+
+
+@chatbot_bp.route('/chatbot_flow_builder/stream', methods=['POST'])
+def stream_tframex_chatbot_flow_builder():
+    """
+    Server-Sent Events variant of /chatbot_flow_builder.
+    Emits {"status": "thinking"} immediately, {"delta": reply} as soon as the
+    orchestrator has answered (while FlowBuilderAgent is still generating), and
+    finally the same {"reply", "flow_update"} envelope the JSON route returns.
+    """
+    global_tframex_app, user_message, template_vars, error_response = _prepare_chatbot_request()
+    if error_response is not None:
+        return error_response
+
+    events = queue.Queue()
+
+    async def run_chatbot():
+        async with pooled_runtime(global_tframex_app) as rt:
+            return await execute_chatbot_logic(
+                rt, user_message, template_vars,
+                on_reply=lambda reply: events.put(("delta", reply))
+            )
+
+    future = submit(run_chatbot())
+    future.add_done_callback(lambda _: events.put(("done", None)))
+    deadline = time.monotonic() + CHATBOT_AGENT_TIMEOUT
+
+    def stream():
+        try:
+            yield _sse_event({"status": "thinking"})
+            while True:
+                try:
+                    kind, value = events.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    future.cancel()
+                    yield _sse_event({"reply": "Error processing your request: timed out waiting for the agents.", "flow_update": None})
+                    return
+                if kind == "delta":
+                    yield _sse_event({"delta": value})
+                    continue
+                try:
+                    result_data, _ = future.result()
+                except Exception as e:
+                    logger.error(f"Error in streaming chatbot flow builder: {e}", exc_info=True)
+                    result_data = {"reply": f"Error processing your request: {str(e)}", "flow_update": None}
+                yield _sse_event(result_data)
+                return
+        finally:
+            # Client went away before the agents finished
+            if not future.done():
+                future.cancel()
+
+    return Response(stream(), mimetype='text/event-stream', headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no"
+    })
+
+
 # Orchestrator Agent endpoints for flow analysis and optimization
+def _analysis_prompt(analysis_request, nodes, edges):
+    return f"{analysis_request}. Current flow has {len(nodes)} nodes and {len(edges)} edges."
+
+def _prediction_prompt(user_intent):
+    return f"Predict what components should be added next to this flow. User intent: {user_intent}"
+
+def _optimization_prompt(optimization_goals):
+    return f"Optimize this flow for: {', '.join(optimization_goals)}. Provide specific suggestions."
+
 @chatbot_bp.route('/orchestrator/analyze', methods=['POST'])
 def orchestrator_analyze_flow():
     """Analyze flow structure using OrchestratorAgent"""
-    global_tframex_app = get_global_tframex_app()
+    global_tframex_app = get_tframex_app_instance()
     data = request.get_json()
     
     current_nodes = data.get('nodes', [])
@@ -217,28 +336,11 @@ def orchestrator_analyze_flow():
         return jsonify({"error": "OrchestratorAgent is not configured"}), 500
     
     try:
-        async def run_analysis():
-            async with global_tframex_app.run_context() as rt:
-                # Prepare context for OrchestratorAgent
-                available_components_data = discover_tframex_components(app_instance=global_tframex_app)
-                
-                template_vars = {
-                    "available_components_context": _format_components_context(available_components_data),
-                    "current_flow_state_context": _format_flow_state_context(current_nodes, current_edges)
-                }
-                
-                message = f"{analysis_request}. Current flow has {len(current_nodes)} nodes and {len(current_edges)} edges."
-                input_message = Message(role="user", content=message)
-                
-                response = await rt.call_agent(
-                    "OrchestratorAgent",
-                    input_message,
-                    template_vars=template_vars
-                )
-                
-                return response.content if response else "Analysis failed"
-        
-        analysis_result = asyncio.run(run_analysis())
+        message = _analysis_prompt(analysis_request, current_nodes, current_edges)
+        analysis_result = run_sync(
+            _call_orchestrator(global_tframex_app, message, current_nodes, current_edges),
+            timeout=CHATBOT_AGENT_TIMEOUT
+        ) or "Analysis failed"
         
         return jsonify({
             "analysis": analysis_result,
@@ -254,7 +356,7 @@ def orchestrator_analyze_flow():
 @chatbot_bp.route('/orchestrator/predict', methods=['POST'])
 def orchestrator_predict_components():
     """Predict next components using OrchestratorAgent"""
-    global_tframex_app = get_global_tframex_app()
+    global_tframex_app = get_tframex_app_instance()
     data = request.get_json()
     
     current_nodes = data.get('nodes', [])
@@ -267,27 +369,11 @@ def orchestrator_predict_components():
         return jsonify({"error": "OrchestratorAgent is not configured"}), 500
     
     try:
-        async def run_prediction():
-            async with global_tframex_app.run_context() as rt:
-                available_components_data = discover_tframex_components(app_instance=global_tframex_app)
-                
-                template_vars = {
-                    "available_components_context": _format_components_context(available_components_data),
-                    "current_flow_state_context": _format_flow_state_context(current_nodes, current_edges)
-                }
-                
-                message = f"Predict what components should be added next to this flow. User intent: {user_intent}"
-                input_message = Message(role="user", content=message)
-                
-                response = await rt.call_agent(
-                    "OrchestratorAgent",
-                    input_message,
-                    template_vars=template_vars
-                )
-                
-                return response.content if response else "Prediction failed"
-        
-        prediction_result = asyncio.run(run_prediction())
+        message = _prediction_prompt(user_intent)
+        prediction_result = run_sync(
+            _call_orchestrator(global_tframex_app, message, current_nodes, current_edges),
+            timeout=CHATBOT_AGENT_TIMEOUT
+        ) or "Prediction failed"
         
         return jsonify({
             "predictions": prediction_result,
@@ -305,7 +391,7 @@ def orchestrator_predict_components():
 @chatbot_bp.route('/orchestrator/optimize', methods=['POST'])
 def orchestrator_optimize_flow():
     """Get flow optimization suggestions using OrchestratorAgent"""
-    global_tframex_app = get_global_tframex_app()
+    global_tframex_app = get_tframex_app_instance()
     data = request.get_json()
     
     current_nodes = data.get('nodes', [])
@@ -321,27 +407,11 @@ def orchestrator_optimize_flow():
         return jsonify({"error": "OrchestratorAgent is not configured"}), 500
     
     try:
-        async def run_optimization():
-            async with global_tframex_app.run_context() as rt:
-                available_components_data = discover_tframex_components(app_instance=global_tframex_app)
-                
-                template_vars = {
-                    "available_components_context": _format_components_context(available_components_data),
-                    "current_flow_state_context": _format_flow_state_context(current_nodes, current_edges)
-                }
-                
-                message = f"Optimize this flow for: {', '.join(optimization_goals)}. Provide specific suggestions."
-                input_message = Message(role="user", content=message)
-                
-                response = await rt.call_agent(
-                    "OrchestratorAgent", 
-                    input_message,
-                    template_vars=template_vars
-                )
-                
-                return response.content if response else "Optimization failed"
-        
-        optimization_result = asyncio.run(run_optimization())
+        message = _optimization_prompt(optimization_goals)
+        optimization_result = run_sync(
+            _call_orchestrator(global_tframex_app, message, current_nodes, current_edges),
+            timeout=CHATBOT_AGENT_TIMEOUT
+        ) or "Optimization failed"
         
         return jsonify({
             "optimizations": optimization_result,
@@ -357,35 +427,163 @@ def orchestrator_optimize_flow():
         return jsonify({"error": f"Optimization failed: {str(e)}"}), 500
 
 
+@chatbot_bp.route('/orchestrator/inspect', methods=['POST'])
+def orchestrator_inspect_flow():
+    """Run analyze/predict/optimize concurrently against one shared flow context"""
+    global_tframex_app = get_tframex_app_instance()
+    data = request.get_json()
+    
+    current_nodes = data.get('nodes', [])
+    current_edges = data.get('edges', [])
+    tasks = data.get('tasks', list(_INSPECT_TASKS))
+    
+    unknown_tasks = [task for task in tasks if task not in _INSPECT_TASKS]
+    if not tasks or unknown_tasks:
+        return jsonify({"error": f"tasks must be a non-empty subset of {list(_INSPECT_TASKS)}"}), 400
+    
+    logger.info(f"Orchestrator inspect request ({', '.join(tasks)}) for {len(current_nodes)} nodes, {len(current_edges)} edges")
+    
+    if "OrchestratorAgent" not in global_tframex_app._agents:
+        return jsonify({"error": "OrchestratorAgent is not configured"}), 500
+    
+    prompts = {
+        "analyze": lambda: _analysis_prompt(data.get('request', 'Analyze this flow structure'), current_nodes, current_edges),
+        "predict": lambda: _prediction_prompt(data.get('intent', 'What should I add next?')),
+        "optimize": lambda: _optimization_prompt(data.get('goals', ['performance', 'maintainability'])),
+    }
+    
+    try:
+        # Context is formatted once and the agent calls overlap, so latency is the slowest call
+        template_vars = _orchestrator_template_vars(global_tframex_app, current_nodes, current_edges, structure_only=True)
+        
+        async def run_inspection():
+            return await asyncio.gather(*[
+                _call_orchestrator(global_tframex_app, prompts[task](), current_nodes, current_edges, template_vars)
+                for task in tasks
+            ], return_exceptions=True)
+        
+        results = run_sync(run_inspection(), timeout=CHATBOT_AGENT_TIMEOUT)
+        
+        response = {"node_count": len(current_nodes), "edge_count": len(current_edges)}
+        for task, result in zip(tasks, results):
+            key, failure = _INSPECT_TASKS[task]
+            if isinstance(result, Exception):
+                logger.error(f"Orchestrator inspect task '{task}' failed: {result}")
+                response[key] = f"{failure}: {result}"
+            else:
+                response[key] = result or failure
+        return jsonify(response)
+        
+    except Exception as e:
+        logger.error(f"Error in orchestrator inspect: {e}", exc_info=True)
+        return jsonify({"error": f"Inspection failed: {str(e)}"}), 500
+
+
+def _orchestrator_template_vars(app, nodes, edges, structure_only=False):
+    """Template vars describing the components and the current flow.
+
+    structure_only sends just node ids/types and edge endpoints; use it when the
+    reply is advice rather than a rebuilt flow that must keep the nodes' data.
+    """
+    format_flow = _format_flow_structure_context if structure_only else _format_flow_state_context
+    return {
+        "available_components_context": _get_components_context(app),
+        "current_flow_state_context": format_flow(nodes, edges)
+    }
+
+
+async def _call_orchestrator(app, message, nodes, edges, template_vars=None):
+    """Run one OrchestratorAgent turn against the current flow and return its text"""
+    if template_vars is None:
+        template_vars = _orchestrator_template_vars(app, nodes, edges, structure_only=True)
+    # Each call holds its own pooled runtime, so concurrent calls never share agent memory
+    async with pooled_runtime(app) as rt:
+        response = await rt.call_agent(
+            "OrchestratorAgent",
+            Message(role="user", content=message),
+            template_vars=template_vars
+        )
+    return response.content if response else None
+
+
+def _get_components_context(app):
+    """Return the formatted components context, rebuilding it only when the registry changed"""
+    global _components_cache
+    # The snapshot object is replaced whenever the registries change, so identity is the version
+    data = get_components_snapshot(app)
+    cache = _components_cache
+    if cache["data"] is not data:
+        cache = {"data": data, "context": _format_components_context(data)}
+        _components_cache = cache
+    return cache["context"]
+
+
+@functools.lru_cache(maxsize=1024)
+def _component_line(comp_id, name, param_names, description):
+    """Prompt line for one component; unchanged components are formatted once"""
+    param_info = f"(Params: {list(param_names)})" if param_names is not None else ""
+    return f"  - ID: {comp_id}, Name: {name} {param_info}. Desc: {description[:100]}..."
+
+
 def _format_components_context(components_data):
     """Helper to format available components context"""
     context_parts = ["Available TFrameX Components:"]
-    for cat in ["agents", "patterns", "tools"]:
+    for cat, param_names_of in _COMPONENT_PARAM_NAMES.items():
         context_parts.append(f"\n{cat.upper()}:")
-        for comp in components_data.get(cat, []):
-            desc = comp.get('description', 'No description.')[:100]
-            param_info = ""
-            if cat == "patterns":
-                param_info = f"(Params: {list(comp.get('constructor_params_schema', {}).keys())})"
-            elif cat == "tools":
-                param_info = f"(Params: {list(comp.get('parameters_schema', {}).get('properties', {}).keys())})"
-            context_parts.append(f"  - ID: {comp['id']}, Name: {comp['name']} {param_info}. Desc: {desc}...")
+        context_parts.extend(
+            _component_line(
+                comp['id'], comp['name'], param_names_of(comp),
+                comp.get('description', 'No description.')
+            )
+            for comp in components_data.get(cat, [])
+        )
     return "\n".join(context_parts)
 
 
+def _strip_ui_fields(items):
+    """Drop ReactFlow canvas state that carries no meaning for the agents"""
+    return [
+        {key: value for key, value in item.items() if key not in _UI_ONLY_FIELDS}
+        if isinstance(item, dict) else item
+        for item in items
+    ]
+
 def _format_flow_state_context(nodes, edges):
-    """Helper to format current flow state context"""
+    """Helper to format current flow state context (compact JSON, UI fields stripped)"""
+    # The frontend resends the same flow on every chat turn; reuse the last formatting of it
+    key = hashlib.blake2b(dumps_bytes((nodes, edges)), digest_size=16).digest()
+    context = _flow_context_cache.get(key)
+    if context is None:
+        context = (
+            f"Current Visual Flow State (Nodes: {len(nodes)}, Edges: {len(edges)}):\n"
+            f"Nodes: {dumps_bytes(_strip_ui_fields(nodes)).decode()}\n"
+            f"Edges: {dumps_bytes(_strip_ui_fields(edges)).decode()}"
+        )
+        _flow_context_cache.set(key, context)
+    return context
+
+
+def _format_flow_structure_context(nodes, edges):
+    """Column-style summary of the flow: node ids/types/labels and edge endpoints only"""
+    ids = [node.get('id') for node in nodes]
+    types = [node.get('type') for node in nodes]
+    labels = [(node.get('data') or {}).get('label') for node in nodes]
+    node_rows = "; ".join(
+        f"{node_id}:{node_type}" + (f" ({label})" if label else "")
+        for node_id, node_type, label in zip(ids, types, labels)
+    )
+    edge_rows = "; ".join(f"{edge.get('source')}->{edge.get('target')}" for edge in edges)
     return (
         f"Current Visual Flow State (Nodes: {len(nodes)}, Edges: {len(edges)}):\n"
-        f"Nodes: {json.dumps(nodes, indent=2)}\n"
-        f"Edges: {json.dumps(edges, indent=2)}"
+        f"NODES (id:type): {node_rows or 'none'}\n"
+        f"EDGES (source->target): {edge_rows or 'none'}"
     )
 
 
 @chatbot_bp.route('/orchestrator/test', methods=['POST'])
 def orchestrator_test():
     """Test OrchestratorAgent functionality"""
-    global_tframex_app = get_global_tframex_app()
+    global_tframex_app = get_tframex_app_instance()
     data = request.get_json()
     
     test_message = data.get('message', 'Hello OrchestratorAgent! Can you use your Flow Structure Analyzer tool to analyze an empty flow?')
@@ -400,7 +598,7 @@ def orchestrator_test():
     
     try:
         async def run_test():
-            async with global_tframex_app.run_context() as rt:
+            async with pooled_runtime(global_tframex_app) as rt:
                 # Test basic functionality with simple context
                 template_vars = {
                     "available_components_context": "Test Components: ConversationalAssistant, FlowBuilderAgent, OrchestratorAgent",
@@ -425,7 +623,7 @@ def orchestrator_test():
                     }
                 }
         
-        result = asyncio.run(run_test())
+        result = run_sync(run_test(), timeout=CHATBOT_AGENT_TIMEOUT)
         return jsonify(result)
         
     except Exception as e:
@@ -1,10 +1,14 @@
 # routes/export_import.py
 import logging
+from collections import deque
+from types import MappingProxyType
 from typing import Dict, Any
-from flask import Blueprint, request, jsonify, make_response, g
+from flask import Blueprint, Response, request, jsonify, g, stream_with_context
 from services.flow_serializer import FlowSerializer
+from json_provider import request_json
 from database import get_flow, list_flows
-from component_manager import discover_tframex_components
+from component_manager import get_components_snapshot
+from tframex_config import get_tframex_app_instance
 from middleware.auth import require_auth, get_current_user_id
 from auth.rbac import require_permission
 
@@ -12,10 +16,18 @@ logger = logging.getLogger("ExportImportAPI")
 
 export_import_bp = Blueprint('export_import', __name__, url_prefix='/api/tframex')
 
-def get_global_tframex_app():
-    """Get the global TFrameX app instance"""
-    from tframex_config import get_tframex_app_instance
-    return get_tframex_app_instance()
+# Export format lookups, built once
+_SUPPORTED_FORMATS = frozenset(FlowSerializer.SUPPORTED_FORMATS)
+_CONTENT_TYPES = MappingProxyType({
+    'json': 'application/json',
+    'yaml': 'application/x-yaml',
+    'mermaid': 'text/plain'
+})
+_FILE_EXTENSIONS = MappingProxyType({
+    'json': 'json',
+    'yaml': 'yaml',
+    'mermaid': 'mmd'
+})
 
 @export_import_bp.route('/flows/<flow_id>/export', methods=['GET'])
 @require_auth
@@ -28,7 +40,7 @@ def export_flow(flow_id):
         # Get format from query params
         format_type = request.args.get('format', 'json').lower()
         
-        if format_type not in FlowSerializer.SUPPORTED_FORMATS:
+        if format_type not in _SUPPORTED_FORMATS:
             return jsonify({
                 "error": f"Unsupported format: {format_type}. Supported: {FlowSerializer.SUPPORTED_FORMATS}"
             }), 400
@@ -45,27 +57,14 @@ def export_flow(flow_id):
             if not flow_data:
                 return jsonify({"error": "Flow not found"}), 404
         
-        # Export flow
-        exported_content = FlowSerializer.export_flow(flow_data, format_type)
+        # Export flow (normalized now, serialized chunk by chunk while the response is sent)
+        exported_chunks = FlowSerializer.iter_export(flow_data, format_type)
         
         # Set appropriate content type and filename
-        content_type_map = {
-            'json': 'application/json',
-            'yaml': 'application/x-yaml',
-            'mermaid': 'text/plain'
-        }
-        
-        file_extension_map = {
-            'json': 'json',
-            'yaml': 'yaml',
-            'mermaid': 'mmd'
-        }
-        
         flow_name = flow_data.get('name', 'flow').replace(' ', '_').lower()
-        filename = f"{flow_name}.{file_extension_map[format_type]}"
+        filename = f"{flow_name}.{_FILE_EXTENSIONS[format_type]}"
         
-        response = make_response(exported_content)
-        response.headers['Content-Type'] = content_type_map[format_type]
+        response = Response(stream_with_context(exported_chunks), mimetype=_CONTENT_TYPES[format_type])
         response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
         
         logger.info(f"Successfully exported flow {flow_id} as {format_type}")
@@ -83,13 +82,13 @@ def export_current_flow():
     logger.info("Export request for current flow")
     
     try:
-        data = request.get_json()
+        data = request_json()
         if not data:
             return jsonify({"error": "No flow data provided"}), 400
         
         format_type = data.get('format', 'json').lower()
         
-        if format_type not in FlowSerializer.SUPPORTED_FORMATS:
+        if format_type not in _SUPPORTED_FORMATS:
             return jsonify({
                 "error": f"Unsupported format: {format_type}. Supported: {FlowSerializer.SUPPORTED_FORMATS}"
             }), 400
@@ -127,7 +126,7 @@ def import_flow():
     logger.info("Import request received")
     
     try:
-        data = request.get_json()
+        data = request_json()
         if not data:
             return jsonify({"error": "No data provided"}), 400
         
@@ -141,8 +140,8 @@ def import_flow():
         imported_flow = FlowSerializer.import_flow(content, format_type)
         
         # Get available components for validation
-        global_tframex_app = get_global_tframex_app()
-        available_components = discover_tframex_components(app_instance=global_tframex_app)
+        global_tframex_app = get_tframex_app_instance()
+        available_components = get_components_snapshot(global_tframex_app)
         
         # Validate dependencies
         missing_deps = FlowSerializer.validate_dependencies(imported_flow, available_components)
@@ -175,7 +174,7 @@ def validate_import():
     logger.info("Import validation request received")
     
     try:
-        data = request.get_json()
+        data = request_json()
         content = data.get('content')
         
         if not content:
@@ -229,22 +228,54 @@ def _apply_import_layout(flow_data: Dict[str, Any]) -> Dict[str, Any]:
     if not nodes:
         return flow_data
     
-    # Simple grid layout for imported nodes
-    cols = 3
+    # Layered layout: one column per dependency depth (Kahn's algorithm), one row per node in it
     spacing_x = 250
     spacing_y = 200
     start_x = 100
     start_y = 100
     
-    for i, node in enumerate(nodes):
-        row = i // cols
-        col = i % cols
+    node_ids = [node.get("id") for node in nodes]
+    successors = {node_id: [] for node_id in node_ids}
+    in_degree = dict.fromkeys(node_ids, 0)
+    for edge in edges:
+        source, target = edge.get("source"), edge.get("target")
+        if source in successors and target in in_degree and source != target:
+            successors[source].append(target)
+            in_degree[target] += 1
+    
+    if not any(successors.values()):
+        # Nothing connected: keep the simple 3-column grid
+        for i, node in enumerate(nodes):
+            row, col = divmod(i, 3)
+            node["position"] = {"x": start_x + (col * spacing_x), "y": start_y + (row * spacing_y)}
+        return _layout_result(flow_data, nodes, edges)
+    
+    layer = dict.fromkeys((node_id for node_id, degree in in_degree.items() if degree == 0), 0)
+    ready = deque(layer)
+    while ready:
+        node_id = ready.popleft()
+        for target in successors[node_id]:
+            layer[target] = max(layer.get(target, 0), layer[node_id] + 1)
+            in_degree[target] -= 1
+            if in_degree[target] == 0:
+                ready.append(target)
+    
+    # Nodes on a cycle never reach in-degree 0; give them a column after the DAG
+    cycle_layer = max(layer.values(), default=-1) + 1
+    rows_used = {}
+    for node, node_id in zip(nodes, node_ids):
+        col = layer.get(node_id, cycle_layer)
+        row = rows_used.get(col, 0)
+        rows_used[col] = row + 1
         
         node["position"] = {
             "x": start_x + (col * spacing_x),
             "y": start_y + (row * spacing_y)
         }
     
+    return _layout_result(flow_data, nodes, edges)
+
+def _layout_result(flow_data: Dict[str, Any], nodes, edges) -> Dict[str, Any]:
     return {
         "nodes": nodes,
         "edges": edges,
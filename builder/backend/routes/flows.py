@@ -1,20 +1,27 @@
 # routes/flows.py
-import os
-import asyncio
-import json
+import copy
+import itertools
 import logging
+import secrets
+import threading
 import time
 from flask import Blueprint, request, jsonify, g
-from tframex import TFrameXApp, Message
+from typing import List
+from pydantic import TypeAdapter
+from tframex import TFrameXApp, Message, ToolCall
 
 from database import (
     create_project, get_project, list_projects,
     save_flow, get_flow, list_flows, delete_flow,
-    create_flow_execution, update_flow_execution, get_flow_executions,
-    create_audit_log
+    create_flow_execution, update_flow_execution, get_flow_executions
 )
-from component_manager import discover_tframex_components, register_code_dynamically
+from audit_queue import enqueue_audit_log
+from component_manager import get_components_snapshot, register_code_dynamically
 from flow_translator import translate_visual_to_tframex_flow
+from tframex_config import get_tframex_app_instance
+from json_provider import dumps_indent, request_json
+from services.async_bridge import run_sync
+from services.runtime_pool import shared_llm_runtime
 from middleware.auth import require_auth, get_current_user_id, get_current_organization_id
 from auth.rbac import require_permission
 
@@ -22,11 +29,6 @@ logger = logging.getLogger("FlowsAPI")
 
 flows_bp = Blueprint('flows', __name__, url_prefix='/api/tframex')
 
-def get_global_tframex_app():
-    """Get the global TFrameX app instance"""
-    from tframex_config import get_tframex_app_instance
-    return get_tframex_app_instance()
-
 # --- Project Management ---
 
 @flows_bp.route('/projects', methods=['GET', 'POST'])
@@ -41,7 +43,7 @@ def handle_projects():
         projects = list_projects()  # TODO: Filter by organization in database layer
         
         # Create audit log for project listing
-        create_audit_log(
+        enqueue_audit_log(
             user_id=user_id,
             organization_id=organization_id,
             action='list',
@@ -55,7 +57,7 @@ def handle_projects():
     elif request.method == 'POST':
         # Check permission to create projects
         from auth.rbac import RBACManager
-        user_permissions = getattr(g, 'permissions', [])
+        user_permissions = getattr(g, 'permissions_set', None) or getattr(g, 'permissions', [])
         if not RBACManager.check_permission(user_permissions, 'projects.create'):
             return jsonify({
                 'error': 'Insufficient permissions',
@@ -73,7 +75,7 @@ def handle_projects():
             project = create_project(project_id, name, description)
             
             # Create audit log
-            create_audit_log(
+            enqueue_audit_log(
                 user_id=user_id,
                 organization_id=organization_id,
                 action='create',
@@ -150,9 +152,9 @@ def get_flow_execution_history(flow_id):
 def list_tframex_studio_components():
     logger.info("Request received for /api/tframex/components")
     try:
-        global_tframex_app = get_global_tframex_app()
+        global_tframex_app = get_tframex_app_instance()
         # Components are discovered from the global app instance
-        components = discover_tframex_components(app_instance=global_tframex_app)
+        components = get_components_snapshot(global_tframex_app)
         return jsonify(components)
     except Exception as e:
         logger.error(f"Error discovering TFrameX components: {e}", exc_info=True)
@@ -161,8 +163,8 @@ def list_tframex_studio_components():
 @flows_bp.route('/register_code', methods=['POST'])
 @require_permission('flows.create')
 def handle_register_tframex_code():
-    global_tframex_app = get_global_tframex_app()
-    data = request.get_json()
+    global_tframex_app = get_tframex_app_instance()
+    data = request_json()
     python_code = data.get("python_code")
 
     if not python_code:
@@ -180,56 +182,119 @@ def handle_register_tframex_code():
 
 # --- Flow Execution ---
 
-@flows_bp.route('/flow/execute', methods=['POST'])
-@require_permission('flows.execute')
-def handle_execute_tframex_flow():
-    global_tframex_app = get_global_tframex_app()
-    run_id = f"sflw_{int(time.time())}_{os.urandom(3).hex()}"
-    logger.info(f"--- API Call: /api/tframex/flow/execute (Run ID: {run_id}) ---")
-
-    data = request.get_json()
-    visual_nodes = data.get('nodes')
-    visual_edges = data.get('edges')
-    initial_input_content = data.get("initial_input", "Default starting message for the visual flow.")
-    global_flow_template_vars = data.get("global_flow_template_vars", {})
-
-    if not visual_nodes:
-        logger.warning(f"Run ID {run_id}: No 'nodes' provided in flow execution request.")
-        return jsonify({"output": f"Run ID {run_id}: Error - No visual nodes provided.", "error": "Missing 'nodes' in flow definition"}), 400
-
-    execution_log = [f"--- TFrameX Visual Flow Execution Start (Run ID: {run_id}) ---"]
-
-    # --- Create a temporary TFrameXApp instance for this specific run ---
+# Run ids: per-process prefix (start time + random, unique across workers and restarts)
+# plus a counter, so ids sort by start order without a syscall per run
+_RUN_ID_PREFIX = f"{int(time.time()):x}{secrets.token_hex(3)}"
+_run_id_counter = itertools.count(1)
+
+# Serializes a whole tool_calls list to JSON in one pydantic-core pass
+_TOOL_CALLS_ADAPTER = TypeAdapter(List[ToolCall])
+
+# Template for per-run apps: every global tool registered once, rebuilt only when
+# the global registries change. Replaced as a whole, never mutated.
+_run_app_template = {"key": None, "app": None, "log": ""}
+_run_app_template_lock = threading.Lock()
+
+def _truncate_for_log(value, limit=200):
+    """str(value), cut to limit characters with an ellipsis; formats the value only once"""
+    text = str(value)
+    return text if len(text) <= limit else text[:limit] + '...'
+
+# id(tool) -> (tool, parameters schema dict); the tool reference keeps the id from being reused
+_TOOL_SCHEMA_CACHE = {}
+
+def _tool_parameters_schema(tool_obj):
+    """Dumped parameters schema for a tool, serialized once per tool object"""
+    cached = _TOOL_SCHEMA_CACHE.get(id(tool_obj))
+    if cached is not None and cached[0] is tool_obj:
+        return cached[1]
+    params_data_dict = tool_obj.parameters.model_dump(exclude_none=True) if tool_obj.parameters else None
+    _TOOL_SCHEMA_CACHE[id(tool_obj)] = (tool_obj, params_data_dict)
+    return params_data_dict
+
+def _build_run_app_template(global_tframex_app):
+    """Build a temporary-app template with all globally known tools re-registered on it"""
     # v1.1.0: Include MCP configuration if available
-    temp_run_app = TFrameXApp(
+    template_app = TFrameXApp(
         default_llm=global_tframex_app.default_llm,
         mcp_config_file=None  # Don't reload MCP for temp instances
     )
-    execution_log.append(f"  Created temporary TFrameXApp for run_id: {run_id}")
+    registration_log = []
 
     # Re-register all globally known tools onto the temporary app instance
     # This ensures tools added dynamically via UI are available for this run
     if global_tframex_app._tools:
-        execution_log.append(f"  Registering {len(global_tframex_app._tools)} global tools onto temporary app...")
-        for tool_name, tool_obj in global_tframex_app._tools.items():
+        registration_log.append(f"  Registering {len(global_tframex_app._tools)} global tools onto temporary app...")
+        for tool_name, tool_obj in list(global_tframex_app._tools.items()):
             try:
-                # Re-register by calling the .tool() decorator method on the temp_run_app instance
+                # Re-register by calling the .tool() decorator method on the template app
                 # Provide the JSON schema dictionary for parameters_schema,
                 # as tool_obj.parameters (the Pydantic model class) seems to cause issues with '.get()'
                 # In v1.1.0, parameters is a Pydantic model, use model_dump
-                params_data_dict = tool_obj.parameters.model_dump(exclude_none=True) if tool_obj.parameters else None
-                temp_run_app.tool(
+                params_data_dict = _tool_parameters_schema(tool_obj)
+                template_app.tool(
                     name=tool_name,
                     description=tool_obj.description,
                     parameters_schema=params_data_dict # Pass the data dictionary
                 )(tool_obj.func) # Call the returned decorator with the actual tool function
-                execution_log.append(f"    - Tool '{tool_name}' registered on temporary app.")
+                registration_log.append(f"    - Tool '{tool_name}' registered on temporary app.")
             except Exception as e_tool_reg:
                 error_msg = f"    - Failed to register tool '{tool_name}' on temporary app: {e_tool_reg}"
                 logger.error(error_msg)
-                execution_log.append(error_msg)
+                registration_log.append(error_msg)
     else:
-        execution_log.append("  No global tools to register on temporary app.")
+        registration_log.append("  No global tools to register on temporary app.")
+
+    # Drop schemas of tools that are no longer registered
+    live_tool_ids = {id(tool_obj) for tool_obj in global_tframex_app._tools.values()}
+    for stale_id in _TOOL_SCHEMA_CACHE.keys() - live_tool_ids:
+        _TOOL_SCHEMA_CACHE.pop(stale_id, None)
+    return template_app, "\n".join(registration_log)
+
+def _new_run_app(global_tframex_app):
+    """Return (app, tool registration log text) for one flow run.
+
+    The app shares the template's tool registry but gets its own agent and flow
+    registries, since the translator registers run-specific agent configs.
+    """
+    global _run_app_template
+    key = (id(global_tframex_app), getattr(global_tframex_app, '_components_version', 0), len(global_tframex_app._tools))
+    template = _run_app_template
+    if template["key"] != key:
+        with _run_app_template_lock:
+            template = _run_app_template
+            if template["key"] != key:
+                template_app, registration_log = _build_run_app_template(global_tframex_app)
+                template = {"key": key, "app": template_app, "log": registration_log}
+                _run_app_template = template
+    run_app = copy.copy(template["app"])
+    run_app._agents = {}
+    run_app._flows = {}
+    return run_app, template["log"]
+
+@flows_bp.route('/flow/execute', methods=['POST'])
+@require_permission('flows.execute')
+def handle_execute_tframex_flow():
+    global_tframex_app = get_tframex_app_instance()
+    run_id = f"sflw_{_RUN_ID_PREFIX}_{next(_run_id_counter):08x}"
+    logger.info(f"--- API Call: /api/tframex/flow/execute (Run ID: {run_id}) ---")
+
+    data = request_json()
+    visual_nodes = data.get('nodes')
+    visual_edges = data.get('edges')
+    initial_input_content = data.get("initial_input", "Default starting message for the visual flow.")
+    global_flow_template_vars = data.get("global_flow_template_vars", {})
+
+    if not visual_nodes:
+        logger.warning(f"Run ID {run_id}: No 'nodes' provided in flow execution request.")
+        return jsonify({"output": f"Run ID {run_id}: Error - No visual nodes provided.", "error": "Missing 'nodes' in flow definition"}), 400
+
+    execution_log = [f"--- TFrameX Visual Flow Execution Start (Run ID: {run_id}) ---"]
+
+    # --- Create a temporary TFrameXApp instance for this specific run ---
+    temp_run_app, tool_registration_log = _new_run_app(global_tframex_app)
+    execution_log.append(f"  Created temporary TFrameXApp for run_id: {run_id}")
+    execution_log.append(tool_registration_log)
     # --- End temporary app setup ---
 
     # 1. Translate visual graph to tframex.Flow, using the temporary app for registrations
@@ -277,7 +342,7 @@ def handle_execute_tframex_flow():
             # Register the flow with the temporary app before creating runtime context
             temp_run_app.register_flow(constructed_tframex_flow)
             
-            async with temp_run_app.run_context() as rt:
+            async with shared_llm_runtime(temp_run_app) as rt:
                 
                 start_message = Message(role="user", content=str(initial_input_content))
                 
@@ -294,19 +359,21 @@ def handle_execute_tframex_flow():
                 )
                 return final_flow_context
         
-        final_flow_context = asyncio.run(execute_flow())
+        final_flow_context = run_sync(execute_flow())
         
         execution_log.append(f"\n--- TFrameX Flow Result (Run ID: {run_id}) ---")
         execution_log.append(f"Final Message Role: {final_flow_context.current_message.role}")
         execution_log.append(f"Final Message Content:\n{final_flow_context.current_message.content}")
 
         if final_flow_context.current_message.tool_calls:
-            tool_calls_summary = json.dumps([tc.model_dump(exclude_none=True) for tc in final_flow_context.current_message.tool_calls], indent=2)
+            tool_calls_summary = _TOOL_CALLS_ADAPTER.dump_json(
+                final_flow_context.current_message.tool_calls, exclude_none=True, indent=2
+            ).decode()
             execution_log.append(f"Final Message Tool Calls (if any, unhandled at flow end):\n{tool_calls_summary}")
 
         if final_flow_context.shared_data:
-             shared_data_summary = {k: (str(v)[:200] + '...' if len(str(v)) > 200 else str(v)) for k,v in final_flow_context.shared_data.items()}
-             execution_log.append(f"Final Flow Shared Data:\n{json.dumps(shared_data_summary, indent=2)}")
+             shared_data_summary = {k: _truncate_for_log(v) for k, v in final_flow_context.shared_data.items()}
+             execution_log.append(f"Final Flow Shared Data:\n{dumps_indent(shared_data_summary)}")
 
         if "studio_preview_url" in final_flow_context.shared_data:
             final_preview_link = final_flow_context.shared_data["studio_preview_url"]
@@ -1,53 +1,195 @@
 # routes/mcp_servers.py
-import logging
 import asyncio
-from flask import Blueprint, request, jsonify
+import hashlib
+import logging
+import os
+import weakref
+from flask import Blueprint, Response, request, jsonify, g
+from services.async_bridge import run_sync
+from json_provider import dumps_bytes
+from tframex_config import get_mcp_manager, get_tframex_app_instance
 
 logger = logging.getLogger("MCPServersAPI")
 
 mcp_servers_bp = Blueprint('mcp_servers', __name__, url_prefix='/api/tframex/mcp')
 
-def get_global_tframex_app():
-    """Get the global TFrameX app instance"""
-    from tframex_config import get_tframex_app_instance
-    return get_tframex_app_instance()
+STATUS_CACHE_CONTROL = 'private, max-age=2'
+
+# Tools TFrameX registers when MCP is enabled
+MCP_META_TOOL_NAMES = frozenset({
+    "tframex_list_mcp_servers",
+    "tframex_list_mcp_resources",
+    "tframex_read_mcp_resource",
+    "tframex_list_mcp_prompts",
+    "tframex_use_mcp_prompt"
+})
+
+# Encoded status bodies: server alias (None for /status) -> (state key, JSON bytes, ETag).
+# State keys are read from the live MCP manager and app, like component_manager's
+# snapshot key, so servers TFrameX connects or drops by itself and tool
+# registrations invalidate them too; a stale entry is simply overwritten.
+_status_cache = {}
+
+def _overall_state_key(mcp_manager):
+    """Inputs of the /status body: connected aliases and the app's tool registry"""
+    if mcp_manager is None:
+        return None
+    app = get_tframex_app_instance()
+    servers = getattr(mcp_manager, '_connected_servers', None) or {}
+    return (getattr(app, '_components_version', 0), len(app._tools), tuple(servers))
+
+def _server_state_key(server):
+    """Inputs of a connected server's status body"""
+    # The server object itself (not its id), so a reconnect never matches a recycled id
+    return (server,
+            len(getattr(server, 'tools', None) or ()),
+            len(getattr(server, 'resources', None) or ()),
+            len(getattr(server, 'prompts', None) or ()))
+
+def _encoded_status(cache_key, state_key, build, cache=True):
+    """(body, ETag) for state_key, rebuilding the body with build() on a miss"""
+    entry = _status_cache.get(cache_key)
+    if entry is None or entry[0] != state_key:
+        body = dumps_bytes(build())
+        entry = (state_key, body, hashlib.blake2b(body, digest_size=8).hexdigest())
+        if cache:
+            _status_cache[cache_key] = entry
+    return entry[1], entry[2]
+
+def _serialize_server(server, alias):
+    """server_info payload for a connected MCP server"""
+    return {
+        "alias": alias,
+        "status": "connected",
+        "tools": [{"name": tool.name, "description": tool.description}
+                  for tool in getattr(server, 'tools', None) or ()],
+        "resources": [{"name": resource.name}
+                      for resource in getattr(server, 'resources', None) or ()],
+        "prompts": [{"name": prompt.name}
+                    for prompt in getattr(server, 'prompts', None) or ()]
+    }
+
+def _not_modified_response(etag):
+    """Return a 304 if the client already holds this version, else None"""
+    if not request.if_none_match.contains_weak(etag):
+        return None
+    response = Response(status=304)
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = STATUS_CACHE_CONTROL
+    return response
+
+def _status_response(body, etag):
+    """Status response from an already-encoded JSON body"""
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = STATUS_CACHE_CONTROL
+    return response
+
+# Concurrent connects are bounded (each spawns a server process), and a connect
+# for an alias that is already connecting waits for that attempt instead of
+# starting another. Both are only touched on the shared event loop.
+MCP_CONNECT_CONCURRENCY = int(os.getenv('MCP_CONNECT_CONCURRENCY', '4'))
+_connect_semaphore = None
+_connects_in_flight = {}
+
+def _get_connect_semaphore():
+    # Created on first use so it belongs to the shared loop
+    global _connect_semaphore
+    if _connect_semaphore is None:
+        _connect_semaphore = asyncio.Semaphore(MCP_CONNECT_CONCURRENCY)
+    return _connect_semaphore
+
+# Connect/disconnect for the same alias are serialized; different aliases run in
+# parallel. Weak values, so a lock disappears once no coroutine is using it.
+_alias_locks = weakref.WeakValueDictionary()
+
+def _alias_lock(server_alias):
+    lock = _alias_locks.get(server_alias)
+    if lock is None:
+        lock = _alias_locks[server_alias] = asyncio.Lock()
+    return lock
+
+async def _connect_server(mcp_manager, server_alias, server_config):
+    """Start one MCP server and describe what it offers"""
+    try:
+        async with _alias_lock(server_alias):
+            # Initialize the server using MCP manager; each one spawns a server process
+            async with _get_connect_semaphore():
+                await mcp_manager.initialize_servers(server_config)
+            
+            # Get server info
+            connected_server = mcp_manager._connected_servers.get(server_alias)
+            if connected_server is not None:
+                return {
+                    "success": True,
+                    "message": f"Successfully connected to MCP server '{server_alias}'",
+                    "server_info": _serialize_server(connected_server, server_alias)
+                }
+            else:
+                return {
+                    "success": False,
+                    "message": f"Failed to connect to MCP server '{server_alias}'"
+                }
+            
+    except Exception as e:
+        logger.error(f"Error connecting to MCP server '{server_alias}': {e}", exc_info=True)
+        return {
+            "success": False,
+            "message": f"Connection failed: {str(e)}"
+        }
+
+async def _connect_server_once(mcp_manager, server_alias, server_config):
+    """Single-flight wrapper around _connect_server, keyed by alias"""
+    in_flight = _connects_in_flight.get(server_alias)
+    if in_flight is None:
+        in_flight = asyncio.ensure_future(_connect_server(mcp_manager, server_alias, server_config))
+        _connects_in_flight[server_alias] = in_flight
+        in_flight.add_done_callback(lambda _: _connects_in_flight.pop(server_alias, None))
+    # Shielded so one caller giving up doesn't cancel the attempt for the others
+    return await asyncio.shield(in_flight)
+
+@mcp_servers_bp.before_request
+def _resolve_mcp_manager():
+    # One lookup per request, shared by the handler and its coroutines
+    g.mcp_manager = get_mcp_manager()
 
 @mcp_servers_bp.route('/status', methods=['GET'])
 def get_mcp_status():
     """Get the status of MCP integration (v1.1.0 feature)"""
-    logger.info("Request received for /api/tframex/mcp/status")
+    # Polled by the UI; keep it out of the INFO log
+    logger.debug("Request received for /api/tframex/mcp/status")
     try:
-        global_tframex_app = get_global_tframex_app()
-        mcp_status = {
-            "enabled": False,
-            "servers": [],
-            "meta_tools": []
-        }
+        mcp_manager = g.mcp_manager
         
-        if hasattr(global_tframex_app, '_mcp_manager') and global_tframex_app._mcp_manager:
-            mcp_status["enabled"] = True
-            
-            # Get connected servers
-            if hasattr(global_tframex_app._mcp_manager, '_connected_servers'):
-                for server_alias in global_tframex_app._mcp_manager._connected_servers:
-                    mcp_status["servers"].append({
-                        "alias": server_alias,
-                        "status": "connected"
-                    })
+        def build_status():
+            mcp_status = {
+                "enabled": False,
+                "servers": [],
+                "meta_tools": []
+            }
             
-            # List MCP meta-tools
-            mcp_meta_tool_names = [
-                "tframex_list_mcp_servers",
-                "tframex_list_mcp_resources", 
-                "tframex_read_mcp_resource",
-                "tframex_list_mcp_prompts",
-                "tframex_use_mcp_prompt"
-            ]
-            for tool_name in mcp_meta_tool_names:
-                if tool_name in global_tframex_app._tools:
-                    mcp_status["meta_tools"].append(tool_name)
+            if mcp_manager is not None:
+                global_tframex_app = get_tframex_app_instance()
+                mcp_status["enabled"] = True
+                
+                # Get connected servers
+                connected_servers = getattr(mcp_manager, '_connected_servers', None)
+                if connected_servers is not None:
+                    for server_alias in connected_servers:
+                        mcp_status["servers"].append({
+                            "alias": server_alias,
+                            "status": "connected"
+                        })
+                
+                # List MCP meta-tools
+                mcp_status["meta_tools"] = sorted(MCP_META_TOOL_NAMES & global_tframex_app._tools.keys())
+            return mcp_status
         
-        return jsonify(mcp_status)
+        body, etag = _encoded_status(None, _overall_state_key(mcp_manager), build_status)
+        not_modified = _not_modified_response(etag)
+        if not_modified is not None:
+            return not_modified
+        return _status_response(body, etag)
     except Exception as e:
         logger.error(f"Error getting MCP status: {e}", exc_info=True)
         return jsonify({"error": "Failed to get MCP status"}), 500
@@ -57,8 +199,7 @@ def connect_mcp_server():
     """Connect to an MCP server"""
     logger.info("Request received for /api/tframex/mcp/servers/connect")
     try:
-        global_tframex_app = get_global_tframex_app()
-        data = request.get_json()
+        data = request.get_json(silent=True, cache=False) or {}
         server_alias = data.get('server_alias')
         command = data.get('command')
         args = data.get('args', [])
@@ -71,7 +212,8 @@ def connect_mcp_server():
             }), 400
         
         # Check if MCP manager is available
-        if not hasattr(global_tframex_app, '_mcp_manager') or not global_tframex_app._mcp_manager:
+        mcp_manager = g.mcp_manager
+        if mcp_manager is None:
             return jsonify({
                 "success": False,
                 "message": "MCP manager is not initialized"
@@ -86,57 +228,7 @@ def connect_mcp_server():
             }
         }
         
-        async def connect_server():
-            try:
-                # Initialize the server using MCP manager
-                await global_tframex_app._mcp_manager.initialize_servers(server_config)
-                
-                # Get server info
-                if server_alias in global_tframex_app._mcp_manager._connected_servers:
-                    connected_server = global_tframex_app._mcp_manager._connected_servers[server_alias]
-                    
-                    # Extract available capabilities
-                    tools = []
-                    resources = []
-                    prompts = []
-                    
-                    if hasattr(connected_server, 'tools') and connected_server.tools:
-                        tools = [{"name": tool.name, "description": tool.description} 
-                                for tool in connected_server.tools]
-                    
-                    if hasattr(connected_server, 'resources') and connected_server.resources:
-                        resources = [{"name": resource.name} 
-                                   for resource in connected_server.resources]
-                    
-                    if hasattr(connected_server, 'prompts') and connected_server.prompts:
-                        prompts = [{"name": prompt.name} 
-                                 for prompt in connected_server.prompts]
-                    
-                    return {
-                        "success": True,
-                        "message": f"Successfully connected to MCP server '{server_alias}'",
-                        "server_info": {
-                            "alias": server_alias,
-                            "status": "connected",
-                            "tools": tools,
-                            "resources": resources,
-                            "prompts": prompts
-                        }
-                    }
-                else:
-                    return {
-                        "success": False,
-                        "message": f"Failed to connect to MCP server '{server_alias}'"
-                    }
-                    
-            except Exception as e:
-                logger.error(f"Error connecting to MCP server '{server_alias}': {e}", exc_info=True)
-                return {
-                    "success": False,
-                    "message": f"Connection failed: {str(e)}"
-                }
-        
-        result = asyncio.run(connect_server())
+        result = run_sync(_connect_server_once(mcp_manager, server_alias, server_config))
         return jsonify(result)
         
     except Exception as e:
@@ -151,8 +243,7 @@ def disconnect_mcp_server():
     """Disconnect from an MCP server"""
     logger.info("Request received for /api/tframex/mcp/servers/disconnect")
     try:
-        global_tframex_app = get_global_tframex_app()
-        data = request.get_json()
+        data = request.get_json(silent=True, cache=False) or {}
         server_alias = data.get('server_alias')
         
         if not server_alias:
@@ -162,7 +253,8 @@ def disconnect_mcp_server():
             }), 400
         
         # Check if MCP manager is available
-        if not hasattr(global_tframex_app, '_mcp_manager') or not global_tframex_app._mcp_manager:
+        mcp_manager = g.mcp_manager
+        if mcp_manager is None:
             return jsonify({
                 "success": False,
                 "message": "MCP manager is not initialized"
@@ -170,26 +262,27 @@ def disconnect_mcp_server():
         
         async def disconnect_server():
             try:
-                # Check if server is connected
-                if server_alias in global_tframex_app._mcp_manager._connected_servers:
-                    connected_server = global_tframex_app._mcp_manager._connected_servers[server_alias]
-                    
-                    # Close the connection
-                    if hasattr(connected_server, 'close'):
-                        await connected_server.close()
-                    
-                    # Remove from connected servers
-                    del global_tframex_app._mcp_manager._connected_servers[server_alias]
-                    
-                    return {
-                        "success": True,
-                        "message": f"Successfully disconnected from MCP server '{server_alias}'"
-                    }
-                else:
-                    return {
-                        "success": False,
-                        "message": f"MCP server '{server_alias}' is not connected"
-                    }
+                # Serialized with other connects/disconnects of this alias
+                async with _alias_lock(server_alias):
+                    # Check if server is connected
+                    connected_server = mcp_manager._connected_servers.get(server_alias)
+                    if connected_server is not None:
+                        # Close the connection
+                        if hasattr(connected_server, 'close'):
+                            await connected_server.close()
+                        
+                        # Remove from connected servers
+                        del mcp_manager._connected_servers[server_alias]
+                        
+                        return {
+                            "success": True,
+                            "message": f"Successfully disconnected from MCP server '{server_alias}'"
+                        }
+                    else:
+                        return {
+                            "success": False,
+                            "message": f"MCP server '{server_alias}' is not connected"
+                        }
                     
             except Exception as e:
                 logger.error(f"Error disconnecting from MCP server '{server_alias}': {e}", exc_info=True)
@@ -198,7 +291,7 @@ def disconnect_mcp_server():
                     "message": f"Disconnection failed: {str(e)}"
                 }
         
-        result = asyncio.run(disconnect_server())
+        result = run_sync(disconnect_server())
         return jsonify(result)
         
     except Exception as e:
@@ -211,59 +304,48 @@ def disconnect_mcp_server():
 @mcp_servers_bp.route('/servers/<server_alias>/status', methods=['GET'])
 def get_mcp_server_status(server_alias):
     """Get the status of a specific MCP server"""
-    logger.info(f"Request received for /api/tframex/mcp/servers/{server_alias}/status")
+    logger.debug("Request received for /api/tframex/mcp/servers/%s/status", server_alias)
     try:
-        global_tframex_app = get_global_tframex_app()
-        
         # Check if MCP manager is available
-        if not hasattr(global_tframex_app, '_mcp_manager') or not global_tframex_app._mcp_manager:
+        mcp_manager = g.mcp_manager
+        if mcp_manager is None:
             return jsonify({
                 "success": False,
                 "message": "MCP manager is not initialized"
             }), 500
         
         # Check if server is connected
-        if server_alias in global_tframex_app._mcp_manager._connected_servers:
-            connected_server = global_tframex_app._mcp_manager._connected_servers[server_alias]
-            
-            # Extract current capabilities
-            tools = []
-            resources = []
-            prompts = []
-            
-            if hasattr(connected_server, 'tools') and connected_server.tools:
-                tools = [{"name": tool.name, "description": tool.description} 
-                        for tool in connected_server.tools]
-            
-            if hasattr(connected_server, 'resources') and connected_server.resources:
-                resources = [{"name": resource.name} 
-                           for resource in connected_server.resources]
-            
-            if hasattr(connected_server, 'prompts') and connected_server.prompts:
-                prompts = [{"name": prompt.name} 
-                         for prompt in connected_server.prompts]
-            
-            return jsonify({
-                "success": True,
-                "server_info": {
-                    "alias": server_alias,
-                    "status": "connected",
-                    "tools": tools,
-                    "resources": resources,
-                    "prompts": prompts
+        connected_server = mcp_manager._connected_servers.get(server_alias)
+        if connected_server is not None:
+            # Only connected servers are cached, so arbitrary aliases can't grow the cache
+            body, etag = _encoded_status(
+                server_alias, _server_state_key(connected_server),
+                lambda: {
+                    "success": True,
+                    "server_info": _serialize_server(connected_server, server_alias)
                 }
-            })
+            )
         else:
-            return jsonify({
-                "success": True,
-                "server_info": {
-                    "alias": server_alias,
-                    "status": "disconnected",
-                    "tools": [],
-                    "resources": [],
-                    "prompts": []
-                }
-            })
+            _status_cache.pop(server_alias, None)
+            body, etag = _encoded_status(
+                server_alias, None,
+                lambda: {
+                    "success": True,
+                    "server_info": {
+                        "alias": server_alias,
+                        "status": "disconnected",
+                        "tools": [],
+                        "resources": [],
+                        "prompts": []
+                    }
+                },
+                cache=False
+            )
+        
+        not_modified = _not_modified_response(etag)
+        if not_modified is not None:
+            return not_modified
+        return _status_response(body, etag)
             
     except Exception as e:
         logger.error(f"Error getting MCP server status for '{server_alias}': {e}", exc_info=True)
@@ -1,37 +1,136 @@
 # routes/models.py
-import logging
-import time
 import asyncio
-from flask import Blueprint, request, jsonify
+import atexit
+import hashlib
+import logging
+import os
+import secrets
+import threading
+from collections import OrderedDict
+from flask import Blueprint, Response, request, jsonify
+from pydantic import BaseModel, ValidationError
 from tframex import OpenAIChatLLM, Message
+from database import (
+    list_model_configs, create_model_config, upsert_model_config,
+    delete_model_config, set_default_model_config
+)
+from models.base import uuid7
+from json_provider import dumps_bytes
+from tframex_config import first_env
+from services.async_bridge import run_sync, submit
+from ttl_cache import TTLCache
 
 logger = logging.getLogger("ModelsAPI")
 
-# Model configuration storage (in-memory for now, can be moved to database later)
-MODEL_CONFIGS = {}
+# Model configurations live in the database (model_configs) so every worker
+# process sees the same set and they survive restarts
+DEFAULT_MODEL_ID = 'default'
+
+# Encoded GET /models body and its ETag, reused for as long as
+# list_model_configs() keeps returning the same cached list
+_models_body_cache = (None, b"", "")
+
+# Request payloads, validated (and coerced) from the raw body in one pass
+class ModelTestRequest(BaseModel):
+    provider: str
+    model_name: str
+    api_key: str
+    base_url: str
+
+class ModelConfigRequest(ModelTestRequest):
+    name: str
+    temperature: float = 0.7
+    max_tokens: int = 2000
+
+def _validation_error_message(error: ValidationError) -> str:
+    """Describe the first problem with a request payload"""
+    first = error.errors()[0]
+    field = ".".join(str(part) for part in first["loc"])
+    if first["type"] == "missing":
+        return f"Missing required field: {field}"
+    if not field:
+        return f"Invalid request body: {first['msg']}"
+    return f"Invalid field {field}: {first['msg']}"
+
+# Model test jobs: job_id -> concurrent Future running on the shared event loop
+MODEL_TEST_TIMEOUT = float(os.getenv('MODEL_TEST_TIMEOUT', '30'))
+_test_jobs = TTLCache(maxsize=256, ttl=300)
+
+# Test LLMs reused per (base_url, api_key hash, model_name) so repeat tests keep
+# their HTTP client and its keep-alive connections; least recently used is closed
+TEST_LLM_POOL_SIZE = 32
+_test_llm_pool = OrderedDict()
+_test_llm_pool_lock = threading.Lock()
+
+def _get_test_llm(model_name, base_url, api_key):
+    """Return a pooled OpenAIChatLLM for this configuration, creating it on a miss"""
+    key = (base_url, hashlib.sha256(api_key.encode()).hexdigest(), model_name)
+    with _test_llm_pool_lock:
+        llm = _test_llm_pool.get(key)
+        if llm is not None:
+            _test_llm_pool.move_to_end(key)
+            return llm
+    
+    # The httpx client is created lazily on first use, i.e. on the shared loop
+    llm = OpenAIChatLLM(
+        model_name=model_name,
+        api_base_url=base_url,
+        api_key=api_key,
+        parse_text_tool_calls=True
+    )
+    with _test_llm_pool_lock:
+        llm = _test_llm_pool.setdefault(key, llm)
+        _test_llm_pool.move_to_end(key)
+        while len(_test_llm_pool) > TEST_LLM_POOL_SIZE:
+            _, evicted = _test_llm_pool.popitem(last=False)
+            submit(evicted.close())
+    return llm
+
+async def _close_test_llms():
+    with _test_llm_pool_lock:
+        llms = list(_test_llm_pool.values())
+        _test_llm_pool.clear()
+    await asyncio.gather(*(llm.close() for llm in llms), return_exceptions=True)
+
+@atexit.register
+def _shutdown_test_llms():
+    # Registered after async_bridge's hook, so it runs while the loop is still up
+    if _test_llm_pool:
+        try:
+            run_sync(_close_test_llms(), timeout=5)
+        except Exception as e:
+            logger.warning(f"Failed to close pooled test LLMs: {e}")
 
 def init_default_model():
-    """Initialize default model configuration"""
-    import os
-    MODEL_CONFIGS['default'] = {
-        'id': 'default',
+    """Initialize (or refresh from the environment) the default model configuration"""
+    upsert_model_config({
+        'id': DEFAULT_MODEL_ID,
         'name': 'Default Model',
         'provider': 'openai',
-        'model_name': os.getenv("OPENAI_MODEL_NAME") or os.getenv("LLAMA_MODEL") or "llama3.2:1b",
-        'api_key': os.getenv("OPENAI_API_KEY") or os.getenv("LLAMA_API_KEY") or "ollama",
-        'base_url': os.getenv("OPENAI_API_BASE") or os.getenv("LLAMA_BASE_URL") or "http://localhost:11434/v1",
-        'is_default': True
-    }
+        'model_name': first_env("OPENAI_MODEL_NAME", "LLAMA_MODEL", default="llama3.2:1b"),
+        'api_key': first_env("OPENAI_API_KEY", "LLAMA_API_KEY", default="ollama"),
+        'base_url': first_env("OPENAI_API_BASE", "LLAMA_BASE_URL", default="http://localhost:11434/v1")
+    }, make_default_if_none=True)
 
 models_bp = Blueprint('models', __name__, url_prefix='/api/tframex/models')
 
 @models_bp.route('', methods=['GET'])
 def get_models():
     """Get all configured models"""
-    logger.info("Request received for /api/tframex/models")
+    # Polled by the UI; keep it out of the INFO log
+    logger.debug("Request received for /api/tframex/models")
     try:
-        models = list(MODEL_CONFIGS.values())
-        return jsonify({"models": models})
+        global _models_body_cache
+        configs = list_model_configs()
+        cached_configs, body, etag = _models_body_cache
+        if cached_configs is not configs:
+            body = dumps_bytes({"models": configs})
+            etag = hashlib.blake2b(body, digest_size=8).hexdigest()
+            _models_body_cache = (configs, body, etag)
+        
+        response = Response(body, mimetype='application/json')
+        response.set_etag(etag)
+        return response.make_conditional(request)
     except Exception as e:
         logger.error(f"Error getting models: {e}", exc_info=True)
         return jsonify({"error": "Failed to get models"}), 500
@@ -41,31 +140,23 @@ def add_model():
     """Add a new model configuration"""
     logger.info("Request received to add model")
     try:
-        data = request.json
-        required_fields = ['name', 'provider', 'model_name', 'api_key', 'base_url']
-        
-        for field in required_fields:
-            if field not in data:
-                return jsonify({"error": f"Missing required field: {field}"}), 400
+        try:
+            data = ModelConfigRequest.model_validate_json(request.get_data(cache=False))
+        except ValidationError as e:
+            return jsonify({"error": _validation_error_message(e)}), 400
         
         # Generate unique ID
-        model_id = f"model_{len(MODEL_CONFIGS)}_{int(time.time())}"
+        model_id = f"model_{uuid7().hex}"
         
         # Create model config
         model_config = {
             'id': model_id,
-            'name': data['name'],
-            'provider': data['provider'],
-            'model_name': data['model_name'],
-            'api_key': data['api_key'],
-            'base_url': data['base_url'],
             'is_default': False,
-            'temperature': data.get('temperature', 0.7),
-            'max_tokens': data.get('max_tokens', 2000)
+            **data.model_dump()
         }
         
-        MODEL_CONFIGS[model_id] = model_config
-        logger.info(f"Added model configuration: {model_id}")
+        model_config = create_model_config(model_config)
+        logger.info("Added model configuration: %s", model_id)
         
         return jsonify({"model": model_config}), 201
     except Exception as e:
@@ -75,16 +166,18 @@ def add_model():
 @models_bp.route('/<model_id>', methods=['DELETE'])
 def delete_model(model_id):
     """Delete a model configuration"""
-    logger.info(f"Request received to delete model: {model_id}")
+    logger.info("Request received to delete model: %s", model_id)
     try:
-        if model_id not in MODEL_CONFIGS:
+        model_config = get_model_configs().get(model_id)
+        if model_config is None:
             return jsonify({"error": "Model not found"}), 404
         
-        if MODEL_CONFIGS[model_id].get('is_default'):
+        if model_config.get('is_default'):
             return jsonify({"error": "Cannot delete default model"}), 400
         
-        del MODEL_CONFIGS[model_id]
-        logger.info(f"Deleted model configuration: {model_id}")
+        if not delete_model_config(model_id):
+            return jsonify({"error": "Model not found"}), 404
+        logger.info("Deleted model configuration: %s", model_id)
         
         return jsonify({"message": "Model deleted successfully"}), 200
     except Exception as e:
@@ -94,73 +187,97 @@ def delete_model(model_id):
 @models_bp.route('/<model_id>/default', methods=['PUT'])
 def set_default_model(model_id):
     """Set a model as default"""
-    logger.info(f"Request received to set default model: {model_id}")
+    logger.info("Request received to set default model: %s", model_id)
     try:
-        if model_id not in MODEL_CONFIGS:
+        # Clears the flag on the previous default in the same transaction
+        model_config = set_default_model_config(model_id)
+        if model_config is None:
             return jsonify({"error": "Model not found"}), 404
+        logger.info("Set default model: %s", model_id)
         
-        # Remove default from all models
-        for mid, config in MODEL_CONFIGS.items():
-            config['is_default'] = False
-        
-        # Set new default
-        MODEL_CONFIGS[model_id]['is_default'] = True
-        logger.info(f"Set default model: {model_id}")
-        
-        return jsonify({"model": MODEL_CONFIGS[model_id]}), 200
+        return jsonify({"model": model_config}), 200
     except Exception as e:
         logger.error(f"Error setting default model: {e}", exc_info=True)
         return jsonify({"error": "Failed to set default model"}), 500
 
 @models_bp.route('/test', methods=['POST'])
 def test_model():
-    """Test a model configuration by making a simple API call"""
+    """Start a test of a model configuration; poll /test/<job_id> for the result"""
     logger.info("Request received to test model")
     try:
-        data = request.json
-        required_fields = ['provider', 'model_name', 'api_key', 'base_url']
-        
-        for field in required_fields:
-            if field not in data:
-                return jsonify({"error": f"Missing required field: {field}"}), 400
+        try:
+            data = ModelTestRequest.model_validate_json(request.get_data(cache=False))
+        except ValidationError as e:
+            return jsonify({"error": _validation_error_message(e)}), 400
         
-        # Try to create an LLM instance and make a simple test call
         try:
-            test_llm = OpenAIChatLLM(
-                model_name=data['model_name'],
-                api_base_url=data['base_url'],
-                api_key=data['api_key'],
-                parse_text_tool_calls=True
-            )
-            
-            # Make a simple test call
-            async def test_call():
-                response = await test_llm.chat_completion(
-                    messages=[Message(role="user", content="Say 'test successful' in 3 words or less")],
-                    stream=False,
-                    max_tokens=10
-                )
-                return response.content if hasattr(response, 'content') else str(response)
-            
-            result = asyncio.run(test_call())
-            
-            return jsonify({
-                "success": True,
-                "message": "Model configuration is valid",
-                "response": result
-            }), 200
-            
+            test_llm = _get_test_llm(data.model_name, data.base_url, data.api_key)
         except Exception as e:
-            logger.error(f"Model test failed: {e}")
+            logger.warning("Model test failed: %s", e)
             return jsonify({
                 "success": False,
                 "error": f"Model test failed: {str(e)}"
             }), 400
+        
+        # Make a simple test call
+        async def test_call():
+            response = await asyncio.wait_for(
+                test_llm.chat_completion(
+                    messages=[Message(role="user", content="Say 'test successful' in 3 words or less")],
+                    stream=False,
+                    max_tokens=10
+                ),
+                MODEL_TEST_TIMEOUT
+            )
+            return response.content if hasattr(response, 'content') else str(response)
+        
+        # The provider round-trip runs on the shared loop; this worker returns right away
+        job_id = secrets.token_hex(8)
+        _test_jobs.set(job_id, submit(test_call()))
+        
+        return jsonify({"job_id": job_id, "status": "pending"}), 202
             
     except Exception as e:
         logger.error(f"Error testing model: {e}", exc_info=True)
         return jsonify({"error": "Failed to test model"}), 500
 
+@models_bp.route('/test/<job_id>', methods=['GET'])
+def get_model_test_result(job_id):
+    """Get the result of a model test started with POST /test"""
+    future = _test_jobs.get(job_id)
+    if future is None:
+        return jsonify({"error": "Test job not found"}), 404
+    
+    if not future.done():
+        return jsonify({"job_id": job_id, "status": "pending"}), 200
+    
+    try:
+        result = future.result()
+    except asyncio.TimeoutError:
+        logger.warning("Model test %s timed out after %ss", job_id, MODEL_TEST_TIMEOUT)
+        return jsonify({
+            "job_id": job_id,
+            "status": "done",
+            "success": False,
+            "error": f"Model test failed: no response within {MODEL_TEST_TIMEOUT:g}s"
+        }), 200
+    except Exception as e:
+        logger.warning("Model test failed: %s", e)
+        return jsonify({
+            "job_id": job_id,
+            "status": "done",
+            "success": False,
+            "error": f"Model test failed: {str(e)}"
+        }), 200
+    
+    return jsonify({
+        "job_id": job_id,
+        "status": "done",
+        "success": True,
+        "message": "Model configuration is valid",
+        "response": result
+    }), 200
+
 def get_model_configs():
-    """Get the MODEL_CONFIGS dictionary for use by other modules"""
-    return MODEL_CONFIGS
\ No newline at end of file
+    """Get model configurations keyed by id for use by other modules"""
+    return {config['id']: config for config in list_model_configs()}
\ No newline at end of file
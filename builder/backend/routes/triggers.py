@@ -3,43 +3,46 @@ Trigger API endpoints
 Provides REST API for trigger management
 """
 import logging
-from flask import Blueprint, request, jsonify
+import time
+from datetime import datetime, timezone
+from flask import Blueprint, Response, request
+from sqlalchemy import select, tuple_
 from services.trigger_service import get_trigger_service
+from services.async_bridge import run_sync
 from models import Triggers, TriggerExecutions
 from database import LocalSession
+from json_provider import dumps_bytes
 
 logger = logging.getLogger("TriggerAPI")
 
 triggers_bp = Blueprint('triggers', __name__, url_prefix='/api/triggers')
 
+# Process-wide singleton; bound once here rather than looked up per request
+_trigger_service = get_trigger_service()
+
+def _json_response(payload, status=200):
+    """JSON response encoded with dumps_bytes; datetimes serialize as ISO 8601"""
+    return Response(dumps_bytes(payload), status=status, mimetype='application/json')
+
 @triggers_bp.route('', methods=['GET'])
 def list_triggers():
     """List all triggers, optionally filtered by flow_id"""
     try:
         flow_id = request.args.get('flow_id')
-        trigger_service = get_trigger_service()
-        
-        # Run async function in sync context
-        import asyncio
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-        triggers = loop.run_until_complete(trigger_service.list_triggers(flow_id))
         
-        return jsonify({
+        triggers = run_sync(_trigger_service.list_triggers(flow_id))
+        
+        return _json_response({
             'success': True,
             'triggers': triggers
-        }), 200
+        }, 200)
         
     except Exception as e:
         logger.error(f"Error listing triggers: {e}", exc_info=True)
-        return jsonify({
+        return _json_response({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
 
 @triggers_bp.route('', methods=['POST'])
 def create_trigger():
@@ -51,27 +54,17 @@ def create_trigger():
         required_fields = ['flow_id', 'type', 'name', 'config']
         for field in required_fields:
             if field not in data:
-                return jsonify({
+                return _json_response({
                     'success': False,
                     'error': f'Missing required field: {field}'
-                }), 400
+                }, 400)
         
-        trigger_service = get_trigger_service()
-        
-        # Run async function in sync context
-        import asyncio
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-        trigger = loop.run_until_complete(trigger_service.register_trigger(
+        trigger = run_sync(_trigger_service.register_trigger(
             flow_id=data['flow_id'],
             trigger_config=data
         ))
         
-        return jsonify({
+        return _json_response({
             'success': True,
             'trigger': {
                 'id': trigger.id,
@@ -81,69 +74,50 @@ def create_trigger():
                 'description': trigger.description,
                 'enabled': trigger.enabled,
                 'webhook_url': trigger.webhook_url,
-                'created_at': trigger.created_at.isoformat(),
-                'updated_at': trigger.updated_at.isoformat()
+                'created_at': trigger.created_at,
+                'updated_at': trigger.updated_at
             }
-        }), 201
+        }, 201)
         
     except Exception as e:
         logger.error(f"Error creating trigger: {e}", exc_info=True)
-        return jsonify({
+        return _json_response({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
 
 @triggers_bp.route('/<trigger_id>', methods=['GET'])
 def get_trigger(trigger_id):
     """Get trigger details and status"""
     try:
-        trigger_service = get_trigger_service()
-        
-        # Run async function in sync context
-        import asyncio
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-        status = loop.run_until_complete(trigger_service.get_trigger_status(trigger_id))
+        status = run_sync(_trigger_service.get_trigger_status(trigger_id))
         
-        return jsonify({
+        return _json_response({
             'success': True,
             'trigger': status
-        }), 200
+        }, 200)
         
     except ValueError as e:
-        return jsonify({
+        return _json_response({
             'success': False,
             'error': str(e)
-        }), 404
+        }, 404)
     except Exception as e:
         logger.error(f"Error getting trigger {trigger_id}: {e}", exc_info=True)
-        return jsonify({
+        return _json_response({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
 
 @triggers_bp.route('/<trigger_id>', methods=['PUT'])
 def update_trigger(trigger_id):
     """Update trigger configuration"""
     try:
         data = request.get_json()
-        trigger_service = get_trigger_service()
-        
-        # Run async function in sync context
-        import asyncio
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-        trigger = loop.run_until_complete(trigger_service.update_trigger(trigger_id, data))
         
-        return jsonify({
+        trigger = run_sync(_trigger_service.update_trigger(trigger_id, data))
+        
+        return _json_response({
             'success': True,
             'trigger': {
                 'id': trigger.id,
@@ -153,123 +127,93 @@ def update_trigger(trigger_id):
                 'description': trigger.description,
                 'enabled': trigger.enabled,
                 'webhook_url': trigger.webhook_url,
-                'updated_at': trigger.updated_at.isoformat()
+                'updated_at': trigger.updated_at
             }
-        }), 200
+        }, 200)
         
     except ValueError as e:
-        return jsonify({
+        return _json_response({
             'success': False,
             'error': str(e)
-        }), 404
+        }, 404)
     except Exception as e:
         logger.error(f"Error updating trigger {trigger_id}: {e}", exc_info=True)
-        return jsonify({
+        return _json_response({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
 
 @triggers_bp.route('/<trigger_id>', methods=['DELETE'])
 def delete_trigger(trigger_id):
     """Delete a trigger"""
     try:
-        trigger_service = get_trigger_service()
-        
-        # Run async function in sync context
-        import asyncio
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-        loop.run_until_complete(trigger_service.unregister_trigger(trigger_id))
+        run_sync(_trigger_service.unregister_trigger(trigger_id))
         
-        return jsonify({
+        return _json_response({
             'success': True,
             'message': 'Trigger deleted successfully'
-        }), 200
+        }, 200)
         
     except Exception as e:
         logger.error(f"Error deleting trigger {trigger_id}: {e}", exc_info=True)
-        return jsonify({
+        return _json_response({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
 
 @triggers_bp.route('/<trigger_id>/enable', methods=['POST'])
 def enable_trigger(trigger_id):
     """Enable a trigger"""
     try:
-        trigger_service = get_trigger_service()
-        
-        # Run async function in sync context
-        import asyncio
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-        trigger = loop.run_until_complete(trigger_service.update_trigger(trigger_id, {'enabled': True}))
+        trigger = run_sync(_trigger_service.update_trigger(trigger_id, {'enabled': True}))
         
-        return jsonify({
+        return _json_response({
             'success': True,
             'message': 'Trigger enabled successfully',
             'trigger': {
                 'id': trigger.id,
                 'enabled': trigger.enabled
             }
-        }), 200
+        }, 200)
         
     except ValueError as e:
-        return jsonify({
+        return _json_response({
             'success': False,
             'error': str(e)
-        }), 404
+        }, 404)
     except Exception as e:
         logger.error(f"Error enabling trigger {trigger_id}: {e}", exc_info=True)
-        return jsonify({
+        return _json_response({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
 
 @triggers_bp.route('/<trigger_id>/disable', methods=['POST'])
 def disable_trigger(trigger_id):
     """Disable a trigger"""
     try:
-        trigger_service = get_trigger_service()
-        
-        # Run async function in sync context
-        import asyncio
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-        trigger = loop.run_until_complete(trigger_service.update_trigger(trigger_id, {'enabled': False}))
+        trigger = run_sync(_trigger_service.update_trigger(trigger_id, {'enabled': False}))
         
-        return jsonify({
+        return _json_response({
             'success': True,
             'message': 'Trigger disabled successfully',
             'trigger': {
                 'id': trigger.id,
                 'enabled': trigger.enabled
             }
-        }), 200
+        }, 200)
         
     except ValueError as e:
-        return jsonify({
+        return _json_response({
             'success': False,
             'error': str(e)
-        }), 404
+        }, 404)
     except Exception as e:
         logger.error(f"Error disabling trigger {trigger_id}: {e}", exc_info=True)
-        return jsonify({
+        return _json_response({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
 
 @triggers_bp.route('/<trigger_id>/test', methods=['POST'])
 def test_trigger(trigger_id):
@@ -278,84 +222,118 @@ def test_trigger(trigger_id):
         data = request.get_json() or {}
         payload = data.get('payload', {})
         
-        trigger_service = get_trigger_service()
-        
-        # Run async function in sync context
-        import asyncio
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-        execution_id = loop.run_until_complete(trigger_service.fire_trigger(trigger_id, {
+        execution_id = run_sync(_trigger_service.fire_trigger(trigger_id, {
             'test': True,
-            'triggered_at': asyncio.get_event_loop().time(),
+            'triggered_at': time.time(),
             'payload': payload
         }))
         
-        return jsonify({
+        return _json_response({
             'success': True,
             'message': 'Trigger test executed successfully',
             'execution_id': execution_id
-        }), 200
+        }, 200)
         
     except ValueError as e:
-        return jsonify({
+        return _json_response({
             'success': False,
             'error': str(e)
-        }), 404
+        }, 404)
     except Exception as e:
         logger.error(f"Error testing trigger {trigger_id}: {e}", exc_info=True)
-        return jsonify({
+        return _json_response({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
+
+def _encode_execution_cursor(triggered_at, execution_id):
+    """Cursor for the page after the execution (triggered_at, execution_id)"""
+    # UTC without an offset, so there is no '+' to get mangled in a query string
+    return f"{_as_utc(triggered_at).replace(tzinfo=None).isoformat()}_{execution_id}"
+
+def _decode_execution_cursor(cursor):
+    """Parse a cursor into (triggered_at, id); raises ValueError if malformed"""
+    timestamp, sep, execution_id = cursor.rpartition('_')
+    if not sep or not execution_id:
+        raise ValueError(f"Malformed cursor: {cursor}")
+    return _as_utc(datetime.fromisoformat(timestamp)), execution_id
+
+def _as_utc(value):
+    # Naive values (SQLite) are stored as UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
 
 @triggers_bp.route('/<trigger_id>/executions', methods=['GET'])
 def get_trigger_executions(trigger_id):
-    """Get execution history for a trigger"""
+    """Get execution history for a trigger, newest first.
+    
+    Pass the returned next_cursor as ?cursor= to fetch the following page.
+    """
     try:
         limit = int(request.args.get('limit', 50))
         offset = int(request.args.get('offset', 0))
         status = request.args.get('status')
+        cursor = request.args.get('cursor')
         
-        with LocalSession() as session:
-            query = session.query(TriggerExecutions).filter(
-                TriggerExecutions.trigger_id == trigger_id
+        if cursor:
+            try:
+                after = _decode_execution_cursor(cursor)
+            except ValueError:
+                return _json_response({
+                    'success': False,
+                    'error': 'Invalid cursor'
+                }, 400)
+        
+        # Only the columns the response needs, read as plain rows (no ORM objects)
+        stmt = select(
+            TriggerExecutions.id,
+            TriggerExecutions.trigger_id,
+            TriggerExecutions.flow_execution_id,
+            TriggerExecutions.status,
+            TriggerExecutions.triggered_at,
+            TriggerExecutions.completed_at,
+            TriggerExecutions.duration_ms,
+            TriggerExecutions.payload,
+            TriggerExecutions.error
+        ).where(TriggerExecutions.trigger_id == trigger_id)
+        
+        if status:
+            stmt = stmt.where(TriggerExecutions.status == status)
+        
+        if cursor:
+            # Keyset: seek past the last row of the previous page instead of OFFSET
+            stmt = stmt.where(
+                tuple_(TriggerExecutions.triggered_at, TriggerExecutions.id) < after
             )
-            
-            if status:
-                query = query.filter(TriggerExecutions.status == status)
-                
-            executions = query.order_by(
-                TriggerExecutions.triggered_at.desc()
-            ).offset(offset).limit(limit).all()
-            
-            return jsonify({
-                'success': True,
-                'executions': [
-                    {
-                        'id': ex.id,
-                        'trigger_id': ex.trigger_id,
-                        'flow_execution_id': ex.flow_execution_id,
-                        'status': ex.status,
-                        'triggered_at': ex.triggered_at.isoformat(),
-                        'completed_at': ex.completed_at.isoformat() if ex.completed_at else None,
-                        'duration_ms': ex.duration_ms,
-                        'payload': ex.payload,
-                        'error': ex.error
-                    }
-                    for ex in executions
-                ]
-            }), 200
+        elif offset:
+            stmt = stmt.offset(offset)
+        
+        stmt = stmt.order_by(
+            TriggerExecutions.triggered_at.desc(),
+            TriggerExecutions.id.desc()
+        ).limit(limit)
+        
+        with LocalSession() as session:
+            executions = [dict(row) for row in session.execute(stmt).mappings()]
+        
+        next_cursor = None
+        if executions and len(executions) == limit:
+            last = executions[-1]
+            next_cursor = _encode_execution_cursor(last['triggered_at'], last['id'])
+        
+        return _json_response({
+            'success': True,
+            'executions': executions,
+            'next_cursor': next_cursor
+        }, 200)
         
     except Exception as e:
         logger.error(f"Error getting executions for trigger {trigger_id}: {e}", exc_info=True)
-        return jsonify({
+        return _json_response({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
 
 @triggers_bp.route('/<trigger_id>/schedule/next-runs', methods=['GET'])
 def get_next_runs(trigger_id):
@@ -367,37 +345,36 @@ def get_next_runs(trigger_id):
         with LocalSession() as session:
             trigger = session.query(Triggers).filter(Triggers.id == trigger_id).first()
             if not trigger:
-                return jsonify({
+                return _json_response({
                     'success': False,
                     'error': 'Trigger not found'
-                }), 404
+                }, 404)
                 
             if trigger.type != 'schedule':
-                return jsonify({
+                return _json_response({
                     'success': False,
                     'error': 'Trigger is not a scheduled trigger'
-                }), 400
+                }, 400)
         
         # Get schedule processor
-        trigger_service = get_trigger_service()
-        schedule_processor = trigger_service.processors.get('schedule')
+        schedule_processor = _trigger_service.processors.get('schedule')
         
         if not schedule_processor:
-            return jsonify({
+            return _json_response({
                 'success': False,
                 'error': 'Schedule processor not available'
-            }), 500
+            }, 500)
             
         next_runs = schedule_processor.get_next_runs(trigger_id, count)
         
-        return jsonify({
+        return _json_response({
             'success': True,
-            'next_runs': [run.isoformat() for run in next_runs]
-        }), 200
+            'next_runs': next_runs
+        }, 200)
         
     except Exception as e:
         logger.error(f"Error getting next runs for trigger {trigger_id}: {e}", exc_info=True)
-        return jsonify({
+        return _json_response({
             'success': False,
             'error': str(e)
-        }), 500
\ No newline at end of file
+        }, 500)
\ No newline at end of file
@@ -0,0 +1,66 @@
+"""
+Async Bridge - Run coroutines from synchronous Flask handlers
+Keeps one event loop running on a daemon thread for the life of the process,
+so handlers don't create and tear down a loop with asyncio.run() per request
+and loop-bound resources (HTTP clients, MCP sessions) survive between calls.
+"""
+import atexit
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Awaitable, Optional
+
+logger = logging.getLogger("AsyncBridge")
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared event loop, starting its thread on first use"""
+    global _loop
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="async-bridge", daemon=True)
+                thread.start()
+                _loop = loop
+                logger.info("Started shared event loop thread")
+    return _loop
+
+
+def run_sync(coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+    """Run a coroutine on the shared loop and block until it completes.
+
+    Must not be called from a coroutine already running on the shared loop;
+    await the coroutine directly there instead.
+    """
+    loop = get_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        raise RuntimeError("run_sync() called from the shared event loop; await the coroutine instead")
+
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    try:
+        return future.result(timeout)
+    except FutureTimeoutError:
+        future.cancel()
+        raise
+
+
+def submit(coro: Awaitable[Any]) -> "Future[Any]":
+    """Schedule a coroutine on the shared loop without waiting for it"""
+    return asyncio.run_coroutine_threadsafe(coro, get_loop())
+
+
+def _shutdown():
+    if _loop is not None and _loop.is_running():
+        _loop.call_soon_threadsafe(_loop.stop)
+
+
+atexit.register(_shutdown)
@@ -8,6 +8,8 @@ import email
 import imaplib
 import poplib
 import ssl
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import Dict, Any, List, Optional
 from email.mime.text import MIMEText
@@ -15,9 +17,94 @@ from email.mime.multipart import MIMEMultipart
 import smtplib
 from .trigger_service import TriggerProcessor, TriggerExecutionContext
 from models import Triggers
+from database import LocalSession
+
+# Optional import - IMAP triggers poll with the stdlib imaplib if aioimaplib is missing
+try:
+    import aioimaplib
+    HAS_AIOIMAPLIB = True
+except ImportError:
+    HAS_AIOIMAPLIB = False
 
 logger = logging.getLogger("EmailProcessor")
 
+# Servers may drop an IDLE connection after 30 minutes (RFC 2177), so re-issue it before then
+IMAP_IDLE_TIMEOUT = 29 * 60
+EMAIL_IO_WORKERS = 8
+
+# Recently handled UIDs remembered per IMAP trigger, on top of the high-water mark
+PROCESSED_UIDS_LIMIT = 10000
+
+class SeenUids:
+    """IMAP UIDs already handled for one mailbox: the highest one plus a bounded recent set"""
+    
+    def __init__(self, mailbox: str, highest_uid: int = 0, limit: int = PROCESSED_UIDS_LIMIT):
+        self.mailbox = mailbox
+        self.highest_uid = highest_uid
+        self.saved_uid = highest_uid
+        self._recent: "OrderedDict[str, None]" = OrderedDict()
+        self._limit = limit
+        
+    def search_criteria(self, criteria: str) -> str:
+        """Restrict a search to UIDs after the high-water mark"""
+        return f"UID {self.highest_uid + 1}:* {criteria}"
+        
+    def is_new(self, uid: str) -> bool:
+        # "n:*" always matches the newest message, even when its UID is below n
+        return int(uid) > self.highest_uid and uid not in self._recent
+        
+    def add(self, uid: str) -> None:
+        self._recent[uid] = None
+        if len(self._recent) > self._limit:
+            self._recent.popitem(last=False)
+        self.highest_uid = max(self.highest_uid, int(uid))
+
+class MessageView:
+    """A parsed email with its body text and attachment info, read in one pass"""
+    def __init__(self, message: email.message.Message, body: str, attachments: List[Dict[str, Any]]):
+        self.message = message
+        self.body = body
+        self.attachments = attachments
+
+# Blocking mail helpers, run on EmailProcessor's I/O pool
+
+def _imap_connect(host: str, port: int, use_ssl: bool, username: str, password: str, folder: str):
+    if use_ssl:
+        mail = imaplib.IMAP4_SSL(host, port)
+    else:
+        mail = imaplib.IMAP4(host, port)
+    mail.login(username, password)
+    mail.select(folder)
+    return mail
+
+def _imap_search(mail, criteria: str) -> List[bytes]:
+    result, data = mail.uid('search', None, criteria)
+    if result != 'OK':
+        return []
+    return data[0].split()
+
+def _imap_fetch(mail, uid: str) -> Optional[bytes]:
+    result, msg_data = mail.uid('fetch', uid, '(RFC822)')
+    if result != 'OK':
+        return None
+    return msg_data[0][1]
+
+def _imap_close(mail) -> None:
+    mail.close()
+    mail.logout()
+
+def _pop3_connect(host: str, port: int, use_ssl: bool, username: str, password: str):
+    if use_ssl:
+        mail = poplib.POP3_SSL(host, port)
+    else:
+        mail = poplib.POP3(host, port)
+    mail.user(username)
+    mail.pass_(password)
+    return mail, len(mail.list()[1])
+
+def _pop3_retrieve(mail, index: int) -> bytes:
+    return b'\n'.join(mail.retr(index)[1])
+
 class EmailProcessor(TriggerProcessor):
     """Handles email triggers using IMAP/POP3 monitoring"""
     
@@ -25,6 +112,9 @@ class EmailProcessor(TriggerProcessor):
         super().__init__(trigger_service)
         self.monitors: Dict[str, asyncio.Task] = {}  # trigger_id -> monitoring task
         self._running = False
+        self._filters: Dict[str, Dict[str, Optional[str]]] = {}  # trigger_id -> lower-cased filters
+        # Blocking imaplib/poplib calls run here instead of on the event loop
+        self._io_pool = ThreadPoolExecutor(max_workers=EMAIL_IO_WORKERS, thread_name_prefix='email-io')
         
     async def start(self):
         """Start the email processor"""
@@ -44,6 +134,7 @@ class EmailProcessor(TriggerProcessor):
                 pass
                 
         self.monitors.clear()
+        self._filters.clear()
         logger.info("Email processor stopped")
         
     async def setup(self, trigger: Triggers) -> None:
@@ -58,6 +149,8 @@ class EmailProcessor(TriggerProcessor):
         if not config.get('host') or not config.get('username') or not config.get('password'):
             raise ValueError("Email host, username, and password are required")
             
+        self._filters[trigger.id] = self._compile_filters(config)
+            
         # Stop existing monitor if it exists
         if trigger.id in self.monitors:
             task = self.monitors[trigger.id]
@@ -93,8 +186,23 @@ class EmailProcessor(TriggerProcessor):
             del self.monitors[trigger.id]
             logger.info(f"Stopped email monitoring for trigger {trigger.id}")
             
+        self._filters.pop(trigger.id, None)
+            
     async def _monitor_imap(self, trigger: Triggers):
         """Monitor emails using IMAP protocol"""
+        seen = await self._run_io(self._load_seen_uids, trigger)
+        try:
+            if HAS_AIOIMAPLIB:
+                await self._monitor_imap_idle(trigger, seen)
+            else:
+                await self._poll_imap(trigger, seen)
+        finally:
+            # Written even if unchanged: an update may have replaced trigger.config
+            # (and imap_state with it) just before this monitor was cancelled
+            self._save_seen_uids(trigger, seen, force=True)
+            
+    async def _monitor_imap_idle(self, trigger: Triggers, seen: SeenUids):
+        """Monitor emails over one long-lived aioimaplib connection, woken by IMAP IDLE"""
         config = trigger.config
         host = config['host']
         port = config.get('port', 993)
@@ -104,61 +212,117 @@ class EmailProcessor(TriggerProcessor):
         use_ssl = config.get('use_ssl', True)
         check_interval = config.get('check_interval', 60)  # seconds
         
-        logger.info(f"Starting IMAP monitoring for {username}@{host}")
+        logger.info(f"Starting IMAP IDLE monitoring for {username}@{host}")
         
-        # Track processed messages to avoid duplicates
-        processed_uids = set()
+        search_criteria = self._build_imap_search_criteria(config)
         
         while self._running:
+            mail = None
             try:
-                # Connect to IMAP server
                 if use_ssl:
-                    mail = imaplib.IMAP4_SSL(host, port)
+                    mail = aioimaplib.IMAP4_SSL(host=host, port=port)
                 else:
-                    mail = imaplib.IMAP4(host, port)
+                    mail = aioimaplib.IMAP4(host=host, port=port)
                     
-                mail.login(username, password)
-                mail.select(folder)
+                await mail.wait_hello_from_server()
+                response = await mail.login(username, password)
+                if response.result != 'OK':
+                    raise ConnectionError(f"IMAP login failed: {response.result}")
+                await mail.select(folder)
+                
+                # Servers without IDLE are searched every check_interval on the same connection
+                supports_idle = mail.has_capability('IDLE')
+                
+                while self._running:
+                    # Only UIDs above the high-water mark; the server does the dedup
+                    response = await mail.uid_search(seen.search_criteria(search_criteria))
+                    if response.result == 'OK' and response.lines:
+                        for uid in response.lines[0].decode().split():
+                            if not seen.is_new(uid):
+                                continue
+                                
+                            response = await mail.uid('fetch', uid, '(RFC822)')
+                            if response.result == 'OK' and len(response.lines) > 1:
+                                message = email.message_from_bytes(bytes(response.lines[1]))
+                                # Marked before firing so a failing flow can't pin the high-water mark
+                                seen.add(uid)
+                                try:
+                                    await self._handle_message(trigger, config, message)
+                                except Exception as e:
+                                    logger.error(f"Error processing IMAP message {uid}: {e}")
+                                
+                    # Persist the mark per batch; a process exit skips _monitor_imap's finally
+                    await self._run_io(self._save_seen_uids, trigger, seen)
+                                    
+                    if supports_idle:
+                        idle = await mail.idle_start(timeout=IMAP_IDLE_TIMEOUT)
+                        try:
+                            # Returns on the first server push (e.g. EXISTS for new mail)
+                            await mail.wait_server_push(timeout=IMAP_IDLE_TIMEOUT)
+                        except asyncio.TimeoutError:
+                            pass
+                        mail.idle_done()
+                        await asyncio.wait_for(idle, 30)
+                    else:
+                        await asyncio.sleep(check_interval)
+                        
+            except Exception as e:
+                logger.error(f"Error monitoring IMAP for trigger {trigger.id}: {e}")
+            finally:
+                if mail is not None:
+                    try:
+                        await asyncio.wait_for(mail.logout(), 5)
+                    except Exception:
+                        pass
+                        
+            # Wait before reconnecting
+            await asyncio.sleep(check_interval)
+            
+    async def _poll_imap(self, trigger: Triggers, seen: SeenUids):
+        """Monitor emails by polling with the stdlib imaplib"""
+        config = trigger.config
+        host = config['host']
+        port = config.get('port', 993)
+        username = config['username']
+        password = config['password']
+        folder = config.get('folder', 'INBOX')
+        use_ssl = config.get('use_ssl', True)
+        check_interval = config.get('check_interval', 60)  # seconds
+        
+        logger.info(f"Starting IMAP monitoring for {username}@{host}")
+        
+        while self._running:
+            try:
+                # Connect to IMAP server
+                mail = await self._run_io(_imap_connect, host, port, use_ssl, username, password, folder)
                 
                 # Search for new messages based on trigger filters
-                search_criteria = self._build_imap_search_criteria(config)
-                result, data = mail.search(None, search_criteria)
+                search_criteria = seen.search_criteria(self._build_imap_search_criteria(config))
+                uids = await self._run_io(_imap_search, mail, search_criteria)
                 
-                if result == 'OK':
-                    message_ids = data[0].split()
+                for uid in uids:
+                    uid = uid.decode()
                     
-                    for msg_id in message_ids:
-                        uid = msg_id.decode()
+                    # Skip if already processed
+                    if not seen.is_new(uid):
+                        continue
                         
-                        # Skip if already processed
-                        if uid in processed_uids:
-                            continue
-                            
-                        # Fetch message
-                        result, msg_data = mail.fetch(msg_id, '(RFC822)')
-                        if result == 'OK':
-                            raw_email = msg_data[0][1]
-                            message = email.message_from_bytes(raw_email)
-                            
-                            # Check if message matches trigger criteria
-                            if self._matches_criteria(message, config):
-                                processed_uids.add(uid)
-                                
-                                # Extract email data
-                                email_data = self._extract_email_data(message)
-                                
-                                # Fire trigger
-                                payload = {
-                                    'email': email_data,
-                                    'trigger_type': 'email',
-                                    'received_at': datetime.now(timezone.utc).isoformat()
-                                }
-                                
-                                await self.trigger_service.fire_trigger(trigger.id, payload)
-                                logger.info(f"Email trigger {trigger.id} fired for message from {email_data.get('from')}")
+                    # Fetch message
+                    raw_email = await self._run_io(_imap_fetch, mail, uid)
+                    if raw_email is not None:
+                        message = email.message_from_bytes(raw_email)
+                        
+                        # Marked before firing so a failing flow can't pin the high-water mark
+                        seen.add(uid)
+                        try:
+                            await self._handle_message(trigger, config, message)
+                        except Exception as e:
+                            logger.error(f"Error processing IMAP message {uid}: {e}")
+                
+                # Persist the mark per batch; a process exit skips _monitor_imap's finally
+                await self._run_io(self._save_seen_uids, trigger, seen)
                 
-                mail.close()
-                mail.logout()
+                await self._run_io(_imap_close, mail)
                 
             except Exception as e:
                 logger.error(f"Error monitoring IMAP for trigger {trigger.id}: {e}")
@@ -181,49 +345,27 @@ class EmailProcessor(TriggerProcessor):
         
         while self._running:
             try:
-                # Connect to POP3 server
-                if use_ssl:
-                    mail = poplib.POP3_SSL(host, port)
-                else:
-                    mail = poplib.POP3(host, port)
-                    
-                mail.user(username)
-                mail.pass_(password)
-                
-                # Get message count
-                msg_count = len(mail.list()[1])
+                # Connect to POP3 server and get message count
+                mail, msg_count = await self._run_io(_pop3_connect, host, port, use_ssl, username, password)
                 
                 if msg_count > 0:
                     # Process each message
                     for i in range(1, msg_count + 1):
                         try:
                             # Retrieve message
-                            raw_message = b'\n'.join(mail.retr(i)[1])
+                            raw_message = await self._run_io(_pop3_retrieve, mail, i)
                             message = email.message_from_bytes(raw_message)
                             
-                            # Check if message matches trigger criteria
-                            if self._matches_criteria(message, config):
-                                # Extract email data
-                                email_data = self._extract_email_data(message)
-                                
-                                # Fire trigger
-                                payload = {
-                                    'email': email_data,
-                                    'trigger_type': 'email',
-                                    'received_at': datetime.now(timezone.utc).isoformat()
-                                }
-                                
-                                await self.trigger_service.fire_trigger(trigger.id, payload)
-                                logger.info(f"Email trigger {trigger.id} fired for message from {email_data.get('from')}")
-                                
+                            await self._handle_message(trigger, config, message)
+                            
                             # Delete message if configured
                             if delete_after_read:
-                                mail.dele(i)
+                                await self._run_io(mail.dele, i)
                                 
                         except Exception as e:
                             logger.error(f"Error processing POP3 message {i}: {e}")
                             
-                mail.quit()
+                await self._run_io(mail.quit)
                 
             except Exception as e:
                 logger.error(f"Error monitoring POP3 for trigger {trigger.id}: {e}")
@@ -231,6 +373,72 @@ class EmailProcessor(TriggerProcessor):
             # Wait before next check
             await asyncio.sleep(check_interval)
             
+    @staticmethod
+    def _mailbox_key(config: Dict[str, Any]) -> str:
+        return f"{config['username']}@{config['host']}/{config.get('folder', 'INBOX')}"
+        
+    def _load_seen_uids(self, trigger: Triggers) -> SeenUids:
+        """Restore the last handled UID saved for this mailbox, read fresh from the database.
+
+        The trigger passed to setup() may predate the state its previous monitor
+        saved while being cancelled.
+        """
+        mailbox = self._mailbox_key(trigger.config)
+        with LocalSession() as session:
+            config = session.query(Triggers.config).filter(Triggers.id == trigger.id).scalar()
+        state = (config or trigger.config).get('imap_state') or {}
+        if state.get('mailbox') != mailbox:
+            return SeenUids(mailbox)
+        return SeenUids(mailbox, int(state.get('last_seen_uid', 0)))
+        
+    def _save_seen_uids(self, trigger: Triggers, seen: SeenUids, force: bool = False) -> None:
+        """Write the high-water mark into trigger.config['imap_state'] if it moved (or force)"""
+        if seen.highest_uid == seen.saved_uid and not (force and seen.highest_uid):
+            return
+        try:
+            with LocalSession() as session:
+                db_trigger = session.get(Triggers, trigger.id)
+                if db_trigger is not None:
+                    # Reassigned, not mutated, so the JSON column is marked dirty
+                    db_trigger.config = {
+                        **db_trigger.config,
+                        'imap_state': {'mailbox': seen.mailbox, 'last_seen_uid': seen.highest_uid}
+                    }
+                    session.commit()
+            seen.saved_uid = seen.highest_uid
+        except Exception as e:
+            logger.error(f"Failed to save IMAP state for trigger {trigger.id}: {e}")
+            
+    async def _run_io(self, func, *args):
+        """Run a blocking mail call on the I/O pool so the event loop stays responsive"""
+        return await asyncio.get_running_loop().run_in_executor(self._io_pool, func, *args)
+        
+    async def _handle_message(self, trigger: Triggers, config: Dict[str, Any],
+                              message: email.message.Message) -> bool:
+        """Fire the trigger for a message if it matches; returns whether it fired"""
+        view = self._walk_once(message)
+        filters = self._filters.get(trigger.id)
+        if filters is None:
+            filters = self._compile_filters(config)
+        
+        # Check if message matches trigger criteria
+        if not self._matches_criteria(view, filters):
+            return False
+            
+        # Extract email data
+        email_data = self._extract_email_data(view)
+        
+        # Fire trigger
+        payload = {
+            'email': email_data,
+            'trigger_type': 'email',
+            'received_at': datetime.now(timezone.utc).isoformat()
+        }
+        
+        await self.trigger_service.fire_trigger(trigger.id, payload)
+        logger.info(f"Email trigger {trigger.id} fired for message from {email_data.get('from')}")
+        return True
+        
     def _build_imap_search_criteria(self, config: Dict[str, Any]) -> str:
         """Build IMAP search criteria from trigger configuration"""
         criteria = []
@@ -253,31 +461,42 @@ class EmailProcessor(TriggerProcessor):
             
         return ' '.join(criteria)
         
-    def _matches_criteria(self, message: email.message.Message, config: Dict[str, Any]) -> bool:
+    @staticmethod
+    def _compile_filters(config: Dict[str, Any]) -> Dict[str, Optional[str]]:
+        """Lower-case the trigger's filters once; None where a filter is unset"""
+        return {
+            'from': (config.get('from_filter') or '').lower() or None,
+            'subject': (config.get('subject_filter') or '').lower() or None,
+            'body': (config.get('body_filter') or '').lower() or None
+        }
+        
+    def _matches_criteria(self, view: MessageView, filters: Dict[str, Optional[str]]) -> bool:
         """Check if email message matches trigger criteria"""
+        message = view.message
         
         # Check sender filter
-        if config.get('from_filter'):
+        if filters['from']:
             from_address = message.get('From', '').lower()
-            if config['from_filter'].lower() not in from_address:
+            if from_address.find(filters['from']) == -1:
                 return False
                 
         # Check subject filter  
-        if config.get('subject_filter'):
+        if filters['subject']:
             subject = message.get('Subject', '').lower()
-            if config['subject_filter'].lower() not in subject:
+            if subject.find(filters['subject']) == -1:
                 return False
                 
         # Check body filter
-        if config.get('body_filter'):
-            body = self._get_email_body(message).lower()
-            if config['body_filter'].lower() not in body:
+        if filters['body']:
+            body = view.body.lower()
+            if body.find(filters['body']) == -1:
                 return False
                 
         return True
         
-    def _extract_email_data(self, message: email.message.Message) -> Dict[str, Any]:
+    def _extract_email_data(self, view: MessageView) -> Dict[str, Any]:
         """Extract data from email message"""
+        message = view.message
         return {
             'from': message.get('From'),
             'to': message.get('To'),
@@ -286,47 +505,40 @@ class EmailProcessor(TriggerProcessor):
             'subject': message.get('Subject'),
             'date': message.get('Date'),
             'message_id': message.get('Message-ID'),
-            'body': self._get_email_body(message),
-            'attachments': self._get_attachments(message)
+            'body': view.body,
+            'attachments': view.attachments
         }
         
-    def _get_email_body(self, message: email.message.Message) -> str:
-        """Extract body text from email message"""
-        body = ""
-        
-        if message.is_multipart():
-            for part in message.walk():
-                content_type = part.get_content_type()
-                if content_type == "text/plain":
-                    try:
-                        body = part.get_payload(decode=True).decode('utf-8')
-                        break
-                    except:
-                        continue
-        else:
+    def _walk_once(self, message: email.message.Message) -> MessageView:
+        """Collect body text and attachment info from a single walk over the message parts"""
+        if not message.is_multipart():
             try:
                 body = message.get_payload(decode=True).decode('utf-8')
-            except:
+            except Exception:
                 body = str(message.get_payload())
-                
-        return body
-        
-    def _get_attachments(self, message: email.message.Message) -> List[Dict[str, Any]]:
-        """Extract attachment information from email message"""
+            return MessageView(message, body, [])
+            
+        body = None
         attachments = []
-        
-        if message.is_multipart():
-            for part in message.walk():
-                if part.get_content_disposition() == 'attachment':
-                    filename = part.get_filename()
-                    if filename:
-                        attachments.append({
-                            'filename': filename,
-                            'content_type': part.get_content_type(),
-                            'size': len(part.get_payload(decode=True)) if part.get_payload(decode=True) else 0
-                        })
-                        
-        return attachments
+        for part in message.walk():
+            # Body is the first text/plain part that decodes as UTF-8
+            if body is None and part.get_content_type() == "text/plain":
+                try:
+                    body = part.get_payload(decode=True).decode('utf-8')
+                except Exception:
+                    pass
+                    
+            if part.get_content_disposition() == 'attachment':
+                filename = part.get_filename()
+                if filename:
+                    payload = part.get_payload(decode=True)
+                    attachments.append({
+                        'filename': filename,
+                        'content_type': part.get_content_type(),
+                        'size': len(payload) if payload else 0
+                    })
+                    
+        return MessageView(message, body or "", attachments)
         
     async def process(self, context: TriggerExecutionContext) -> Dict[str, Any]:
         """Process email trigger execution"""
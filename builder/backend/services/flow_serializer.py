@@ -1,13 +1,27 @@
 # services/flow_serializer.py
+import re
 import json
 import yaml
-from typing import Dict, List, Any, Optional, Set
+from typing import Dict, Iterator, List, Any, Optional, Set
 from datetime import datetime, timezone
 import logging
 import nanoid
 
+from json_provider import dumps_bytes, dumps_indent, loads as json_loads
+
 logger = logging.getLogger("FlowSerializer")
 
+_LEADING_WHITESPACE_RE = re.compile(r"\s*")
+
+# Optional import - libyaml's C loader/dumper are much faster than the pure-Python ones
+try:
+    from yaml import CSafeLoader as YamlSafeLoader, CSafeDumper as YamlSafeDumper
+    HAS_LIBYAML = True
+except ImportError:
+    from yaml import SafeLoader as YamlSafeLoader, SafeDumper as YamlSafeDumper
+    HAS_LIBYAML = False
+    logger.warning("PyYAML was built without libyaml; YAML export/import will use the slower pure-Python codec")
+
 class FlowSerializer:
     """Handles serialization and deserialization of flows to/from various formats"""
     
@@ -30,11 +44,35 @@ class FlowSerializer:
         elif format_type == "mermaid":
             return cls._export_mermaid(normalized_flow)
     
+    @classmethod
+    def iter_export(cls, flow_data: Dict[str, Any], format_type: str) -> Iterator[bytes]:
+        """
+        Export flow like export_flow(), as UTF-8 chunks for a streaming response.
+        Validation and normalization happen before the first chunk is requested.
+        """
+        if format_type not in cls.SUPPORTED_FORMATS:
+            raise ValueError(f"Unsupported format: {format_type}. Supported: {cls.SUPPORTED_FORMATS}")
+        
+        normalized_flow = cls._normalize_for_export(flow_data)
+        
+        if format_type == "json":
+            return cls._iter_json(normalized_flow)
+        elif format_type == "yaml":
+            return cls._iter_yaml(normalized_flow)
+        else:
+            return iter((cls._export_mermaid(normalized_flow).encode(),))
+    
     @classmethod
     def import_flow(cls, content: str, format_type: Optional[str] = None) -> Dict[str, Any]:
         """Import flow from content, auto-detecting format if not specified"""
         if format_type is None:
             format_type = cls._detect_format(content)
+            if format_type == "json":
+                try:
+                    return cls._import_json(content)
+                except ValueError:
+                    # Sniffed as JSON but not valid JSON; YAML flow style may still read it
+                    return cls._import_yaml(content)
         
         if format_type == "json":
             return cls._import_json(content)
@@ -123,11 +161,39 @@ class FlowSerializer:
     @classmethod
     def _export_json(cls, flow_data: Dict[str, Any]) -> str:
         """Export to JSON format"""
-        return json.dumps(flow_data, indent=2, ensure_ascii=False)
+        return dumps_indent(flow_data)
+    
+    @staticmethod
+    def _iter_json(flow_data: Dict[str, Any]) -> Iterator[bytes]:
+        """Same output as _export_json, streamed per top-level key and per list element"""
+        if not flow_data:
+            yield b"{}"
+            return
+        for index, (key, value) in enumerate(flow_data.items()):
+            yield (b"{\n  " if index == 0 else b",\n  ") + dumps_bytes(key) + b": "
+            if isinstance(value, list) and value:
+                for item_index, item in enumerate(value):
+                    yield (b"[\n    " if item_index == 0 else b",\n    ") + dumps_indent(item).encode().replace(b"\n", b"\n    ")
+                yield b"\n  ]"
+            else:
+                yield dumps_indent(value).encode().replace(b"\n", b"\n  ")
+        yield b"\n}"
     
     @classmethod
     def _export_yaml(cls, flow_data: Dict[str, Any]) -> str:
         """Export to YAML format with simplified structure"""
+        return cls._dump_yaml(cls._yaml_document(flow_data))
+    
+    @classmethod
+    def _iter_yaml(cls, flow_data: Dict[str, Any]) -> Iterator[bytes]:
+        """Same output as _export_yaml, one top-level section at a time (keys sorted like yaml.dump)"""
+        document = cls._yaml_document(flow_data)
+        for key in sorted(document):
+            yield cls._dump_yaml({key: document[key]}).encode()
+    
+    @classmethod
+    def _yaml_document(cls, flow_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the simplified structure used by the YAML format"""
         # Create simplified YAML structure
         yaml_data = {
             "version": flow_data["version"],
@@ -191,7 +257,12 @@ class FlowSerializer:
                 connection["target_handle"] = edge["targetHandle"]
             yaml_data["flow"]["connections"].append(connection)
         
-        return yaml.dump(yaml_data, default_flow_style=False, indent=2, allow_unicode=True)
+        # Round-trip through JSON so the dumper only ever sees plain dicts/lists/scalars
+        return json_loads(dumps_bytes(yaml_data))
+    
+    @staticmethod
+    def _dump_yaml(data: Dict[str, Any]) -> str:
+        return yaml.dump(data, Dumper=YamlSafeDumper, default_flow_style=False, indent=2, allow_unicode=True)
     
     @classmethod
     def _export_mermaid(cls, flow_data: Dict[str, Any]) -> str:
@@ -264,37 +335,24 @@ class FlowSerializer:
     
     @classmethod
     def _detect_format(cls, content: str) -> str:
-        """Auto-detect format from content"""
-        content_stripped = content.strip()
+        """Auto-detect format from the first non-whitespace characters of content"""
+        start = _LEADING_WHITESPACE_RE.match(content).end()
+        head = content[start:start + 16]
         
-        if content_stripped.startswith("{") or content_stripped.startswith("["):
+        if not head:
+            raise ValueError("Could not detect format from content")
+        if head[0] in "{[":
             return "json"
-        elif content_stripped.startswith("graph ") or content_stripped.startswith("flowchart "):
+        if head.startswith(("graph ", "flowchart ")):
             return "mermaid"
-        elif "version:" in content_stripped or content_stripped.startswith("version:"):
-            return "yaml"
-        else:
-            # Try to parse as JSON first
-            try:
-                json.loads(content)
-                return "json"
-            except json.JSONDecodeError:
-                pass
-            
-            # Try YAML
-            try:
-                yaml.safe_load(content)
-                return "yaml"
-            except yaml.YAMLError:
-                pass
-        
-        raise ValueError("Could not detect format from content")
+        # YAML is the only remaining supported format; the parser reports anything else
+        return "yaml"
     
     @classmethod
     def _import_json(cls, content: str) -> Dict[str, Any]:
         """Import from JSON format"""
         try:
-            data = json.loads(content)
+            data = json_loads(content)
             return cls._normalize_for_import(data)
         except json.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON format: {e}")
@@ -303,7 +361,7 @@ class FlowSerializer:
     def _import_yaml(cls, content: str) -> Dict[str, Any]:
         """Import from YAML format"""
         try:
-            data = yaml.safe_load(content)
+            data = yaml.load(content, Loader=YamlSafeLoader)
             return cls._normalize_for_import(data)
         except yaml.YAMLError as e:
             raise ValueError(f"Invalid YAML format: {e}")
@@ -311,6 +369,9 @@ class FlowSerializer:
     @classmethod
     def _normalize_for_import(cls, data: Dict[str, Any]) -> Dict[str, Any]:
         """Normalize imported data to ReactFlow format"""
+        if not isinstance(data, dict):
+            raise ValueError("Unrecognized flow format")
+        
         # If it's already in ReactFlow format (JSON export), return as-is with new IDs
         if "nodes" in data and "edges" in data:
             return cls._regenerate_ids(data)
@@ -0,0 +1,93 @@
+"""
+Runtime Pool - Reuse entered TFrameX runtime contexts across requests
+Entering a run_context() checks MCP server readiness, and leaving it closes the
+context LLM's HTTP client (the app's shared default LLM), so every request paid
+for a fresh connection. Pooled contexts stay entered on the shared event loop
+and are handed out one request at a time.
+"""
+import os
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List
+
+logger = logging.getLogger("RuntimePool")
+
+RUNTIME_POOL_SIZE = int(os.getenv('TFRAMEX_RUNTIME_POOL_SIZE', '8'))
+
+
+class RuntimePool:
+    """Bounded pool of entered runtime contexts for one TFrameXApp.
+
+    Must only be used from the shared event loop (services.async_bridge).
+    """
+
+    def __init__(self, app: Any, size: int = RUNTIME_POOL_SIZE):
+        self._app = app
+        self._size = max(size, 1)
+        self._idle: List[Any] = []
+        self._created = 0
+        self._available = asyncio.Condition()
+
+    async def acquire(self) -> Any:
+        async with self._available:
+            while not self._idle and self._created >= self._size:
+                await self._available.wait()
+            if self._idle:
+                return self._idle.pop()
+            self._created += 1
+        try:
+            return await self._app.run_context().__aenter__()
+        except BaseException:
+            async with self._available:
+                self._created -= 1
+                self._available.notify()
+            raise
+
+    async def release(self, rt: Any, discard: bool = False):
+        """Return rt to the pool, or drop it (freeing its slot) if discard or it can't be reset"""
+        if not discard:
+            try:
+                # Agent instances carry conversation memory; never hand them to another request
+                rt.engine._agent_instances.clear()
+            except Exception as e:
+                logger.warning(f"Dropping runtime context that could not be reset: {e}")
+                discard = True
+        async with self._available:
+            if discard:
+                # Not exited: that would close the LLM client shared with other requests
+                self._created -= 1
+            else:
+                self._idle.append(rt)
+            self._available.notify()
+
+
+_pools: Dict[int, RuntimePool] = {}
+
+
+@asynccontextmanager
+async def shared_llm_runtime(app: Any) -> AsyncIterator[Any]:
+    """
+    `async with app.run_context() as rt` for short-lived apps (e.g. per-run apps
+    built on the global default LLM). The context is entered as usual but not
+    exited, since exiting only closes the context LLM and that client is shared
+    with every other request on the loop.
+    """
+    yield await app.run_context().__aenter__()
+
+
+@asynccontextmanager
+async def pooled_runtime(app: Any) -> AsyncIterator[Any]:
+    """Drop-in replacement for `async with app.run_context() as rt`"""
+    pool = _pools.get(id(app))
+    if pool is None:
+        pool = _pools[id(app)] = RuntimePool(app)
+        logger.info(f"Created runtime pool (size {pool._size})")
+    rt = await pool.acquire()
+    failed = True
+    try:
+        yield rt
+        failed = False
+    finally:
+        # A context whose request raised may be left mid-call; don't reuse it
+        await pool.release(rt, discard=failed)
@@ -2,18 +2,30 @@
 Trigger Service - Core service for managing triggers
 Handles trigger registration, execution, and lifecycle management
 """
+import os
 import uuid
 import logging
 import asyncio
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Any
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine
-from models import Triggers, TriggerExecutions, Flow
+from sqlalchemy import create_engine, func, delete, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from models import Triggers, TriggerExecutions, TriggerMetric, TriggerLastError, Flow
+from models.triggers import METRICS_ROLLUP_BUCKET
 from database import LocalSession
 
 logger = logging.getLogger("TriggerService")
 
+# Minute buckets older than this are folded into each trigger's rollup row
+TRIGGER_METRICS_ROLLUP_HOURS = int(os.getenv('TRIGGER_METRICS_ROLLUP_HOURS', '24'))
+
+# Dialects with INSERT ... ON CONFLICT DO UPDATE; others fall back to UPDATE then INSERT
+_UPSERT_INSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
+
 class TriggerExecutionContext:
     """Context object passed to trigger processors"""
     def __init__(self, trigger: Triggers, payload: Dict[str, Any], execution_id: str):
@@ -43,6 +55,8 @@ class TriggerProcessor:
 class TriggerService:
     """Core service for managing triggers"""
     
+    _EMPTY_METRICS = {'trigger_count': 0, 'error_count': 0, 'last_triggered_at': None}
+    
     def __init__(self):
         self.processors: Dict[str, TriggerProcessor] = {}
         self.active_triggers: Dict[str, Triggers] = {}
@@ -220,16 +234,14 @@ class TriggerService:
                     execution.status = 'success'
                     execution.completed_at = datetime.now(timezone.utc)
                     execution.duration_ms = duration_ms
-                    execution.flow_execution_id = result.get('flow_execution_id')
-                    session.commit()
+                    flow_execution_id = result.get('flow_execution_id')
+                    if isinstance(flow_execution_id, str):
+                        flow_execution_id = uuid.UUID(flow_execution_id)
+                    execution.flow_execution_id = flow_execution_id
                     
                 # Update trigger stats
-                trigger = session.query(Triggers).filter(Triggers.id == trigger_id).first()
-                if trigger:
-                    trigger.trigger_count += 1
-                    trigger.last_triggered_at = datetime.now(timezone.utc)
-                    trigger.last_error = None  # Clear any previous error
-                    session.commit()
+                self._record_metric(session, trigger_id)
+                session.commit()
                     
             logger.info(f"Trigger {trigger_id} executed successfully in {duration_ms}ms")
             return execution_id
@@ -242,14 +254,10 @@ class TriggerService:
                     execution.status = 'failure'
                     execution.completed_at = datetime.now(timezone.utc)
                     execution.error = str(e)
-                    session.commit()
                     
                 # Update trigger error count
-                trigger = session.query(Triggers).filter(Triggers.id == trigger_id).first()
-                if trigger:
-                    trigger.error_count += 1
-                    trigger.last_error = str(e)
-                    session.commit()
+                self._record_metric(session, trigger_id, error=str(e))
+                session.commit()
                     
             logger.error(f"Trigger {trigger_id} execution failed: {e}", exc_info=True)
             raise
@@ -269,6 +277,12 @@ class TriggerService:
                 .limit(5)
                 .all()
             )
+            metrics = self._get_metrics(session, [trigger_id]).get(trigger_id, self._EMPTY_METRICS)
+            last_error = (
+                session.query(TriggerLastError.error)
+                .filter(TriggerLastError.trigger_id == trigger_id)
+                .scalar()
+            )
             
             status = {
                 'id': trigger.id,
@@ -276,16 +290,16 @@ class TriggerService:
                 'type': trigger.type,
                 'enabled': trigger.enabled,
                 'status': 'armed' if trigger.enabled else 'disarmed',
-                'trigger_count': trigger.trigger_count,
-                'error_count': trigger.error_count,
-                'last_triggered_at': trigger.last_triggered_at.isoformat() if trigger.last_triggered_at else None,
-                'last_error': trigger.last_error,
-                'next_run_at': trigger.next_run_at.isoformat() if trigger.next_run_at else None,
+                'trigger_count': metrics['trigger_count'],
+                'error_count': metrics['error_count'],
+                'last_triggered_at': metrics['last_triggered_at'],
+                'last_error': last_error,
+                'next_run_at': trigger.next_run_at,
                 'recent_executions': [
                     {
                         'id': ex.id,
                         'status': ex.status,
-                        'triggered_at': ex.triggered_at.isoformat(),
+                        'triggered_at': ex.triggered_at,
                         'duration_ms': ex.duration_ms,
                         'error': ex.error
                     }
@@ -294,7 +308,7 @@ class TriggerService:
             }
             
             # Determine health status
-            if trigger.last_error:
+            if last_error:
                 status['status'] = 'error'
             elif not trigger.enabled:
                 status['status'] = 'disarmed'
@@ -314,6 +328,7 @@ class TriggerService:
                 query = query.filter(Triggers.flow_id == flow_id)
                 
             triggers = query.all()
+            metrics = self._get_metrics(session, [t.id for t in triggers] if flow_id else None)
             
             return [
                 {
@@ -324,12 +339,12 @@ class TriggerService:
                     'description': t.description,
                     'enabled': t.enabled,
                     'webhook_url': t.webhook_url,
-                    'trigger_count': t.trigger_count,
-                    'error_count': t.error_count,
-                    'last_triggered_at': t.last_triggered_at.isoformat() if t.last_triggered_at else None,
-                    'next_run_at': t.next_run_at.isoformat() if t.next_run_at else None,
-                    'created_at': t.created_at.isoformat(),
-                    'updated_at': t.updated_at.isoformat()
+                    'trigger_count': metrics.get(t.id, self._EMPTY_METRICS)['trigger_count'],
+                    'error_count': metrics.get(t.id, self._EMPTY_METRICS)['error_count'],
+                    'last_triggered_at': metrics.get(t.id, self._EMPTY_METRICS)['last_triggered_at'],
+                    'next_run_at': t.next_run_at,
+                    'created_at': t.created_at,
+                    'updated_at': t.updated_at
                 }
                 for t in triggers
             ]
@@ -354,11 +369,138 @@ class TriggerService:
     async def _update_trigger_error(self, trigger_id: str, error_message: str):
         """Update trigger with error information"""
         with LocalSession() as session:
-            trigger = session.query(Triggers).filter(Triggers.id == trigger_id).first()
-            if trigger:
-                trigger.last_error = error_message
-                trigger.error_count += 1
-                session.commit()
+            self._record_metric(session, trigger_id, error=error_message)
+            session.commit()
+
+    @staticmethod
+    def _record_metric(session, trigger_id: str, error: Optional[str] = None):
+        """Count one firing in this minute's bucket and track the latest error"""
+        now = datetime.now(timezone.utc)
+        _bump_metric(
+            session, trigger_id, now.replace(second=0, microsecond=0),
+            count=0 if error else 1,
+            error_count=1 if error else 0,
+            last_triggered_at=None if error else now
+        )
+
+        if error is None:
+            # A success clears the error; matches no row when the last firing succeeded too
+            session.execute(delete(TriggerLastError).where(TriggerLastError.trigger_id == trigger_id))
+            return
+
+        insert = _UPSERT_INSERTS.get(session.get_bind().dialect.name)
+        if insert is None:
+            session.merge(TriggerLastError(trigger_id=trigger_id, error=error, recorded_at=now))
+            return
+        stmt = insert(TriggerLastError).values(trigger_id=trigger_id, error=error, recorded_at=now)
+        session.execute(stmt.on_conflict_do_update(
+            index_elements=['trigger_id'],
+            set_={'error': stmt.excluded.error, 'recorded_at': stmt.excluded.recorded_at}
+        ))
+
+    @staticmethod
+    def _get_metrics(session, trigger_ids: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Aggregate metric rows into per-trigger totals (bounded by the rollup)"""
+        query = session.query(
+            TriggerMetric.trigger_id,
+            func.coalesce(func.sum(TriggerMetric.count), 0),
+            func.coalesce(func.sum(TriggerMetric.error_count), 0),
+            func.max(TriggerMetric.last_triggered_at),
+        )
+        if trigger_ids is not None:
+            query = query.filter(TriggerMetric.trigger_id.in_(trigger_ids))
+        return {
+            trigger_id: {
+                'trigger_count': int(trigger_count),
+                'error_count': int(error_count),
+                'last_triggered_at': last_triggered_at
+            }
+            for trigger_id, trigger_count, error_count, last_triggered_at
+            in query.group_by(TriggerMetric.trigger_id).all()
+        }
+
+def _bump_metric(session, trigger_id: str, bucket_ts: datetime, count: int, error_count: int,
+                 last_triggered_at: Optional[datetime]) -> None:
+    """Add to the (trigger_id, bucket_ts) counter row, creating it if needed"""
+    insert = _UPSERT_INSERTS.get(session.get_bind().dialect.name)
+    if insert is not None:
+        stmt = insert(TriggerMetric).values(
+            trigger_id=trigger_id,
+            bucket_ts=bucket_ts,
+            count=count,
+            error_count=error_count,
+            last_triggered_at=last_triggered_at
+        )
+        session.execute(stmt.on_conflict_do_update(
+            index_elements=['trigger_id', 'bucket_ts'],
+            set_={
+                'count': TriggerMetric.count + stmt.excluded.count,
+                'error_count': TriggerMetric.error_count + stmt.excluded.error_count,
+                'last_triggered_at': func.coalesce(stmt.excluded.last_triggered_at, TriggerMetric.last_triggered_at)
+            }
+        ))
+        return
+
+    values = {
+        'count': TriggerMetric.count + count,
+        'error_count': TriggerMetric.error_count + error_count
+    }
+    if last_triggered_at is not None:
+        values['last_triggered_at'] = last_triggered_at
+    result = session.execute(
+        update(TriggerMetric)
+        .where(TriggerMetric.trigger_id == trigger_id, TriggerMetric.bucket_ts == bucket_ts)
+        .values(**values)
+    )
+    if result.rowcount == 0:
+        session.add(TriggerMetric(
+            trigger_id=trigger_id,
+            bucket_ts=bucket_ts,
+            count=count,
+            error_count=error_count,
+            last_triggered_at=last_triggered_at
+        ))
+        session.flush()
+
+def rollup_trigger_metrics(older_than_hours: int = TRIGGER_METRICS_ROLLUP_HOURS) -> int:
+    """Fold minute buckets older than the window into one rollup row per trigger.
+
+    Only rows this call actually deleted are added to the rollup, so runs from
+    several worker processes never count a bucket twice. Returns the number of
+    minute rows folded.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=older_than_hours)
+    columns = (TriggerMetric.trigger_id, TriggerMetric.count,
+               TriggerMetric.error_count, TriggerMetric.last_triggered_at)
+    expired = (TriggerMetric.bucket_ts < cutoff, TriggerMetric.bucket_ts > METRICS_ROLLUP_BUCKET)
+
+    with LocalSession() as session:
+        if session.get_bind().dialect.delete_returning:
+            folded = session.execute(delete(TriggerMetric).where(*expired).returning(*columns)).all()
+        else:
+            # Row locks keep a concurrent run from folding the same buckets
+            rows = session.execute(
+                select(TriggerMetric.id, *columns).where(*expired).with_for_update()
+            ).all()
+            if rows:
+                session.execute(delete(TriggerMetric).where(TriggerMetric.id.in_([row[0] for row in rows])))
+            folded = [row[1:] for row in rows]
+
+        totals = {}
+        for trigger_id, count, error_count, last_triggered_at in folded:
+            total = totals.setdefault(trigger_id, [0, 0, None])
+            total[0] += count
+            total[1] += error_count
+            if last_triggered_at is not None and (total[2] is None or last_triggered_at > total[2]):
+                total[2] = last_triggered_at
+
+        for trigger_id, (count, error_count, last_triggered_at) in totals.items():
+            _bump_metric(session, trigger_id, METRICS_ROLLUP_BUCKET, count, error_count, last_triggered_at)
+        session.commit()
+
+    if folded:
+        logger.info(f"Rolled up {len(folded)} trigger metric rows for {len(totals)} triggers")
+    return len(folded)
 
 # Global trigger service instance
 _trigger_service = None
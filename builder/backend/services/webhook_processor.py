@@ -11,6 +11,7 @@ from typing import Dict, Any, Optional
 from flask import request, jsonify
 from jsonschema import validate, ValidationError
 from .trigger_service import TriggerProcessor, TriggerExecutionContext
+from .async_bridge import run_sync
 from models import Triggers
 
 logger = logging.getLogger("WebhookProcessor")
@@ -129,23 +130,16 @@ class WebhookProcessor(TriggerProcessor):
                     'data': payload
                 }
                 
-                # Fire the trigger asynchronously
-                import asyncio
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    execution_id = loop.run_until_complete(
-                        self.trigger_service.fire_trigger(trigger_id, trigger_payload)
-                    )
-                    
-                    return jsonify({
-                        'success': True,
-                        'execution_id': execution_id,
-                        'message': 'Webhook processed successfully'
-                    }), 200
-                    
-                finally:
-                    loop.close()
+                # Fire the trigger on the shared event loop
+                execution_id = run_sync(
+                    self.trigger_service.fire_trigger(trigger_id, trigger_payload)
+                )
+                
+                return jsonify({
+                    'success': True,
+                    'execution_id': execution_id,
+                    'message': 'Webhook processed successfully'
+                }), 200
                     
             except Exception as e:
                 logger.error(f"Webhook handler error for trigger {trigger_id}: {e}", exc_info=True)
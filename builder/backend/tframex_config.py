@@ -5,6 +5,7 @@ from dotenv import load_dotenv
 from tframex import TFrameXApp, OpenAIChatLLM, setup_logging
 from pathlib import Path
 from builtin_tools import register_builtin_tools
+from component_manager import track_component_changes
 from agents import (
     register_conversational_assistant, 
     register_flow_builder_agent, 
@@ -22,6 +23,12 @@ load_dotenv()
 setup_logging(level=logging.INFO, use_colors=True)
 logger = logging.getLogger("TFrameXConfig")
 
+_ENV = os.environ
+
+def first_env(*names, default=None):
+    """Value of the first set environment variable among names, else default."""
+    return next((_ENV[name] for name in names if _ENV.get(name)), default)
+
 # --- Global TFrameX App Instance ---
 # This instance will be shared across the backend.
 # User-defined agents and tools via the UI will be registered to this instance.
@@ -37,9 +44,9 @@ def init_tframex_app():
     
     # Configure the default LLM for the TFrameXApp
     # Support for multiple LLM providers as per v1.1.0
-    api_key = os.getenv("OPENAI_API_KEY") or os.getenv("LLAMA_API_KEY")
-    api_base_url = os.getenv("OPENAI_API_BASE") or os.getenv("LLAMA_BASE_URL") or "http://localhost:11434/v1"
-    model_name = os.getenv("OPENAI_MODEL_NAME") or os.getenv("LLAMA_MODEL") or "llama3.2:1b"
+    api_key = first_env("OPENAI_API_KEY", "LLAMA_API_KEY")
+    api_base_url = first_env("OPENAI_API_BASE", "LLAMA_BASE_URL", default="http://localhost:11434/v1")
+    model_name = first_env("OPENAI_MODEL_NAME", "LLAMA_MODEL", default="llama3.2:1b")
     
     default_llm = OpenAIChatLLM(
         model_name=model_name,
@@ -82,6 +89,9 @@ def init_tframex_app():
         mcp_roots_allowed_paths=None  # Can be configured via environment
     )
     
+    # Registrations from here on invalidate cached component listings
+    track_component_changes(tframex_app_instance)
+
     logger.info("TFrameXApp initialized with:")
     logger.info(f"  - LLM: {model_name} via {api_base_url}")
     logger.info(f"  - MCP: {'Enabled' if mcp_config_path else 'Disabled'}")
@@ -156,6 +166,16 @@ async def init_deferred_mcp() -> bool:
         logger.error(f"Failed to initialize deferred MCP: {e}")
         return False
 
+# MCP manager of the global app, remembered once it exists (it is never unset)
+_mcp_manager = None
+
+def get_mcp_manager():
+    """Returns the global app's MCPManager, or None while MCP is not initialized."""
+    global _mcp_manager
+    if _mcp_manager is None:
+        _mcp_manager = getattr(get_tframex_app_instance(), '_mcp_manager', None)
+    return _mcp_manager
+
 def get_tframex_app_instance() -> TFrameXApp:
     """Returns the initialized global TFrameX App instance with lazy initialization."""
     global tframex_app_instance
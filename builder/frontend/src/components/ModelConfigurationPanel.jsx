@@ -130,10 +130,14 @@ const ModelConfigurationPanel = () => {
     setError(null);
     
     try {
-      const response = await axios.post(
-        `${import.meta.env.VITE_API_BASE_URL || 'http://localhost:5000'}/api/tframex/models/test`,
-        newModel
-      );
+      const testUrl = `${import.meta.env.VITE_API_BASE_URL || 'http://localhost:5000'}/api/tframex/models/test`;
+      let response = await axios.post(testUrl, newModel);
+      
+      // The test runs in the background; poll until it finishes
+      while (response.data.status === 'pending') {
+        await new Promise(resolve => setTimeout(resolve, 500));
+        response = await axios.get(`${testUrl}/${response.data.job_id}`);
+      }
       
       if (response.data.success) {
         setTestResult({ success: true, message: 'Model connection successful!' });